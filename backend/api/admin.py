@@ -0,0 +1,131 @@
+"""
+Admin endpoints: runtime memory profiling and leak detection.
+
+Opt-in: the router and the per-route RSS middleware are only installed with
+MEMORY_PROFILING_ENABLED=true, and every endpoint requires the ADMIN_TOKEN
+value in the X-Admin-Token header (without ADMIN_TOKEN they are refused).
+
+Typical leak hunt under sustained /api/convert load:
+    POST /api/admin/memory/tracemalloc?enabled=true
+    POST /api/admin/memory/snapshots?label=baseline    (repeat every few minutes)
+    GET  /api/admin/memory/diff?base=1                 (what grew since snapshot 1)
+    GET  /api/admin/memory/leaks                       (sites that grew every interval)
+"""
+
+import asyncio
+import hmac
+import os
+from typing import Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from models.memory_profiler import memory_profiler, object_counts, GROUP_BY, TRACEMALLOC_FRAMES
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin endpoints are disabled (ADMIN_TOKEN is not set)")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+router = APIRouter(prefix="/api/admin", tags=["admin"], dependencies=[Depends(require_admin)])
+
+def _check_group_by(group_by: str):
+    if group_by not in GROUP_BY:
+        raise HTTPException(status_code=400, detail=f"group_by must be one of {', '.join(GROUP_BY)}")
+
+async def _run(fn, *args):
+    """Snapshots walk every traced block; keep them off the event loop."""
+    try:
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+
+@router.get("/memory")
+async def memory_status():
+    """
+    RSS, tracemalloc state, stored snapshots, watched structure sizes and
+    per-route peak RSS for this worker.
+    """
+    return memory_profiler.status()
+
+@router.post("/memory/tracemalloc")
+async def toggle_tracemalloc(enabled: bool = Query(...), frames: int = Query(TRACEMALLOC_FRAMES, ge=1, le=100)):
+    """
+    Start or stop tracemalloc. Tracing slows allocations and uses extra
+    memory, so leave it off outside an investigation.
+    """
+    if enabled:
+        memory_profiler.start_tracing(frames)
+    else:
+        memory_profiler.stop_tracing()
+    return memory_profiler.status()["tracemalloc"]
+
+@router.get("/memory/top")
+async def top_allocations(limit: int = Query(20, ge=1, le=500), group_by: str = "lineno"):
+    """Largest live allocation sites."""
+    _check_group_by(group_by)
+    return await _run(memory_profiler.top, limit, group_by)
+
+@router.post("/memory/snapshots")
+async def take_snapshot(label: Optional[str] = None):
+    """Store a tracemalloc snapshot for later diffs (oldest dropped beyond the limit)."""
+    return await _run(memory_profiler.take_snapshot, label)
+
+@router.get("/memory/snapshots")
+async def list_snapshots():
+    return {"snapshots": memory_profiler.snapshots()}
+
+@router.delete("/memory/snapshots")
+async def clear_snapshots():
+    memory_profiler.clear_snapshots()
+    return {"message": "Snapshots cleared"}
+
+@router.get("/memory/diff")
+async def snapshot_diff(base: int, target: Optional[int] = None, limit: int = Query(20, ge=1, le=500),
+                        group_by: str = "lineno"):
+    """
+    Allocation growth from snapshot `base` to snapshot `target` (default: now).
+    """
+    _check_group_by(group_by)
+    return await _run(memory_profiler.diff, base, target, limit, group_by)
+
+@router.get("/memory/leaks")
+async def leak_suspects(limit: int = Query(20, ge=1, le=500), min_growth_kb: float = Query(1.0, ge=0)):
+    """Sites whose size grew between every pair of consecutive snapshots."""
+    return await _run(memory_profiler.leak_suspects, limit, min_growth_kb)
+
+@router.get("/memory/objects")
+async def live_objects(limit: int = Query(30, ge=1, le=500)):
+    """Live object counts by type (expensive: walks the whole heap)."""
+    return {"objects": await _run(object_counts, limit)}
+
+@router.delete("/memory/routes")
+async def reset_route_stats():
+    memory_profiler.reset_routes()
+    return {"message": "Route memory statistics reset"}
+
+class MemoryTrackingMiddleware:
+    """
+    Pure ASGI middleware recording RSS before and after each HTTP request
+    under its route template (e.g. "POST /api/convert"), so path parameters
+    do not create unbounded keys.
+    """
+
+    def __init__(self, app, profiler=memory_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        before = self.profiler.sample()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            # The router stores the matched route in the (shared) scope
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            self.profiler.record_request(f"{scope.get('method')} {route}", before, self.profiler.sample())
@@ -0,0 +1,300 @@
+"""
+Frontend asset serving: fingerprinted, precompressed files under /app.
+
+A build step without a toolchain, run at startup (FRONTEND_BUILD=startup,
+the default) or ahead of deployment with `python -m api.assets`:
+
+- every file under FRONTEND_DIR is copied to FRONTEND_BUILD_DIR as
+  name.<content hash>.ext; HTML entry points keep their names and get their
+  src/href references (and CSS url() references) rewritten to the
+  fingerprinted names
+- compressible files get .gz (and .br when the optional `brotli` package
+  is installed) siblings at maximum compression, kept only when smaller
+- manifest.json records the result and a digest of the sources, so an
+  unchanged frontend is not rebuilt on the next start
+
+Requests pick the smallest encoding the client accepts (br, then gzip).
+Fingerprinted URLs never change content and are cached as immutable;
+HTML and unfingerprinted names are revalidated with their ETag. When the
+build is disabled (FRONTEND_BUILD=off) or failed, the raw sources are
+served uncompressed, as before.
+"""
+
+import argparse
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import threading
+from typing import Any, Dict, List, Optional
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import FileResponse, RedirectResponse, Response
+from api.audio import _etag_matches, CACHE_CONTROL
+
+FRONTEND_DIR = os.getenv("FRONTEND_DIR", "../frontend")
+FRONTEND_BUILD_DIR = os.getenv("FRONTEND_BUILD_DIR", "static/frontend")
+FRONTEND_BUILD = os.getenv("FRONTEND_BUILD", "startup").lower()  # startup or off
+
+HASH_LENGTH = 10
+MIN_COMPRESS_SIZE = 512      # Smaller files gain nothing worth a second request path
+COMPRESSIBLE = {".html", ".htm", ".css", ".js", ".mjs", ".json", ".map", ".svg", ".txt", ".xml", ".webmanifest"}
+HTML = {".html", ".htm"}
+ENCODINGS = {"br": ".br", "gzip": ".gz"}   # Preference order
+MANIFEST = "manifest.json"
+REVALIDATE = "no-cache"
+
+# Relative references in HTML attributes and CSS; absolute URLs, data: URIs
+# and fragments do not resolve to a source file and are left alone
+HTML_REFERENCE = re.compile(r"""(\b(?:src|href)\s*=\s*["'])([^"'#?]+)""", re.IGNORECASE)
+CSS_REFERENCE = re.compile(r"""(url\(\s*["']?)([^"')#?]+)""", re.IGNORECASE)
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+router = APIRouter(tags=["frontend"])
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+def _fingerprinted(name: str, digest: str) -> str:
+    stem, ext = posixpath.splitext(name)
+    return f"{stem}.{digest[:HASH_LENGTH]}{ext}"
+
+def _write(path: str, data: bytes):
+    """Write via a temporary file, so a running server never reads half a file."""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp = f"{path}.tmp{os.getpid()}"
+    with open(temp, "wb") as f:
+        f.write(data)
+    os.replace(temp, path)
+
+def _compress(data: bytes) -> Dict[str, bytes]:
+    variants = {"gzip": gzip.compress(data, compresslevel=9, mtime=0)}
+    if brotli is not None:
+        variants["br"] = brotli.compress(data, quality=11)
+    return {encoding: body for encoding, body in variants.items() if len(body) < len(data)}
+
+def negotiate(accept_encoding: str, available: List[str]) -> Optional[str]:
+    """Best precompressed encoding the client accepts (q=0 refuses), else None."""
+    accepted = {}
+    for item in accept_encoding.split(","):
+        token, _, params = item.partition(";")
+        quality = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if token.strip():
+            accepted[token.strip().lower()] = quality
+    for encoding in ENCODINGS:
+        if encoding in available and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+class FrontendAssets:
+    """
+    Builds FRONTEND_DIR into FRONTEND_BUILD_DIR and resolves request paths
+    against the resulting manifest.
+    """
+
+    def __init__(self, source: str = FRONTEND_DIR, output: str = FRONTEND_BUILD_DIR):
+        self.source = source
+        self.output = output
+        self.manifest: Optional[Dict[str, Any]] = None
+        self._by_url: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def _sources(self) -> Dict[str, bytes]:
+        files = {}
+        for root, dirs, names in os.walk(self.source):
+            dirs[:] = sorted(d for d in dirs if not d.startswith("."))
+            for name in sorted(names):
+                if name.startswith("."):
+                    continue
+                path = os.path.join(root, name)
+                rel = os.path.relpath(path, self.source).replace(os.sep, "/")
+                with open(path, "rb") as f:
+                    files[rel] = f.read()
+        return files
+
+    def _load_manifest(self) -> Optional[Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.output, MANIFEST), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def build(self, force: bool = False) -> Dict[str, Any]:
+        """
+        Build unless the sources are unchanged since the last build; returns
+        the manifest and makes it the one being served.
+        """
+        with self._lock:
+            sources = self._sources()
+            source_digest = _digest(b"".join(
+                name.encode("utf-8") + b"\0" + _digest(data).encode("ascii") for name, data in sources.items()))
+            previous = self._load_manifest()
+            if not force and previous is not None and previous.get("source_digest") == source_digest:
+                self._activate(previous)
+                return previous
+
+            # Stylesheets before scripts before HTML, so every file is
+            # rewritten after the files it references were fingerprinted
+            def order(name):
+                ext = posixpath.splitext(name)[1].lower()
+                return (ext in HTML, ext == ".js", ext == ".css", name)
+
+            urls: Dict[str, str] = {}
+            files: Dict[str, Dict[str, Any]] = {}
+            for name in sorted(sources, key=order):
+                data = sources[name]
+                ext = posixpath.splitext(name)[1].lower()
+                if ext in HTML:
+                    data = self._rewrite(name, data.decode("utf-8"), HTML_REFERENCE, urls).encode("utf-8")
+                elif ext == ".css":
+                    data = self._rewrite(name, data.decode("utf-8"), CSS_REFERENCE, urls).encode("utf-8")
+                digest = _digest(data)
+                url = name if ext in HTML else _fingerprinted(name, digest)
+                urls[name] = url
+
+                path = os.path.join(self.output, url)
+                _write(path, data)
+                sizes = {"identity": len(data)}
+                if ext in COMPRESSIBLE and len(data) >= MIN_COMPRESS_SIZE:
+                    for encoding, body in _compress(data).items():
+                        _write(path + ENCODINGS[encoding], body)
+                        sizes[encoding] = len(body)
+                files[name] = {
+                    "url": url,
+                    "etag": digest[:32],
+                    "immutable": url != name,
+                    "encodings": [encoding for encoding in ENCODINGS if encoding in sizes],
+                    "sizes": sizes
+                }
+
+            manifest = {"source_digest": source_digest, "brotli": brotli is not None, "files": files}
+            _write(os.path.join(self.output, MANIFEST), json.dumps(manifest, indent=2).encode("utf-8"))
+            self._remove_stale(manifest, previous)
+            self._activate(manifest)
+            print(f"Built frontend assets: {len(files)} files into {self.output}")
+            return manifest
+
+    @staticmethod
+    def _rewrite(name: str, text: str, pattern: re.Pattern, urls: Dict[str, str]) -> str:
+        base = posixpath.dirname(name)
+
+        def replace(match):
+            reference = match.group(2)
+            target = posixpath.normpath(posixpath.join(base, reference.strip()))
+            if target not in urls:
+                return match.group(0)
+            return match.group(1) + posixpath.join(posixpath.dirname(reference.strip()),
+                                                   posixpath.basename(urls[target]))
+
+        return pattern.sub(replace, text)
+
+    def _remove_stale(self, manifest: Dict[str, Any], previous: Optional[Dict[str, Any]]):
+        """
+        Delete build outputs of older generations. The previous build is
+        kept: pages loaded before a redeploy still reference its files.
+        """
+        keep = {MANIFEST}
+        for generation in (manifest, previous or {}):
+            for entry in generation.get("files", {}).values():
+                keep.add(entry["url"])
+                keep.update(entry["url"] + ENCODINGS[encoding] for encoding in entry["encodings"])
+        for root, _, names in os.walk(self.output):
+            for name in names:
+                rel = os.path.relpath(os.path.join(root, name), self.output).replace(os.sep, "/")
+                # Temporary files may be another worker's build in progress
+                if rel not in keep and ".tmp" not in name:
+                    os.remove(os.path.join(root, name))
+
+    def _activate(self, manifest: Dict[str, Any]):
+        by_url = {}
+        for name, entry in manifest["files"].items():
+            # Logical names resolve to the current build but are revalidated
+            by_url[name] = dict(entry, immutable=False)
+            by_url[entry["url"]] = entry
+        self.manifest = manifest
+        self._by_url = by_url
+
+    def lookup(self, path: str) -> Optional[Dict[str, Any]]:
+        return self._by_url.get(path)
+
+frontend_assets = FrontendAssets()
+
+def _raw_file(path: str) -> Response:
+    """Unbuilt fallback: the source file itself, revalidated on every use."""
+    root = os.path.realpath(frontend_assets.source)
+    full = os.path.realpath(os.path.join(root, path))
+    if not full.startswith(root + os.sep) or not os.path.isfile(full):
+        raise HTTPException(status_code=404, detail="Not found")
+    return FileResponse(full, headers={"cache-control": REVALIDATE})
+
+@router.api_route("/app", methods=["GET", "HEAD"], include_in_schema=False)
+async def frontend_root():
+    return RedirectResponse("/app/")
+
+@router.api_route("/app/{path:path}", methods=["GET", "HEAD"], include_in_schema=False)
+async def frontend_file(path: str, request: Request):
+    """
+    Serve a built frontend file in the best encoding the client accepts.
+    """
+    if path == "" or path.endswith("/"):
+        path += "index.html"
+    if frontend_assets.manifest is None:
+        return _raw_file(path)
+
+    entry = frontend_assets.lookup(path)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="Not found")
+
+    encoding = negotiate(request.headers.get("accept-encoding", ""), entry["encodings"])
+    etag = f'"{entry["etag"]}-{encoding}"' if encoding else f'"{entry["etag"]}"'
+    headers = {
+        "etag": etag,
+        "cache-control": CACHE_CONTROL if entry["immutable"] else REVALIDATE,
+        "vary": "Accept-Encoding"
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    file_path = os.path.join(frontend_assets.output, entry["url"])
+    if encoding:
+        headers["content-encoding"] = encoding
+        file_path += ENCODINGS[encoding]
+    media_type = mimetypes.guess_type(entry["url"])[0] or "application/octet-stream"
+    return FileResponse(file_path, media_type=media_type, headers=headers)
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint and precompress the frontend")
+    parser.add_argument("--source", default=FRONTEND_DIR, help="Frontend source directory")
+    parser.add_argument("--output", default=FRONTEND_BUILD_DIR, help="Build output directory")
+    parser.add_argument("--force", action="store_true", help="Rebuild even if the sources are unchanged")
+    parser.add_argument("--json", action="store_true", help="Print the manifest as JSON")
+    args = parser.parse_args()
+
+    manifest = FrontendAssets(args.source, args.output).build(force=args.force)
+    if args.json:
+        print(json.dumps(manifest, indent=2))
+        return
+    if not manifest["brotli"]:
+        print("brotli is not installed: gzip only (pip install brotli)")
+    print(f"{'file':<32} {'url':<40} {'bytes':>9} {'gzip':>9} {'br':>9}")
+    for name, entry in manifest["files"].items():
+        sizes = entry["sizes"]
+        print(f"{name:<32} {entry['url']:<40} {sizes['identity']:>9} "
+              f"{sizes.get('gzip', '-'):>9} {sizes.get('br', '-'):>9}")
+
+if __name__ == "__main__":
+    main()
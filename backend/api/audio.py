@@ -0,0 +1,194 @@
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from typing import Optional, Tuple
+import hashlib
+import re
+import anyio
+from models.storage import get_storage, BlobNotFoundError, BlobStorage
+from models.shared_store import LRUCache
+
+router = APIRouter(tags=["audio"])
+
+CHUNK_SIZE = 64 * 1024
+CACHE_CONTROL = "public, max-age=31536000, immutable"
+# Audio names address the text, not the bytes: cleanup deletes old files and
+# gTTS may render the same text differently next time, so clients revalidate
+AUDIO_CACHE_CONTROL = "public, no-cache"
+DIGEST_CACHE_SIZE = 4096
+
+# Only TTS output files (see TextToSpeech.audio_filename) are served here
+AUDIO_NAME = re.compile(r"^tts_[0-9a-f]{32}\.mp3$")
+
+# Byte digests per stored version (name, size, mtime), hashed once
+_digests = LRUCache(DIGEST_CACHE_SIZE)
+
+class FileRangeResponse(Response):
+    """
+    Sends `length` bytes of a local file starting at `offset`.
+
+    Uses the ASGI zero-copy extension (sendfile) when the server offers it,
+    otherwise streams the range in chunks from a worker thread.
+    """
+
+    def __init__(self, path: str, offset: int, length: int, status_code: int, headers: dict, send_body: bool = True):
+        super().__init__(status_code=status_code, headers=headers, media_type="audio/mpeg")
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.send_body = send_body
+        self.headers["content-length"] = str(length)
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if not self.send_body or self.length == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            with open(self.path, "rb") as f:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f.fileno(),
+                    "offset": self.offset,
+                    "count": self.length
+                })
+            return
+
+        async with await anyio.open_file(self.path, "rb") as f:
+            await f.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0:
+            await send({"type": "http.response.body", "body": b""})
+
+class BlobRangeResponse(Response):
+    """
+    Streams a byte range of a blob from storage without a local file
+    (memory or S3 backends), one CHUNK_SIZE ranged read at a time.
+    """
+
+    def __init__(self, storage: BlobStorage, key: str, offset: int, length: int, status_code: int,
+                 headers: dict, send_body: bool = True):
+        super().__init__(status_code=status_code, headers=headers, media_type="audio/mpeg")
+        self.storage = storage
+        self.key = key
+        self.offset = offset
+        self.length = length
+        self.send_body = send_body
+        self.headers["content-length"] = str(length)
+
+    async def __call__(self, scope, receive, send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        position = self.offset
+        remaining = self.length if self.send_body else 0
+        while remaining > 0:
+            chunk = await anyio.to_thread.run_sync(
+                self.storage.read_range, self.key, position, min(CHUNK_SIZE, remaining)
+            )
+            if not chunk:
+                break
+            position += len(chunk)
+            remaining -= len(chunk)
+            await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining > 0 or not self.send_body or self.length == 0:
+            await send({"type": "http.response.body", "body": b""})
+
+def parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single-range `Range: bytes=...` header into (start, end) inclusive.
+
+    Returns None for headers we ignore (other units, multiple ranges) and
+    raises ValueError for unsatisfiable ranges.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+
+    first, _, last = spec.strip().partition("-")
+    try:
+        if first == "":
+            # Suffix range: the final N bytes
+            suffix = int(last)
+            if suffix <= 0:
+                raise ValueError("Empty suffix range")
+            return max(0, size - suffix), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        raise ValueError(f"Malformed range: {header}")
+
+    if start >= size or end < start:
+        raise ValueError(f"Range not satisfiable: {header}")
+    return start, min(end, size - 1)
+
+def _audio_etag(storage: BlobStorage, filename: str, size: int, mtime: float) -> str:
+    """Strong ETag from a hash of the stored bytes, cached per blob version."""
+    version = f"{filename}:{size}:{mtime}"
+    digest = _digests.get(version)
+    if digest is None:
+        digest = hashlib.sha256(storage.get(filename)).hexdigest()[:32]
+        _digests.set(version, digest)
+    return f'"{digest}"'
+
+def _etag_matches(header: str, etag: str) -> bool:
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    # If-None-Match uses weak comparison
+    return etag in candidates or f"W/{etag}" in candidates
+
+@router.api_route("/audio/{filename}", methods=["GET", "HEAD"])
+async def serve_audio(filename: str, request: Request) -> Response:
+    """
+    Serve synthesized audio with revalidated caching and seeking support.
+    Local storage is sent zero-copy from disk; other backends are streamed.
+
+    - Strong ETag (hash of the stored bytes), revalidated on every use
+    - Conditional GET: `If-None-Match` -> 304 Not Modified
+    - `Range` requests -> 206 Partial Content (honouring `If-Range`)
+    """
+    if not AUDIO_NAME.match(filename):
+        raise HTTPException(status_code=404, detail="Audio file not found")
+
+    storage = get_storage("audio")
+    try:
+        size, mtime = await anyio.to_thread.run_sync(storage.stat, filename)
+        etag = await anyio.to_thread.run_sync(_audio_etag, storage, filename, size, mtime)
+    except BlobNotFoundError:
+        raise HTTPException(status_code=404, detail="Audio file not found")
+    path = storage.local_path(filename)
+
+    def body(offset: int, length: int, status_code: int) -> Response:
+        if path is not None:
+            return FileRangeResponse(path, offset, length, status_code, headers, send_body)
+        return BlobRangeResponse(storage, filename, offset, length, status_code, headers, send_body)
+
+    headers = {
+        "etag": etag,
+        "cache-control": AUDIO_CACHE_CONTROL,
+        "accept-ranges": "bytes"
+    }
+    send_body = request.method != "HEAD"
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "content-range": f"bytes */{size}"})
+        if byte_range is not None:
+            start, end = byte_range
+            headers["content-range"] = f"bytes {start}-{end}/{size}"
+            return body(start, end - start + 1, 206)
+
+    return body(0, size, 200)
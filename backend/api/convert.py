@@ -1,32 +1,29 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, HTTPException, UploadFile, File, BackgroundTasks, Query, Header, Request, Response
 from pydantic import BaseModel
-from typing import Dict
+from typing import Dict, Optional
+import asyncio
 import os
 import uuid
-import time
-from models.braille_model import BrailleRecognizer
+from models.inference_scheduler import get_scheduler
+from models.language_model import decode_result, MAX_BEAM_WIDTH
+from models.metrics import metrics
+from models.storage import get_storage
 from models.tts_model import TextToSpeech
+from api.upload import cleanup_old_files, cleanup_due
+from api.idempotency import run_idempotent, fingerprint
 
 router = APIRouter(prefix="/api", tags=["convert"])
 
-# Constants for file management
-UPLOAD_DIR = "uploads"
-MAX_FILE_AGE_HOURS = 24
+# Keep a copy of every converted upload for auditing. Written after the
+# response is sent, so it never sits on the conversion's critical path.
+PERSIST_UPLOADS = os.getenv("PERSIST_UPLOADS", "false").lower() == "true"
 
-def cleanup_old_files():
-    """Remove files older than MAX_FILE_AGE_HOURS from uploads directory."""
+def persist_upload(content: bytes, filename: str):
+    """Write an already-processed upload to upload storage (background task)."""
     try:
-        current_time = time.time()
-        if os.path.exists(UPLOAD_DIR):
-            for filename in os.listdir(UPLOAD_DIR):
-                file_path = os.path.join(UPLOAD_DIR, filename)
-                if os.path.isfile(file_path):
-                    file_age = current_time - os.path.getctime(file_path)
-                    if file_age > MAX_FILE_AGE_HOURS * 3600:
-                        os.remove(file_path)
-                        print(f"Cleaned up old file: {filename}")
+        get_storage("uploads").put(filename, content)
     except Exception as e:
-        print(f"Error during cleanup: {e}")
+        print(f"Failed to persist upload {filename}: {e}")
 
 class ConvertResponse(BaseModel):
     text: str
@@ -35,13 +32,23 @@ class ConvertResponse(BaseModel):
     duration: float
 
 @router.post("/convert", response_model=ConvertResponse)
-async def convert_image_to_speech(file: UploadFile = File(...)) -> ConvertResponse:
+async def convert_image_to_speech(request: Request, response: Response, background_tasks: BackgroundTasks,
+                                  file: UploadFile = File(...),
+                                  beam_width: Optional[int] = Query(None, ge=0, le=MAX_BEAM_WIDTH),
+                                  idempotency_key: Optional[str] = Header(None)) -> ConvertResponse:
     """
     Full pipeline: Image → Bangla Text → Speech
     Upload image, recognize Braille, and synthesize speech.
+    
+    The image is decoded straight from the in-memory upload. Set
+    PERSIST_UPLOADS=true to also keep the original in upload storage for auditing.
+    `beam_width` sets language-model decoding per request (0 = greedy).
+    With an Idempotency-Key header, retries of the same upload return the
+    first result instead of converting again (see api/idempotency.py).
     """
-    # Run cleanup before processing
-    cleanup_old_files()
+    # Periodic upload cleanup, off the request path
+    if cleanup_due():
+        background_tasks.add_task(cleanup_old_files)
     
     if not file.filename:
         raise HTTPException(status_code=400, detail="No filename provided")
@@ -56,10 +63,8 @@ async def convert_image_to_speech(file: UploadFile = File(...)) -> ConvertRespon
             detail=f"Unsupported format. Allowed: {', '.join(allowed_extensions)}"
         )
     
-# Save uploaded file
     file_id = str(uuid.uuid4())
     filename = f"{file_id}{file_ext}"
-    upload_path = os.path.join("uploads", filename)
     
     try:
         # Check file size before reading
@@ -74,27 +79,34 @@ async def convert_image_to_speech(file: UploadFile = File(...)) -> ConvertRespon
                 detail=f"File too large. Maximum size: 10MB, received: {file_size / (1024*1024):.2f}MB"
             )
         
-        with open(upload_path, "wb") as buffer:
-            content = await file.read()
-            buffer.write(content)
-        
-        # Step 1: Braille Recognition
-        recognizer = BrailleRecognizer()
-        recognition_result = recognizer.recognize(upload_path)
+        content = await file.read()
         
-        # Step 2: Text-to-Speech
-        tts = TextToSpeech()
-        synthesis_result = tts.synthesize(recognition_result["text"])
+        async def convert() -> Dict:
+            with metrics.track("in_flight.convert"):
+                # Step 1: Braille Recognition (decoded from memory, micro-batched)
+                recognition_result = await get_scheduler().recognize(content)
+                loop = asyncio.get_running_loop()
+                recognition_result = await loop.run_in_executor(None, decode_result, recognition_result, beam_width)
+                
+                # Step 2: Text-to-Speech (gTTS network call, off the event loop)
+                tts = TextToSpeech()
+                synthesis_result = await loop.run_in_executor(None, tts.synthesize, recognition_result["text"])
+            
+            if PERSIST_UPLOADS:
+                background_tasks.add_task(persist_upload, content, filename)
+            
+            return {
+                "text": recognition_result["text"],
+                "audio_url": synthesis_result["audio_url"],
+                "confidence": recognition_result["confidence"],
+                "duration": synthesis_result["duration"]
+            }
         
-        return ConvertResponse(
-            text=recognition_result["text"],
-            audio_url=synthesis_result["audio_url"],
-            confidence=recognition_result["confidence"],
-            duration=synthesis_result["duration"]
-        )
+        result = await run_idempotent(request, response, idempotency_key,
+                                      fingerprint(content, file_ext, beam_width), convert)
+        return ConvertResponse(**result)
         
+    except HTTPException:
+        raise
     except Exception as e:
-        # Cleanup on failure
-        if os.path.exists(upload_path):
-            os.remove(upload_path)
         raise HTTPException(status_code=500, detail=f"Conversion failed: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,153 @@
+from fastapi import APIRouter, HTTPException, UploadFile, File, Query
+from fastapi.responses import StreamingResponse
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Optional
+import asyncio
+import io
+import json
+import os
+from models.braille_model import BrailleRecognizer, DOCUMENT_EXTENSIONS
+from models.language_model import decode_result, MAX_BEAM_WIDTH
+from models.metrics import metrics
+from models.tts_model import TextToSpeech
+
+router = APIRouter(prefix="/api", tags=["document"])
+
+MAX_DOCUMENT_SIZE = 100 * 1024 * 1024  # 100MB
+MAX_PAGES_IN_FLIGHT = 4  # Decoded pages held in memory at any one time
+RECOGNITION_WORKERS = 4
+
+# Page recognition runs in parallel; page TTS jobs go through a single worker
+# so audio is produced strictly in page order.
+_recognition_executor = ThreadPoolExecutor(max_workers=RECOGNITION_WORKERS, thread_name_prefix="doc-recognize")
+_tts_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="doc-tts")
+
+def _event(payload: Dict) -> bytes:
+    return (json.dumps(payload, ensure_ascii=False) + "\n").encode("utf-8")
+
+def _recognize_page(recognizer: BrailleRecognizer, processed, beam_width: Optional[int]) -> Dict:
+    return decode_result(recognizer.recognize_processed(processed), beam_width)
+
+async def _tracked(events: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+    """Count the document as in flight until its last event is sent."""
+    with metrics.track("in_flight.document"):
+        async for event in events:
+            yield event
+
+async def _stream_document(content: bytes, is_pdf: bool, synthesize: bool,
+                           beam_width: Optional[int] = None) -> AsyncIterator[bytes]:
+    """
+    Recognize pages as they are decoded and yield one NDJSON event per result.
+
+    At most MAX_PAGES_IN_FLIGHT pages are decoded but not yet recognized, so
+    memory stays bounded regardless of document length.
+    """
+    loop = asyncio.get_running_loop()
+    recognizer = BrailleRecognizer()
+    tts = TextToSpeech() if synthesize else None
+    pages = recognizer.iter_pages(io.BytesIO(content), is_pdf=is_pdf)
+
+    pending = {}        # asyncio future -> (kind, page number)
+    recognized = {}     # page number -> text, waiting for its TTS turn
+    next_page = 0
+    next_tts_page = 0
+    exhausted = False
+
+    while True:
+        # Keep the recognition window full
+        while not exhausted and sum(1 for kind, _ in pending.values() if kind == "page") < MAX_PAGES_IN_FLIGHT:
+            try:
+                processed = await loop.run_in_executor(_recognition_executor, next, pages, None)
+            except Exception as e:
+                yield _event({"event": "error", "page": next_page, "detail": f"Page decoding failed: {str(e)}"})
+                exhausted = True
+                break
+            if processed is None:
+                exhausted = True
+                break
+            future = loop.run_in_executor(_recognition_executor, _recognize_page, recognizer, processed, beam_width)
+            pending[future] = ("page", next_page)
+            next_page += 1
+
+        if not pending:
+            break
+
+        done, _ = await asyncio.wait(pending.keys(), return_when=asyncio.FIRST_COMPLETED)
+        for future in sorted(done, key=lambda f: pending[f][1]):
+            kind, page = pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                yield _event({"event": "error", "page": page, "detail": str(e)})
+                if kind == "page":
+                    recognized[page] = None
+            else:
+                if kind == "page":
+                    recognized[page] = result["text"]
+                    yield _event({
+                        "event": "page",
+                        "page": page,
+                        "text": result["text"],
+                        "confidence": result["confidence"]
+                    })
+                else:
+                    yield _event({
+                        "event": "audio",
+                        "page": page,
+                        "audio_url": result["audio_url"],
+                        "duration": result["duration"]
+                    })
+
+        # Queue TTS for the contiguous run of recognized pages, in order
+        while next_tts_page in recognized:
+            text = recognized.pop(next_tts_page)
+            if tts is not None and text and text.strip():
+                future = loop.run_in_executor(_tts_executor, tts.synthesize, text)
+                pending[future] = ("audio", next_tts_page)
+            next_tts_page += 1
+
+    yield _event({"event": "done", "pages": next_page})
+
+@router.post("/document")
+async def recognize_document(file: UploadFile = File(...), synthesize: bool = True,
+                             beam_width: Optional[int] = Query(None, ge=0, le=MAX_BEAM_WIDTH)) -> StreamingResponse:
+    """
+    Document mode: recognize every page of a multi-page TIFF or PDF.
+
+    Streams newline-delimited JSON events as pages complete:
+    - {"event": "page", "page": 0, "text": "...", "confidence": 0.87}
+    - {"event": "audio", "page": 0, "audio_url": "...", "duration": 2.5}
+    - {"event": "error", "page": 3, "detail": "..."}
+    - {"event": "done", "pages": 12}
+
+    Page events may arrive out of order; audio events always follow page order.
+    `beam_width` sets language-model decoding per request (0 = greedy).
+    """
+    if not file.filename:
+        raise HTTPException(status_code=400, detail="No filename provided")
+
+    file_ext = os.path.splitext(file.filename)[1].lower()
+
+    if file_ext not in DOCUMENT_EXTENSIONS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported document format. Allowed: {', '.join(sorted(DOCUMENT_EXTENSIONS))}"
+        )
+
+    # Check file size before reading
+    file.file.seek(0, 2)
+    file_size = file.file.tell()
+    file.file.seek(0)
+
+    if file_size > MAX_DOCUMENT_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Document too large. Maximum size: 100MB, received: {file_size / (1024*1024):.2f}MB"
+        )
+
+    content = await file.read()
+
+    return StreamingResponse(
+        _tracked(_stream_document(content, is_pdf=file_ext == ".pdf", synthesize=synthesize, beam_width=beam_width)),
+        media_type="application/x-ndjson"
+    )
@@ -0,0 +1,239 @@
+"""
+Idempotency keys for expensive POST routes (/api/convert, /api/synthesize).
+
+A client sends an `Idempotency-Key` header (e.g. a UUID per logical request)
+and reuses it on retries:
+
+- first request: the work runs once and its response is stored for
+  IDEMPOTENCY_TTL_SECONDS in a bounded store
+- retry after completion: the stored response is returned
+  (`Idempotent-Replayed: true`) without re-recognizing or re-synthesizing
+- retry while the first is still running: it waits on the same
+  computation (single-flight) instead of starting another one
+- same key with a different request body: 422
+
+The computation runs as its own task, so a client that disconnects
+mid-request does not cancel it and its retry picks up the result. Failed
+computations are not stored; retrying them runs the work again.
+
+Keys are scoped per route and per authenticated user (anonymous clients
+share one scope, since a mobile client's IP may change between retries).
+In multi-worker mode completed responses live in the shared store and a
+claim record there coalesces duplicates that reach different workers.
+"""
+
+import asyncio
+import hashlib
+import os
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from fastapi import HTTPException, Request, Response
+from models.auth import auth
+from models.metrics import metrics
+from models.shared_store import get_shared_store, shared_cache
+
+IDEMPOTENCY_TTL_SECONDS = float(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+IDEMPOTENCY_MAX_KEYS = int(os.getenv("IDEMPOTENCY_MAX_KEYS", "10000"))
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "120"))  # Max wait on an in-flight duplicate
+MAX_KEY_LENGTH = 255
+POLL_SECONDS = 0.05      # Shared mode: how often a duplicate checks another worker's progress
+# Shared mode: a claim not refreshed for IDEMPOTENCY_WAIT_SECONDS is considered
+# abandoned (crashed worker); the owner refreshes it this often while working
+CLAIM_REFRESH_FRACTION = 1 / 3
+PENDING_NAMESPACE = "idempotency.pending"
+
+class IdempotencyKeyReused(ValueError):
+    """The key was already used with a different request."""
+
+class IdempotencyInProgress(RuntimeError):
+    """The original request is still running after the wait limit."""
+
+class IdempotencyStore:
+    """
+    Completed responses in a bounded TTL cache (shared across workers when
+    enabled) plus this worker's in-flight computations by key.
+    """
+
+    def __init__(self, ttl: float = IDEMPOTENCY_TTL_SECONDS, max_keys: int = IDEMPOTENCY_MAX_KEYS,
+                 wait: float = IDEMPOTENCY_WAIT_SECONDS):
+        self.ttl = ttl
+        self.wait = wait
+        self._completed = shared_cache("idempotency", max_keys, ttl)
+        self._store = get_shared_store()
+        self._owner = f"{os.getpid()}"
+        # key -> (fingerprint, task)
+        self._flights: Dict[str, Tuple[str, asyncio.Task]] = {}
+
+    def _stored(self, key: str, fingerprint: str) -> Optional[Any]:
+        record = self._completed.get(key)
+        if record is None:
+            return None
+        if record["fingerprint"] != fingerprint:
+            raise IdempotencyKeyReused("Idempotency-Key was already used with a different request")
+        return record["response"]
+
+    async def run(self, key: str, fingerprint: str, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        (response, replayed). compute() runs at most once per key while its
+        result is stored; it must return a JSON-serializable value.
+        """
+        deadline = time.monotonic() + self.wait
+        while True:
+            response = await self._blocking(self._stored, key, fingerprint)
+            if response is not None:
+                return response, True
+
+            flight = self._flights.get(key)
+            if flight is not None:
+                return await self._join_flight(flight, fingerprint, deadline), True
+
+            claimed = await self._blocking(self._claim, key, fingerprint)
+            # A duplicate in this worker may have claimed (as the same owner)
+            # and started the work while the claim ran in a thread
+            flight = self._flights.get(key)
+            if flight is not None:
+                return await self._join_flight(flight, fingerprint, deadline), True
+            if claimed:
+                # Registered before the next await, so later duplicates join it
+                task = asyncio.ensure_future(self._execute(key, fingerprint, compute))
+                self._flights[key] = (fingerprint, task)
+                # Shielded: cancelling this request does not cancel the work
+                return await asyncio.shield(task)
+
+            # Running on another worker: poll until it stores a result or
+            # gives up its claim (then try to claim it ourselves)
+            if time.monotonic() >= deadline:
+                raise IdempotencyInProgress("A request with this Idempotency-Key is still in progress")
+            await asyncio.sleep(POLL_SECONDS)
+
+    async def _blocking(self, fn: Callable[..., Any], *args) -> Any:
+        """
+        Shared mode: store calls are SQLite reads and BEGIN IMMEDIATE writes
+        with a busy timeout, so run them in the executor; in-process dicts
+        are used inline.
+        """
+        if self._store is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+    async def _join_flight(self, flight: Tuple[str, asyncio.Task], fingerprint: str, deadline: float) -> Any:
+        if flight[0] != fingerprint:
+            raise IdempotencyKeyReused("Idempotency-Key is in use by a different request")
+        try:
+            response, _ = await asyncio.wait_for(asyncio.shield(flight[1]), max(deadline - time.monotonic(), 0))
+            return response
+        except asyncio.TimeoutError:
+            raise IdempotencyInProgress("A request with this Idempotency-Key is still in progress")
+
+    async def _execute(self, key: str, fingerprint: str, compute: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        try:
+            # Shared mode: the previous owner may have stored its result and
+            # released the claim after our lookup
+            response = await self._blocking(self._stored, key, fingerprint)
+            if response is not None:
+                return response, True
+            heartbeat = asyncio.ensure_future(self._keep_claimed(key, fingerprint)) if self._store is not None else None
+            try:
+                response = await compute()
+            finally:
+                if heartbeat is not None:
+                    heartbeat.cancel()
+            await self._blocking(self._completed.set, key, {"fingerprint": fingerprint, "response": response})
+            return response, False
+        finally:
+            self._flights.pop(key, None)
+            await self._blocking(self._release, key)
+
+    async def _keep_claimed(self, key: str, fingerprint: str):
+        """
+        Refresh our claim while compute() runs, so work that takes longer
+        than the wait limit is not claimed and run again by another worker.
+        """
+        while True:
+            await asyncio.sleep(self.wait * CLAIM_REFRESH_FRACTION)
+            await self._blocking(self._refresh, key, fingerprint)
+
+    def _claim(self, key: str, fingerprint: str) -> bool:
+        """Single-process: always ours. Shared: atomic claim unless another live worker holds it."""
+        if self._store is None:
+            return True
+        claimed = []
+
+        def claim(current):
+            now = time.time()
+            if current is not None and current["owner"] != self._owner and now - current["claimed_at"] < self.wait:
+                if current["fingerprint"] != fingerprint:
+                    raise IdempotencyKeyReused("Idempotency-Key is in use by a different request")
+                claimed.append(False)
+                return current
+            claimed.append(True)
+            return {"owner": self._owner, "fingerprint": fingerprint, "claimed_at": now}
+
+        self._store.update(PENDING_NAMESPACE, key, claim, ttl=self.wait)
+        return claimed[0]
+
+    def _refresh(self, key: str, fingerprint: str):
+        def refresh(current):
+            if current is not None and current["owner"] != self._owner:
+                return current  # Taken over after we stalled; leave it
+            return {"owner": self._owner, "fingerprint": fingerprint, "claimed_at": time.time()}
+
+        self._store.update(PENDING_NAMESPACE, key, refresh, ttl=self.wait)
+
+    def _release(self, key: str):
+        if self._store is not None:
+            self._store.delete(PENDING_NAMESPACE, key)
+
+    def in_flight(self) -> int:
+        return len(self._flights)
+
+_idempotency_store: Optional[IdempotencyStore] = None
+
+def get_idempotency_store() -> IdempotencyStore:
+    global _idempotency_store
+    if _idempotency_store is None:
+        _idempotency_store = IdempotencyStore()
+    return _idempotency_store
+
+def fingerprint(*parts: Any) -> str:
+    """Hash of the request content a key is bound to."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part if isinstance(part, bytes) else repr(part).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+def _user_scope(request: Request) -> str:
+    scheme, _, token = request.headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "bearer" and token:
+        user = auth.validate_session(token.strip())
+        if user is not None:
+            return f"user:{user.id}"
+    return "anonymous"
+
+async def run_idempotent(request: Request, response: Response, key: Optional[str], request_fingerprint: str,
+                         compute: Callable[[], Awaitable[Any]]) -> Any:
+    """
+    Route helper: compute() directly without a key, otherwise through the
+    idempotency store, mapping key errors to HTTP status codes.
+    """
+    if key is None:
+        return await compute()
+    if not 0 < len(key) <= MAX_KEY_LENGTH or not key.isprintable():
+        raise HTTPException(status_code=400, detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} printable characters")
+
+    scope = "anonymous"
+    if request.headers.get("authorization"):
+        # Session lookups may read the auth files or the shared store
+        scope = await asyncio.get_running_loop().run_in_executor(None, _user_scope, request)
+    scoped_key = f"{request.url.path}:{scope}:{key}"
+    try:
+        result, replayed = await get_idempotency_store().run(scoped_key, request_fingerprint, compute)
+    except IdempotencyKeyReused as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    except IdempotencyInProgress as e:
+        raise HTTPException(status_code=409, detail=str(e), headers={"Retry-After": "1"})
+    if replayed:
+        metrics.observe("idempotency.replayed", 1)
+        response.headers["Idempotent-Replayed"] = "true"
+    return result
@@ -0,0 +1,188 @@
+from __future__ import annotations
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from typing import List, Optional
+import asyncio
+import io
+import json
+from models.braille_model import BrailleRecognizer
+from models.lazy import lazy_import
+from models.inference_scheduler import get_scheduler
+from models.language_model import decode_result
+from models.metrics import metrics
+
+np = lazy_import("numpy")
+Image = lazy_import("PIL.Image")
+
+router = APIRouter(tags=["live"])
+
+MAX_FRAME_SIZE = 2 * 1024 * 1024  # 2MB per encoded camera frame
+REGION_ROWS = 4                   # Horizontal bands, roughly groups of Braille lines
+HASH_WIDTH = 16                   # Difference-hash columns per band
+HASH_HEIGHT = 8                   # Difference-hash rows per band
+FRAME_SKIP_BITS = 6               # Whole-frame hash distance below which a frame is skipped
+REGION_CHANGE_BITS = 10           # Band hash distance above which a band is re-recognized
+
+def difference_hash(gray: Image.Image) -> np.ndarray:
+    """
+    Per-band difference hash of a frame: shape (REGION_ROWS, HASH_HEIGHT * HASH_WIDTH) bools.
+
+    The frame is downsampled once to a tiny grid and every bit records whether
+    a cell is brighter than its right neighbour, which is robust to exposure
+    changes and sensor noise but flips when content moves.
+    """
+    small = np.asarray(gray.resize((HASH_WIDTH + 1, HASH_HEIGHT * REGION_ROWS), Image.BILINEAR), dtype=np.int16)
+    bits = small[:, 1:] > small[:, :-1]
+    return bits.reshape(REGION_ROWS, HASH_HEIGHT * HASH_WIDTH)
+
+def region_boxes(size: tuple) -> List[tuple]:
+    width, height = size
+    edges = np.linspace(0, height, REGION_ROWS + 1).astype(int)
+    return [(0, int(edges[i]), width, int(edges[i + 1])) for i in range(REGION_ROWS)]
+
+class LiveSession:
+    """
+    Per-connection state: per band, the hash it was last recognized at and
+    the recognized text.
+    """
+
+    def __init__(self):
+        self.recognizer = BrailleRecognizer()
+        self.reset()
+
+    def reset(self):
+        # Baselines move only when a band is recognized, so slow drift of a
+        # few bits per frame still adds up to a re-recognition
+        self.band_hash: List[Optional[np.ndarray]] = [None] * REGION_ROWS
+        self.region_text = [""] * REGION_ROWS
+        self.frames_received = 0
+        self.frames_processed = 0
+
+    def changed_regions(self, frame_hash: np.ndarray) -> Optional[List[int]]:
+        """
+        None if the frame barely differs from the bands' baselines,
+        otherwise the indices of bands that need recognition.
+        """
+        distance = [frame_hash.shape[1] if baseline is None else int((frame_hash[i] != baseline).sum())
+                    for i, baseline in enumerate(self.band_hash)]
+        if sum(distance) < FRAME_SKIP_BITS:
+            return None
+        return [i for i, bits in enumerate(distance) if bits > REGION_CHANGE_BITS]
+
+    def decode(self, frame: bytes) -> tuple:
+        with Image.open(io.BytesIO(frame)) as image:
+            gray = image.convert("L")
+        return gray, difference_hash(gray)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(text for text in self.region_text if text)
+
+async def _process_frames(websocket: WebSocket, session: LiveSession, latest: dict, wakeup: asyncio.Event):
+    loop = asyncio.get_running_loop()
+    scheduler = get_scheduler()
+
+    while True:
+        await wakeup.wait()
+        wakeup.clear()
+        entry = latest.pop("frame", None)
+        if entry is None:
+            continue
+        frame_index, frame = entry
+
+        try:
+            gray, frame_hash = await loop.run_in_executor(None, session.decode, frame)
+        except Exception as e:
+            await websocket.send_json({"type": "error", "detail": f"Frame decoding failed: {str(e)}"})
+            continue
+
+        regions = session.changed_regions(frame_hash)
+        if regions is None:
+            metrics.observe("live.frames_skipped", 1)
+            continue
+
+        session.frames_processed += 1
+        if not regions:
+            # Global jitter without any band changing enough to matter
+            continue
+
+        # Changed bands go through the shared micro-batcher together
+        boxes = region_boxes(gray.size)
+        processed = await asyncio.gather(*[
+            loop.run_in_executor(None, session.recognizer.preprocess_frame, gray.crop(boxes[i]))
+            for i in regions
+        ])
+        results = await asyncio.gather(*[scheduler.submit(page) for page in processed], return_exceptions=True)
+        results = [
+            result if isinstance(result, Exception) else await loop.run_in_executor(None, decode_result, result)
+            for result in results
+        ]
+
+        changes = []
+        for region, result in zip(regions, results):
+            if isinstance(result, Exception):
+                continue  # Baseline kept: the band is retried on the next frame
+            session.band_hash[region] = frame_hash[region]
+            if result["text"] != session.region_text[region]:
+                session.region_text[region] = result["text"]
+                changes.append({"region": region, "text": result["text"], "confidence": result["confidence"]})
+
+        metrics.observe("live.regions_recognized", len(regions))
+        if changes:
+            await websocket.send_json({
+                "type": "delta",
+                "frame": frame_index,
+                "changes": changes,
+                "text": session.text
+            })
+
+@router.websocket("/ws/live")
+async def live_recognition(websocket: WebSocket):
+    """
+    Live camera mode.
+
+    The client streams encoded frames (JPEG/PNG) as binary messages. Frames
+    that barely differ from the last processed one are skipped using a cheap
+    difference hash, only changed bands of the frame are recognized, and
+    text deltas are pushed back:
+        {"type": "delta", "frame": 42, "changes": [{"region": 1, "text": "..."}], "text": "..."}
+
+    Only the newest frame is kept while one is being processed, so a slow
+    recognizer drops stale frames instead of building a backlog.
+    Text message {"type": "reset"} clears the session state.
+    """
+    await websocket.accept()
+    session = LiveSession()
+    latest = {}
+    wakeup = asyncio.Event()
+    processor = asyncio.create_task(_process_frames(websocket, session, latest, wakeup))
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                break
+
+            if message.get("bytes") is not None:
+                frame = message["bytes"]
+                if len(frame) > MAX_FRAME_SIZE:
+                    await websocket.send_json({"type": "error", "detail": "Frame too large. Maximum size: 2MB"})
+                    continue
+                session.frames_received += 1
+                latest["frame"] = (session.frames_received, frame)
+                wakeup.set()
+            elif message.get("text") is not None:
+                try:
+                    command = json.loads(message["text"])
+                except ValueError:
+                    command = {}
+                if command.get("type") == "reset":
+                    latest.pop("frame", None)
+                    session.reset()
+                    await websocket.send_json({"type": "reset"})
+
+            if processor.done():
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        processor.cancel()
@@ -0,0 +1,190 @@
+"""
+Per-client token-bucket admission control for expensive endpoints.
+
+Every client (bearer token's user, otherwise client IP) has a bucket that
+refills at RATE_LIMIT_RATE tokens/second up to RATE_LIMIT_BURST. A request
+spends its route's cost; if the bucket is short, the request is rejected with
+429 and Retry-After before the body is read.
+
+Each bucket is two floats (tokens, last update) and idle clients are evicted,
+so memory stays O(active clients). In multi-worker mode the buckets live in
+the shared store so the limit is per client, not per worker.
+"""
+
+import json
+import math
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+import anyio
+from models.auth import auth
+from models.metrics import metrics
+from models.shared_store import get_shared_store
+
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "true").lower() == "true"
+RATE_LIMIT_RATE = float(os.getenv("RATE_LIMIT_RATE", "1.0"))     # Tokens refilled per second
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "20"))    # Bucket capacity
+RATE_LIMIT_IDLE_SECONDS = 600                                    # Evict buckets idle this long
+RATE_LIMIT_MAX_CLIENTS = 100_000                                 # Hard cap on tracked clients
+
+# Cost per POST route; unlisted routes are not limited
+ROUTE_COSTS = {
+    "/api/document": 10.0,
+    "/api/convert": 5.0,
+    "/api/synthesize": 3.0,
+    "/api/recognize": 1.0,
+}
+
+def _refill(state: Optional[list], now: float, rate: float, burst: float) -> Tuple[float, float]:
+    if state is None:
+        return burst, now
+    tokens, updated = state
+    return min(burst, tokens + (now - updated) * rate), now
+
+class TokenBucketLimiter:
+    """
+    In-process buckets in an LRU-ordered dict: every access moves the client
+    to the end, so idle clients collect at the front and are evicted cheaply.
+    """
+
+    def __init__(self, rate: float = RATE_LIMIT_RATE, burst: float = RATE_LIMIT_BURST,
+                 idle_seconds: float = RATE_LIMIT_IDLE_SECONDS, max_clients: int = RATE_LIMIT_MAX_CLIENTS):
+        self.rate = rate
+        self.burst = burst
+        self.idle_seconds = idle_seconds
+        self.max_clients = max_clients
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, client: str, cost: float) -> float:
+        """
+        Spend `cost` tokens. Returns 0 if admitted, else seconds until it would be.
+        """
+        cost = min(cost, self.burst)
+        now = time.monotonic()
+        with self._lock:
+            tokens, _ = _refill(self._buckets.get(client), now, self.rate, self.burst)
+            admitted = tokens >= cost
+            if admitted:
+                tokens -= cost
+            self._buckets[client] = [tokens, now]
+            self._buckets.move_to_end(client)
+            self._evict(now)
+        return 0.0 if admitted else (cost - tokens) / self.rate
+
+    def _evict(self, now: float):
+        while self._buckets:
+            client, (_, updated) = next(iter(self._buckets.items()))
+            if now - updated < self.idle_seconds and len(self._buckets) <= self.max_clients:
+                break
+            self._buckets.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+class SharedTokenBucketLimiter:
+    """
+    Buckets in the shared SQLite store (multi-worker mode). Each acquire is
+    one atomic read-modify-write; idle buckets expire via the store's TTL.
+    """
+
+    namespace = "rate_limit"
+
+    def __init__(self, store, rate: float = RATE_LIMIT_RATE, burst: float = RATE_LIMIT_BURST,
+                 idle_seconds: float = RATE_LIMIT_IDLE_SECONDS):
+        self.store = store
+        self.rate = rate
+        self.burst = burst
+        self.idle_seconds = idle_seconds
+
+    def acquire(self, client: str, cost: float) -> float:
+        cost = min(cost, self.burst)
+        now = time.time()  # Wall clock: monotonic clocks differ between processes
+        outcome = {}
+
+        def spend(state):
+            tokens, _ = _refill(state, now, self.rate, self.burst)
+            outcome["admitted"] = tokens >= cost
+            outcome["tokens"] = tokens
+            return [tokens - cost if outcome["admitted"] else tokens, now]
+
+        self.store.update(self.namespace, client, spend, ttl=self.idle_seconds)
+        return 0.0 if outcome["admitted"] else (cost - outcome["tokens"]) / self.rate
+
+    def __len__(self) -> int:
+        return self.store.count(self.namespace)
+
+def create_limiter():
+    store = get_shared_store()
+    return SharedTokenBucketLimiter(store) if store is not None else TokenBucketLimiter()
+
+def _bearer_token(scope: dict) -> Optional[str]:
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() == "bearer" and token.strip():
+                return token.strip()
+            break
+    return None
+
+def client_key(scope: dict) -> str:
+    """
+    Rate-limit identity: the authenticated user for a valid bearer token,
+    otherwise the client IP.
+    """
+    token = _bearer_token(scope)
+    if token is not None:
+        user = auth.validate_session(token)
+        if user is not None:
+            return f"user:{user.id}"
+    client = scope.get("client")
+    return f"ip:{client[0] if client else 'unknown'}"
+
+class RateLimitMiddleware:
+    """
+    Pure ASGI middleware: rejected requests never reach the route, so their
+    request body (e.g. an uploaded image) is never received.
+    """
+
+    def __init__(self, app, limiter=None, costs: Optional[Dict[str, float]] = None):
+        self.app = app
+        self.limiter = limiter
+        self.costs = ROUTE_COSTS if costs is None else costs
+
+    def _acquire(self, scope: dict, cost: float) -> float:
+        return self.limiter.acquire(client_key(scope), cost)
+
+    async def __call__(self, scope, receive, send):
+        cost = self.costs.get(scope.get("path")) if scope["type"] == "http" else None
+        if cost is None or scope.get("method") != "POST":
+            await self.app(scope, receive, send)
+            return
+
+        if self.limiter is None:
+            self.limiter = create_limiter()
+        # Session lookups (auth files / shared store) and shared buckets (a
+        # SQLite write transaction) block; the in-memory path for anonymous
+        # clients stays inline, it is a dict update under a lock
+        if _bearer_token(scope) is not None or isinstance(self.limiter, SharedTokenBucketLimiter):
+            retry_after = await anyio.to_thread.run_sync(self._acquire, scope, cost)
+        else:
+            retry_after = self._acquire(scope, cost)
+        if retry_after <= 0:
+            await self.app(scope, receive, send)
+            return
+
+        metrics.observe("rate_limit.rejected", 1)
+        seconds = max(1, math.ceil(retry_after))
+        body = json.dumps({"detail": f"Rate limit exceeded. Retry after {seconds} seconds"}).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 429,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("latin-1")),
+                (b"retry-after", str(seconds).encode("latin-1")),
+            ]
+        })
+        await send({"type": "http.response.body", "body": body})
@@ -1,18 +1,37 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Dict
-import os
-from models.braille_model import BrailleRecognizer
+from pydantic import BaseModel, Field
+from typing import Any, Dict, Optional
+import asyncio
+from models.braille_model import preprocess_pipeline
+from models.inference_scheduler import get_scheduler
+from models.language_model import decode_result, MAX_BEAM_WIDTH
+from models.storage import get_storage, BlobNotFoundError
+from api.upload import find_upload
 
 router = APIRouter(prefix="/api", tags=["recognize"])
 
 class RecognizeRequest(BaseModel):
     file_id: str
+    # Language-model beam width: None = server default, 0 = greedy
+    beam_width: Optional[int] = Field(None, ge=0, le=MAX_BEAM_WIDTH)
+    # Per-stage preprocessing overrides, e.g. {"threshold": {"method": "otsu"}};
+    # re-running an upload with new settings reuses the unchanged stages
+    preprocessing: Optional[Dict[str, Dict[str, Any]]] = None
 
 class RecognizeResponse(BaseModel):
     text: str
     confidence: float
 
+def _load_upload(file_id: str) -> Optional[bytes]:
+    matching_file = find_upload(file_id)
+    if not matching_file:
+        return None
+    try:
+        return get_storage("uploads").get(matching_file)
+    except BlobNotFoundError:
+        # Removed by cleanup between lookup and read
+        return None
+
 @router.post("/recognize", response_model=RecognizeResponse)
 async def recognize_braille(request: RecognizeRequest) -> RecognizeResponse:
     """
@@ -21,26 +40,22 @@ async def recognize_braille(request: RecognizeRequest) -> RecognizeResponse:
     """
     if not request.file_id.strip():
         raise HTTPException(status_code=400, detail="File ID cannot be empty")
+    try:
+        preprocess_pipeline.resolve_params(request.preprocessing)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    upload_dir = "uploads"
-    
-    if not os.path.exists(upload_dir):
-        raise HTTPException(status_code=500, detail="Upload directory not found")
-    
-    files = os.listdir(upload_dir)
-    
-    matching_file = None
-    for file in files:
-        if file.startswith(request.file_id):
-            matching_file = os.path.join(upload_dir, file)
-            break
+    # Storage lookups may be network calls (S3), so keep them off the event loop
+    loop = asyncio.get_running_loop()
+    content = await loop.run_in_executor(None, _load_upload, request.file_id)
     
-    if not matching_file:
+    if content is None:
         raise HTTPException(status_code=404, detail=f"File with ID '{request.file_id}' not found")
     
     try:
-        recognizer = BrailleRecognizer()
-        result = recognizer.recognize(matching_file)
+        # Batched with concurrent /api/recognize and /api/convert requests
+        result = await get_scheduler().recognize(content, request.preprocessing)
+        result = await loop.run_in_executor(None, decode_result, result, request.beam_width)
         
         return RecognizeResponse(
             text=result["text"],
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Header, Request, Response
 from pydantic import BaseModel
-from typing import Dict
+from typing import Dict, Optional
+import asyncio
 from models.tts_model import TextToSpeech
+from models.metrics import metrics
+from api.idempotency import run_idempotent, fingerprint
 
 router = APIRouter(prefix="/api", tags=["synthesize"])
 
@@ -13,21 +16,27 @@ class SynthesizeResponse(BaseModel):
     duration: float
 
 @router.post("/synthesize", response_model=SynthesizeResponse)
-async def synthesize_speech(request: SynthesizeRequest) -> SynthesizeResponse:
+async def synthesize_speech(request: SynthesizeRequest, http_request: Request, response: Response,
+                            idempotency_key: Optional[str] = Header(None)) -> SynthesizeResponse:
     """
     Convert Bangla text to speech.
     Returns audio file URL and duration.
+    Retries with the same Idempotency-Key return the first result.
     """
     if not request.text.strip():
         raise HTTPException(status_code=400, detail="Text cannot be empty")
     
+    async def synthesize() -> Dict:
+        with metrics.track("in_flight.synthesize"):
+            # gTTS network call, off the event loop
+            tts = TextToSpeech()
+            result = await asyncio.get_running_loop().run_in_executor(None, tts.synthesize, request.text)
+        return {"audio_url": result["audio_url"], "duration": result["duration"]}
+    
     try:
-        tts = TextToSpeech()
-        result = tts.synthesize(request.text)
-        
-        return SynthesizeResponse(
-            audio_url=result["audio_url"],
-            duration=result["duration"]
-        )
+        result = await run_idempotent(http_request, response, idempotency_key, fingerprint(request.text), synthesize)
+        return SynthesizeResponse(**result)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Speech synthesis failed: {str(e)}")
\ No newline at end of file
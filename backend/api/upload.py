@@ -3,33 +3,57 @@ from fastapi.responses import JSONResponse
 import os
 import uuid
 import time
-from typing import Dict
+from typing import Dict, Optional
+from models.shared_store import shared_dict
+from models.storage import get_storage
 
 router = APIRouter(prefix="/api", tags=["upload"])
 
 ALLOWED_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.tiff', '.webp'}
-UPLOAD_DIR = "uploads"
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
 MAX_FILE_AGE_HOURS = 24  # Clean up files older than 24 hours
 
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+CLEANUP_INTERVAL_SECONDS = 600  # Minimum gap between request-triggered sweeps
+
+# file_id -> stored filename; shared between workers in multi-worker mode,
+# so /api/recognize can find an upload without listing the storage
+upload_index = shared_dict("uploads")
+
+_last_cleanup = 0.0
+
+def find_upload(file_id: str) -> Optional[str]:
+    """
+    Storage key of an upload, or None. Uses the index first, then probes each
+    allowed extension (uploads made before the index existed).
+    """
+    storage = get_storage("uploads")
+    indexed = upload_index.get(file_id)
+    if indexed and storage.exists(indexed):
+        return indexed
+    for ext in ALLOWED_EXTENSIONS:
+        if storage.exists(f"{file_id}{ext}"):
+            return f"{file_id}{ext}"
+    return None
+
+def _forget_upload(filename: str):
+    upload_index.pop(os.path.splitext(filename)[0], None)
+    print(f"Cleaned up old file: {filename}")
 
 def cleanup_old_files():
-    """Remove files older than MAX_FILE_AGE_HOURS from uploads directory."""
+    """
+    Remove files older than MAX_FILE_AGE_HOURS from upload storage.
+    Runs in the background after startup rather than at import time.
+    """
+    global _last_cleanup
+    _last_cleanup = time.time()
     try:
-        current_time = time.time()
-        for filename in os.listdir(UPLOAD_DIR):
-            file_path = os.path.join(UPLOAD_DIR, filename)
-            if os.path.isfile(file_path):
-                file_age = current_time - os.path.getctime(file_path)
-                if file_age > MAX_FILE_AGE_HOURS * 3600:
-                    os.remove(file_path)
-                    print(f"Cleaned up old file: {filename}")
+        get_storage("uploads").cleanup(MAX_FILE_AGE_HOURS * 3600, on_delete=_forget_upload)
     except Exception as e:
         print(f"Error during cleanup: {e}")
 
-# Run cleanup on module import
-cleanup_old_files()
+def cleanup_due() -> bool:
+    """Whether a request-triggered sweep is due (at most every CLEANUP_INTERVAL_SECONDS)."""
+    return time.time() - _last_cleanup > CLEANUP_INTERVAL_SECONDS
 
 @router.delete("/cleanup")
 async def cleanup_files() -> Dict[str, str]:
@@ -84,11 +108,11 @@ async def upload_image(file: UploadFile = File(...)) -> Dict[str, str]:
     
     file_id = str(uuid.uuid4())
     filename = f"{file_id}{file_ext}"
-    file_path = os.path.join(UPLOAD_DIR, filename)
+    storage = get_storage("uploads")
     
     try:
-        with open(file_path, "wb") as buffer:
-            buffer.write(content)
+        storage.put(filename, content)
+        upload_index[file_id] = filename
         
         return {
             "file_id": file_id,
@@ -98,6 +122,5 @@ async def upload_image(file: UploadFile = File(...)) -> Dict[str, str]:
         }
     except Exception as e:
         # Cleanup on failure
-        if os.path.exists(file_path):
-            os.remove(file_path)
+        storage.delete(filename)
         raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""
+Benchmark: int8 vs float32 Braille cell CNN
+
+Compares load time, weight size, inference throughput, peak inference
+memory and top-1 agreement of QuantizedBrailleCellCNN against the float32
+BrailleCellCNN baseline, using the same (randomly initialized) network.
+
+Usage (from backend/):
+    python -m benchmarks.bench_quantized_cnn --batch 256 --repeat 20
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+import numpy as np
+from models.quantized_cnn import (
+    BrailleCellCNN, QuantizedBrailleCellCNN, CELL_SIZE,
+    init_float_weights, quantize_weights, save_weights
+)
+
+def _measure(engine_cls, path: str, cells: np.ndarray, repeat: int) -> dict:
+    started = time.perf_counter()
+    engine = engine_cls.load(path)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    engine.predict_proba(cells[:8])  # warm-up
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        engine.predict_proba(cells)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    probs = engine.predict_proba(cells)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = float(np.median(timings))
+    return {
+        "load_ms": round(load_ms, 3),
+        "weights_bytes": os.path.getsize(path),
+        "batch_ms_median": round(best * 1000, 3),
+        "cells_per_second": round(len(cells) / best, 1),
+        "peak_inference_bytes": peak,
+        "_probs": probs
+    }
+
+def run(batch: int, repeat: int, seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    cells = rng.random((batch, CELL_SIZE, CELL_SIZE), dtype=np.float32)
+    float_weights = init_float_weights(seed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        float_path = os.path.join(tmp, "cell_cnn_f32.npz")
+        int8_path = os.path.join(tmp, "cell_cnn_int8.npz")
+        save_weights(float_path, float_weights)
+        save_weights(int8_path, quantize_weights(float_weights))
+
+        baseline = _measure(BrailleCellCNN, float_path, cells, repeat)
+        quantized = _measure(QuantizedBrailleCellCNN, int8_path, cells, repeat)
+
+    agreement = float((baseline.pop("_probs").argmax(1) == quantized["_probs"].argmax(1)).mean())
+    quantized.pop("_probs")
+
+    return {
+        "batch": batch,
+        "repeat": repeat,
+        "float32": baseline,
+        "int8": quantized,
+        "speedup": round(quantized["cells_per_second"] / baseline["cells_per_second"], 3),
+        "weights_ratio": round(quantized["weights_bytes"] / baseline["weights_bytes"], 3),
+        "top1_agreement": round(agreement, 4)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="int8 vs float32 Braille cell CNN benchmark")
+    parser.add_argument("--batch", type=int, default=256, help="Cells per forward pass")
+    parser.add_argument("--repeat", type=int, default=20, help="Timed forward passes per engine")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    report = run(args.batch, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"Batch {report['batch']} cells, {report['repeat']} runs")
+    print(f"{'':<24}{'float32':>14}{'int8':>14}")
+    for key in ("load_ms", "weights_bytes", "batch_ms_median", "cells_per_second", "peak_inference_bytes"):
+        print(f"{key:<24}{report['float32'][key]:>14}{report['int8'][key]:>14}")
+    print(f"Throughput ratio (int8/float32): {report['speedup']}")
+    print(f"Weight size ratio: {report['weights_ratio']}")
+    print(f"Top-1 agreement: {report['top1_agreement']:.2%}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Benchmark: single-pass Bangla text normalizer
+
+Measures TextNormalizer throughput in MB/s (UTF-8) on synthetic Bangla text
+containing numbers, dates, abbreviations, currency and punctuation, against
+a chain of per-rule regex substitutions producing comparable output, and
+checks that time grows linearly with input size.
+
+Usage (from backend/):
+    python -m benchmarks.bench_text_normalizer --size-kb 1024 --repeat 5
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+from models.text_normalizer import (
+    TextNormalizer, ABBREVIATIONS, SYMBOLS, CURRENCIES, PUNCTUATION, DIGITS,
+    number_to_words, digits_to_words, MAX_SPOKEN_DIGITS
+)
+
+WORDS = ["আমি", "বাংলা", "ভাষায়", "কথা", "বলি", "বই", "পড়তে", "ভালোবাসি", "স্কুলে", "যাই", "আজ", "আকাশ", "মেঘলা"]
+
+def make_text(size_bytes: int, seed: int) -> str:
+    rng = random.Random(seed)
+    digits = "০১২৩৪৫৬৭৮৯"
+    pieces, size = [], 0
+    while size < size_bytes:
+        roll = rng.random()
+        if roll < 0.70:
+            piece = rng.choice(WORDS)
+        elif roll < 0.80:
+            piece = "".join(rng.choice(digits) for _ in range(rng.randint(1, 6)))
+        elif roll < 0.84:
+            piece = f"{rng.randint(1, 28)}/{rng.randint(1, 12)}/{rng.randint(1950, 2030)}".translate(
+                str.maketrans("0123456789", digits))
+        elif roll < 0.90:
+            piece = rng.choice(list(ABBREVIATIONS))
+        elif roll < 0.93:
+            piece = "৳" + rng.choice(digits[1:]) + "০০"
+        else:
+            piece = rng.choice(WORDS) + rng.choice([".", ",", "!", "?", "।", "%"])
+        pieces.append(piece)
+        size += len(piece.encode("utf-8")) + 1
+    return " ".join(pieces)
+
+def _number(match: re.Match) -> str:
+    digits = match.group()
+    if len(digits) > MAX_SPOKEN_DIGITS or (len(digits) > 1 and DIGITS[digits[0]] == 0):
+        return f" {digits_to_words(digits)} "
+    return f" {number_to_words(int(''.join(str(DIGITS[d]) for d in digits)))} "
+
+def regex_chain(text: str) -> str:
+    """Baseline: one substitution pass over the whole text per rule."""
+    for key, value in ABBREVIATIONS.items():
+        text = re.sub(rf"(?<![\wঀ-৿]){re.escape(key)}", f" {value} ", text)
+    for key, value in CURRENCIES.items():
+        text = re.sub(rf"{re.escape(key)}([০-৯0-9]+)", rf"\1 {value}", text)
+    text = re.sub(r"[০-৯0-9]+", _number, text)
+    for key, value in SYMBOLS.items():
+        text = text.replace(key, f" {value} ")
+    for key, value in PUNCTUATION.items():
+        text = text.replace(key, value if value is not None else " ")
+    return " ".join(text.split())
+
+def _throughput(fn, text: str, repeat: int) -> dict:
+    fn(text[:1000])  # warm-up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn(text)
+        timings.append(time.perf_counter() - started)
+    best = sorted(timings)[len(timings) // 2]
+    megabytes = len(text.encode("utf-8")) / 1e6
+    return {"median_ms": round(best * 1000, 2), "mb_per_second": round(megabytes / best, 2)}
+
+def run(size_kb: int, repeat: int, seed: int) -> dict:
+    started = time.perf_counter()
+    normalizer = TextNormalizer()
+    compile_ms = (time.perf_counter() - started) * 1000
+
+    text = make_text(size_kb * 1024, seed)
+    single_pass = _throughput(normalizer.normalize, text, repeat)
+    baseline = _throughput(regex_chain, text, repeat)
+
+    # Linearity: time per MB should stay flat as the input grows
+    scaling = []
+    for factor in (1, 2, 4):
+        result = _throughput(normalizer.normalize, text * factor, max(1, repeat // 2))
+        scaling.append({"size_mb": round(len(text.encode("utf-8")) * factor / 1e6, 2), **result})
+
+    return {
+        "input_mb": round(len(text.encode("utf-8")) / 1e6, 3),
+        "compile_ms": round(compile_ms, 3),
+        "single_pass": single_pass,
+        "regex_chain": baseline,
+        "speedup": round(single_pass["mb_per_second"] / baseline["mb_per_second"], 2),
+        "scaling": scaling,
+        "sample": normalizer.normalize(text[:200])
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Bangla text normalizer throughput benchmark")
+    parser.add_argument("--size-kb", type=int, default=1024, help="Size of the synthetic input text")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per implementation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+
+    report = run(args.size_kb, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+
+    print(f"Input: {report['input_mb']} MB of synthetic Bangla text, rule set compiled in {report['compile_ms']} ms")
+    print(f"{'':<16}{'median_ms':>12}{'MB/s':>10}")
+    for key in ("single_pass", "regex_chain"):
+        print(f"{key:<16}{report[key]['median_ms']:>12}{report[key]['mb_per_second']:>10}")
+    print(f"Speedup: {report['speedup']}x")
+    print("Scaling (MB -> MB/s): " + ", ".join(f"{s['size_mb']} -> {s['mb_per_second']}" for s in report["scaling"]))
+    print(f"Sample: {report['sample']}")
+
+if __name__ == "__main__":
+    main()
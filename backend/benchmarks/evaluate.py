@@ -0,0 +1,263 @@
+"""
+Offline evaluation: accuracy and throughput on a labeled dataset
+
+Walks a dataset directory of page images, each with its ground truth in a
+sidecar UTF-8 text file (page_0001.png + page_0001.txt), recognizes the
+images in a process pool and reports:
+
+- CER / WER (corpus-level edit distance over reference length)
+- per-character confusion matrix (substitutions, deletions, insertions)
+- images per second (wall clock, all workers)
+- per-stage latency percentiles: read, preprocess, inference, decode
+
+The report is written as JSON, and --max-cer / --max-wer /
+--min-images-per-second turn the run into a pass/fail gate (exit code 1).
+
+Usage (from backend/):
+    python -m benchmarks.evaluate path/to/dataset --workers 4 --report report.json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+IMAGE_EXTENSIONS = {'.png', '.jpg', '.jpeg', '.bmp', '.tif', '.tiff', '.webp'}
+STAGES = ("read", "preprocess", "inference", "decode")
+DELETION = "<del>"
+INSERTION = "<ins>"
+
+def find_samples(dataset: str, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+    """(image path, reference text) for every image with a sidecar .txt."""
+    samples = []
+    for root, _, files in os.walk(dataset):
+        for name in sorted(files):
+            stem, ext = os.path.splitext(name)
+            label_path = os.path.join(root, stem + ".txt")
+            if ext.lower() in IMAGE_EXTENSIONS and os.path.exists(label_path):
+                with open(label_path, encoding="utf-8") as f:
+                    samples.append((os.path.join(root, name), f.read().strip()))
+    samples.sort()
+    return samples[:limit] if limit else samples
+
+def align(reference: List[str], hypothesis: List[str]) -> List[Tuple[str, str]]:
+    """
+    Levenshtein alignment as (ref, hyp) pairs; DELETION / INSERTION mark gaps.
+    """
+    n, m = len(reference), len(hypothesis)
+    cost = [list(range(m + 1))]
+    for i in range(1, n + 1):
+        previous, row = cost[-1], [i] + [0] * m
+        ref = reference[i - 1]
+        for j in range(1, m + 1):
+            row[j] = min(previous[j] + 1, row[j - 1] + 1, previous[j - 1] + (ref != hypothesis[j - 1]))
+        cost.append(row)
+
+    pairs = []
+    i, j = n, m
+    while i > 0 or j > 0:
+        if i > 0 and j > 0 and cost[i][j] == cost[i - 1][j - 1] + (reference[i - 1] != hypothesis[j - 1]):
+            pairs.append((reference[i - 1], hypothesis[j - 1]))
+            i, j = i - 1, j - 1
+        elif i > 0 and cost[i][j] == cost[i - 1][j] + 1:
+            pairs.append((reference[i - 1], DELETION))
+            i -= 1
+        else:
+            pairs.append((INSERTION, hypothesis[j - 1]))
+            j -= 1
+    pairs.reverse()
+    return pairs
+
+def edit_distance(reference: List[str], hypothesis: List[str]) -> int:
+    return sum(1 for ref, hyp in align(reference, hypothesis) if ref != hyp)
+
+# Per-process state, created once by the pool initializer
+_recognizer = None
+_beam_width = None
+
+def _init_worker(beam_width: Optional[int], verbose: bool):
+    global _recognizer, _beam_width
+    if not verbose:
+        # The mock recognizer prints one line per image
+        sys.stdout = open(os.devnull, "w")
+    from models.braille_model import BrailleRecognizer
+    _recognizer = BrailleRecognizer()
+    _beam_width = beam_width
+
+def _evaluate_sample(sample: Tuple[str, str]) -> Dict:
+    from models.language_model import decode_result
+    path, reference = sample
+    timings = {}
+    try:
+        started = time.perf_counter()
+        with open(path, "rb") as f:
+            content = f.read()
+        timings["read"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        processed = _recognizer.preprocess_image(content)
+        timings["preprocess"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        result = _recognizer.recognize_batch(processed[np.newaxis])[0]
+        timings["inference"] = time.perf_counter() - started
+
+        started = time.perf_counter()
+        result = decode_result(result, _beam_width)
+        timings["decode"] = time.perf_counter() - started
+    except Exception as e:
+        return {"path": path, "error": str(e)}
+
+    hypothesis = result["text"]
+    char_pairs = align(list(reference), list(hypothesis))
+    return {
+        "path": path,
+        "reference": reference,
+        "hypothesis": hypothesis,
+        "confidence": result["confidence"],
+        "char_errors": sum(1 for ref, hyp in char_pairs if ref != hyp),
+        "ref_chars": len(reference),
+        "word_errors": edit_distance(reference.split(), hypothesis.split()),
+        "ref_words": len(reference.split()),
+        "pairs": [[ref, hyp, count] for (ref, hyp), count in Counter(char_pairs).items()],
+        "timings_ms": {stage: seconds * 1000 for stage, seconds in timings.items()}
+    }
+
+def _percentiles(values: List[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0}
+    data = np.asarray(values)
+    return {
+        "count": len(values),
+        "mean": round(float(data.mean()), 3),
+        "p50": round(float(np.percentile(data, 50)), 3),
+        "p95": round(float(np.percentile(data, 95)), 3),
+        "p99": round(float(np.percentile(data, 99)), 3),
+        "max": round(float(data.max()), 3)
+    }
+
+def evaluate(dataset: str, workers: int = os.cpu_count() or 1, beam_width: Optional[int] = None,
+             limit: Optional[int] = None, top_confusions: int = 20, per_image: bool = False,
+             verbose: bool = False) -> Dict:
+    samples = find_samples(dataset, limit)
+    if not samples:
+        raise ValueError(f"No labeled images found in {dataset} (expected image + same-name .txt)")
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(beam_width, verbose)) as pool:
+        chunksize = max(1, len(samples) // (workers * 8))
+        results = list(pool.map(_evaluate_sample, samples, chunksize=chunksize))
+    wall_seconds = time.perf_counter() - started
+
+    succeeded = [r for r in results if "error" not in r]
+    failures = [{"path": r["path"], "error": r["error"]} for r in results if "error" in r]
+
+    char_errors = sum(r["char_errors"] for r in succeeded)
+    ref_chars = sum(r["ref_chars"] for r in succeeded)
+    word_errors = sum(r["word_errors"] for r in succeeded)
+    ref_words = sum(r["ref_words"] for r in succeeded)
+
+    # Full matrix (diagonal = correct); "top" lists only the errors
+    matrix: Dict[str, Counter] = defaultdict(Counter)
+    for r in succeeded:
+        for ref, hyp, count in r["pairs"]:
+            matrix[ref][hyp] += count
+    ranked = sorted(((ref, hyp, count) for ref, row in matrix.items() for hyp, count in row.items() if ref != hyp),
+                    key=lambda item: item[2], reverse=True)
+
+    report = {
+        "dataset": os.path.abspath(dataset),
+        "images": len(samples),
+        "failed": len(failures),
+        "workers": workers,
+        "beam_width": beam_width,
+        "accuracy": {
+            "cer": round(char_errors / ref_chars, 4) if ref_chars else None,
+            "wer": round(word_errors / ref_words, 4) if ref_words else None,
+            "char_errors": char_errors,
+            "ref_chars": ref_chars,
+            "word_errors": word_errors,
+            "ref_words": ref_words,
+            "exact_match": round(sum(r["reference"] == r["hypothesis"] for r in succeeded) / max(len(succeeded), 1), 4),
+            "mean_confidence": round(float(np.mean([r["confidence"] for r in succeeded])), 4) if succeeded else None
+        },
+        "throughput": {
+            "wall_seconds": round(wall_seconds, 3),
+            "images_per_second": round(len(succeeded) / wall_seconds, 2) if wall_seconds > 0 else None
+        },
+        "latency_ms": {
+            stage: _percentiles([r["timings_ms"][stage] for r in succeeded]) for stage in STAGES
+        },
+        "confusion": {
+            "top": [[ref, hyp, count] for ref, hyp, count in ranked[:top_confusions]],
+            "matrix": {ref: dict(row) for ref, row in sorted(matrix.items())}
+        },
+        "failures": failures
+    }
+    if per_image:
+        report["per_image"] = [
+            {key: r[key] for key in ("path", "reference", "hypothesis", "confidence", "char_errors", "timings_ms")}
+            for r in succeeded
+        ]
+    return report
+
+def check_gates(report: Dict, max_cer: Optional[float], max_wer: Optional[float],
+                min_images_per_second: Optional[float]) -> List[str]:
+    violations = []
+    accuracy, throughput = report["accuracy"], report["throughput"]
+    if max_cer is not None and (accuracy["cer"] is None or accuracy["cer"] > max_cer):
+        violations.append(f"CER {accuracy['cer']} > {max_cer}")
+    if max_wer is not None and (accuracy["wer"] is None or accuracy["wer"] > max_wer):
+        violations.append(f"WER {accuracy['wer']} > {max_wer}")
+    if min_images_per_second is not None and (throughput["images_per_second"] or 0) < min_images_per_second:
+        violations.append(f"{throughput['images_per_second']} images/s < {min_images_per_second}")
+    return violations
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate Braille recognition accuracy and throughput")
+    parser.add_argument("dataset", help="Directory of images with same-name .txt ground truth")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Recognition processes")
+    parser.add_argument("--beam-width", type=int, default=None, help="LM beam width (0 = greedy, default: LM_BEAM_WIDTH)")
+    parser.add_argument("--limit", type=int, default=None, help="Evaluate only the first N images")
+    parser.add_argument("--top", type=int, default=20, help="Most frequent confusions to list")
+    parser.add_argument("--report", default=None, help="Write the JSON report to this path")
+    parser.add_argument("--per-image", action="store_true", help="Include per-image results in the report")
+    parser.add_argument("--max-cer", type=float, default=None, help="Fail if CER is above this")
+    parser.add_argument("--max-wer", type=float, default=None, help="Fail if WER is above this")
+    parser.add_argument("--min-images-per-second", type=float, default=None, help="Fail if throughput is below this")
+    parser.add_argument("--verbose", action="store_true", help="Keep recognizer output from workers")
+    args = parser.parse_args()
+
+    report = evaluate(args.dataset, args.workers, args.beam_width, args.limit, args.top,
+                      args.per_image, args.verbose)
+    violations = check_gates(report, args.max_cer, args.max_wer, args.min_images_per_second)
+    report["gates"] = {"passed": not violations, "violations": violations}
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    accuracy, throughput = report["accuracy"], report["throughput"]
+    print(f"Dataset: {report['dataset']} ({report['images']} images, {report['failed']} failed, {report['workers']} workers)")
+    print(f"CER: {accuracy['cer']}  WER: {accuracy['wer']}  exact match: {accuracy['exact_match']}")
+    print(f"Throughput: {throughput['images_per_second']} images/s ({throughput['wall_seconds']} s)")
+    print(f"{'stage':<12}{'p50':>10}{'p95':>10}{'p99':>10}  (ms)")
+    for stage, stats in report["latency_ms"].items():
+        if stats["count"]:
+            print(f"{stage:<12}{stats['p50']:>10}{stats['p95']:>10}{stats['p99']:>10}")
+    for ref, hyp, count in report["confusion"]["top"][:10]:
+        print(f"  {ref!r} -> {hyp!r}: {count}")
+    if args.report:
+        print(f"Report written to {args.report}")
+    if violations:
+        print("Gate failed: " + "; ".join(violations))
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
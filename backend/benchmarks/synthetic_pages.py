@@ -0,0 +1,354 @@
+"""
+Synthetic Braille page generator for benchmark and load-test corpora
+
+Renders Bangla text as embossed Bharati Braille pages (models/braille_cells.py)
+with NumPy and writes each page with its ground truth in the layout read by
+benchmarks/evaluate.py (page_00001.jpg + page_00001.txt, one line of text
+per Braille line).
+
+Per page the renderer samples, up to the configured maximum:
+- skew (dot centres are rotated about the page centre)
+- dot position jitter and dot contrast
+- lighting gradient in a random direction and low-frequency paper texture
+- Gaussian blur and sensor noise
+
+Resolution (dpi), page size, dot / cell / line pitch and dot size are fixed
+per run. Dots are stamped from one precomputed shaded sprite with a single
+vectorized scatter, so a 150 dpi A4 page takes tens of milliseconds and a
+process pool produces thousands of pages per minute.
+
+Usage (from backend/):
+    python -m benchmarks.synthetic_pages out/synthetic --pages 1000 --workers 4
+    python -m benchmarks.evaluate out/synthetic
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from PIL import Image
+from models.braille_cells import text_to_cells, encodable
+
+SENTENCES = [
+    "আমি বাংলায় গান গাই",
+    "আমার সোনার বাংলা আমি তোমায় ভালোবাসি",
+    "চিরদিন তোমার আকাশ তোমার বাতাস আমার প্রাণে বাজায় বাঁশি",
+    "ব্রেইল পড়তে আঙুলের স্পর্শই যথেষ্ট",
+    "আজ আকাশ মেঘলা, বৃষ্টি হতে পারে।",
+    "ছেলেরা মাঠে ফুটবল খেলছে",
+    "বইটির দাম ২৫০ টাকা",
+    "ট্রেন সকাল ৮টায় ছাড়বে",
+    "নদীর ধারে একটি ছোট্ট গ্রাম",
+    "শিক্ষাই জাতির মেরুদণ্ড।",
+    "১৯৭১ সালে বাংলাদেশ স্বাধীন হয়",
+    "তুমি কি আমার সঙ্গে যাবে?",
+    "পাখিরা গাছের ডালে বাসা বাঁধে",
+    "বিদ্যালয়ে মোট ৪৫০ জন শিক্ষার্থী পড়ে",
+    "সুস্থ থাকতে নিয়মিত হাঁটা দরকার!",
+    "ঋতুরাজ বসন্তে কোকিল ডাকে",
+]
+
+# JPEG encodes a page in ~10 ms; lossless PNG takes >100 ms on noisy pages
+FORMATS = {"jpg": ("JPEG", ".jpg", {"quality": 95}), "png": ("PNG", ".png", {"compress_level": 1})}
+
+# Dot n (1-6) of a cell: (column, row) and presence for each of the 64 cells
+DOT_COLUMN = np.array([0, 0, 0, 1, 1, 1])
+DOT_ROW = np.array([0, 1, 2, 0, 1, 2])
+CELL_DOTS = (np.arange(64)[:, None] >> np.arange(6)) & 1 == 1
+
+class PageStyle:
+    """
+    Geometry (mm) and degradation bounds. noise, blur, skew, lighting and
+    jitter are maxima; each page samples uniformly below them.
+    """
+
+    def __init__(self, dpi: int = 150, page_width_mm: float = 210.0, page_height_mm: float = 297.0,
+                 margin_mm: float = 15.0, dot_pitch_mm: float = 2.5, cell_pitch_mm: float = 6.2,
+                 line_pitch_mm: float = 10.0, dot_diameter_mm: float = 1.44, noise: float = 0.04,
+                 blur: float = 1.0, skew: float = 2.0, lighting: float = 0.3, jitter_mm: float = 0.1):
+        self.dpi = dpi
+        self.page_width_mm = page_width_mm
+        self.page_height_mm = page_height_mm
+        self.margin_mm = margin_mm
+        self.dot_pitch_mm = dot_pitch_mm
+        self.cell_pitch_mm = cell_pitch_mm
+        self.line_pitch_mm = line_pitch_mm
+        self.dot_diameter_mm = dot_diameter_mm
+        self.noise = noise            # Sensor noise std, fraction of full scale
+        self.blur = blur              # Gaussian blur radius, pixels
+        self.skew = skew              # Rotation, degrees either way
+        self.lighting = lighting      # Brightness change across the page
+        self.jitter_mm = jitter_mm    # Dot position std
+
+class PageRenderer:
+    """
+    Renders pages for one PageStyle; sprite and coordinate grids are
+    computed once and reused for every page.
+    """
+
+    def __init__(self, style: PageStyle):
+        self.style = style
+        px = style.dpi / 25.4
+        self.px = px
+        self.width = int(round(style.page_width_mm * px))
+        self.height = int(round(style.page_height_mm * px))
+        usable_w = style.page_width_mm - 2 * style.margin_mm - style.dot_pitch_mm
+        usable_h = style.page_height_mm - 2 * style.margin_mm - 2 * style.dot_pitch_mm
+        self.columns = max(1, int(usable_w // style.cell_pitch_mm) + 1)
+        self.rows = max(1, int(usable_h // style.line_pitch_mm) + 1)
+
+        # Normalized page coordinates for the lighting gradient (-0.5 .. 0.5)
+        self.grid_x = (np.arange(self.width, dtype=np.float32) / self.width - 0.5)[None, :]
+        self.grid_y = (np.arange(self.height, dtype=np.float32) / self.height - 0.5)[:, None]
+        self.sprite = self._make_sprite()
+
+        # Paper texture and unit sensor noise are generated once at 1.5x the
+        # page size; every page takes a random window of each, which costs a
+        # view instead of ~2M random draws and a resize
+        rng = np.random.default_rng(0)
+        field_shape = (self.height * 3 // 2, self.width * 3 // 2)
+        texture = rng.standard_normal((field_shape[0] // 32 + 2, field_shape[1] // 32 + 2)).astype(np.float32)
+        self.texture = 0.015 * np.asarray(Image.fromarray(texture, mode="F").resize(field_shape[::-1], Image.BILINEAR))
+        self.noise = rng.standard_normal(field_shape, dtype=np.float32)
+
+    def _make_sprite(self) -> np.ndarray:
+        """
+        Embossed dot lit from the top left: a shaded dome (bright towards
+        the light, dark away from it) plus a soft shadow to the bottom right.
+        Unit contrast; scaled per page.
+        """
+        radius = max(self.style.dot_diameter_mm * self.px / 2, 1.0)
+        half = int(math.ceil(radius * 1.5)) + 1
+        offsets = np.arange(-half, half + 1, dtype=np.float32)
+        dy, dx = np.meshgrid(offsets, offsets, indexing="ij")
+        light = -1 / math.sqrt(2)
+
+        inside = (dx ** 2 + dy ** 2) <= radius ** 2
+        shading = np.where(inside, (dx * light + dy * light) / radius, 0.0)
+        shadow_offset = radius * 0.35
+        shadow_distance = np.sqrt((dx - shadow_offset) ** 2 + (dy - shadow_offset) ** 2) / radius
+        shadow = -0.4 * np.clip(1.15 - shadow_distance, 0, 1) * ~inside
+        # Room for the widest blur
+        return np.pad(shading + shadow, int(math.ceil(3 * self.style.blur))).astype(np.float32)
+
+    @staticmethod
+    def _blurred(sprite: np.ndarray, sigma: float) -> np.ndarray:
+        """Separable Gaussian blur of the small sprite (instead of the page)."""
+        if sigma < 0.2:
+            return sprite
+        taps = np.arange(-int(math.ceil(3 * sigma)), int(math.ceil(3 * sigma)) + 1)
+        kernel = np.exp(-taps ** 2 / (2 * sigma ** 2))
+        kernel /= kernel.sum()
+        sprite = np.apply_along_axis(np.convolve, 0, sprite, kernel, mode="same")
+        return np.apply_along_axis(np.convolve, 1, sprite, kernel, mode="same").astype(np.float32)
+
+    def _window(self, field: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        top = int(rng.integers(0, field.shape[0] - self.height + 1))
+        left = int(rng.integers(0, field.shape[1] - self.width + 1))
+        return field[top:top + self.height, left:left + self.width]
+
+    def layout(self, words: Sequence[str]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+        """
+        Word-wrap words into the page's cell grid until it is full. Returns
+        (row, column, cell) arrays of the non-blank cells and the text of
+        each rendered line.
+        """
+        rows, cols, cells, lines = [], [], [], []
+        line_words: List[str] = []
+        row = col = 0
+        for word in words:
+            word_cells = text_to_cells(word)
+            if not word_cells:
+                continue
+            if len(word_cells) > self.columns:
+                continue  # Wider than a line: truncating it would mislabel the page
+            start = col + 1 if col else 0
+            if start + len(word_cells) > self.columns:
+                lines.append(" ".join(line_words))
+                line_words, row, start = [], row + 1, 0
+                if row >= self.rows:
+                    break
+            for offset, cell in enumerate(word_cells):
+                if cell:
+                    rows.append(row)
+                    cols.append(start + offset)
+                    cells.append(cell)
+            line_words.append(encodable(word))
+            col = start + len(word_cells)
+        if line_words and row < self.rows:
+            lines.append(" ".join(line_words))
+        return np.array(rows, dtype=np.int64), np.array(cols, dtype=np.int64), np.array(cells, dtype=np.int64), lines
+
+    def render(self, words: Sequence[str], rng: np.random.Generator) -> Tuple[np.ndarray, str]:
+        """(grayscale uint8 page, ground truth text) for as many words as fit."""
+        style, px = self.style, self.px
+        rows, cols, cells, lines = self.layout(words)
+
+        # Dot centres in pixels, rotated about the page centre
+        cell_index, dot = np.nonzero(CELL_DOTS[cells])
+        x = (style.margin_mm + cols[cell_index] * style.cell_pitch_mm + DOT_COLUMN[dot] * style.dot_pitch_mm) * px
+        y = (style.margin_mm + rows[cell_index] * style.line_pitch_mm + DOT_ROW[dot] * style.dot_pitch_mm) * px
+        angle = math.radians(rng.uniform(-style.skew, style.skew))
+        cx, cy = self.width / 2, self.height / 2
+        cos, sin = math.cos(angle), math.sin(angle)
+        x, y = cx + (x - cx) * cos - (y - cy) * sin, cy + (x - cx) * sin + (y - cy) * cos
+        jitter = style.jitter_mm * px
+        x = np.rint(x + rng.normal(0, jitter, x.shape)).astype(np.int64)
+        y = np.rint(y + rng.normal(0, jitter, y.shape)).astype(np.int64)
+
+        # Paper: base brightness, lighting gradient, low-frequency texture
+        base = rng.uniform(0.72, 0.9)
+        strength = rng.uniform(0, style.lighting)
+        direction = rng.uniform(0, 2 * math.pi)
+        page = np.add(base + strength * math.sin(direction) * self.grid_y,
+                      strength * math.cos(direction) * self.grid_x, dtype=np.float32)
+        page += self._window(self.texture, rng)
+
+        # Stamp every dot at once. Blurred sprites are wider than the dot
+        # pitch, so neighbouring stamps overlap: np.add.at accumulates them,
+        # where a buffered `page[ys, xs] += sprite` would keep only the last.
+        # Dots pushed off the page by skew are dropped. Blurring the sprite
+        # equals blurring the page here: the background is smooth and noise
+        # is added afterwards.
+        sprite = rng.uniform(0.12, 0.25) * self._blurred(self.sprite, rng.uniform(0, style.blur))
+        half = sprite.shape[0] // 2
+        offsets = np.arange(-half, half + 1)
+        visible = (x >= half) & (x < self.width - half) & (y >= half) & (y < self.height - half)
+        ys = y[visible, None, None] + offsets[:, None]
+        xs = x[visible, None, None] + offsets[None, :]
+        np.add.at(page, (ys, xs), sprite)
+
+        noise = rng.uniform(0, style.noise)
+        if noise > 0:
+            page += noise * self._window(self.noise, rng)
+        page *= 255
+        np.clip(page, 0, 255, out=page)
+        return page.astype(np.uint8), "\n".join(lines)
+
+def encode_image(pixels: np.ndarray, fmt: str = "jpg") -> bytes:
+    format_name, _, options = FORMATS[fmt]
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, mode="L").save(buffer, format_name, **options)
+    return buffer.getvalue()
+
+def page_words(sentences: Sequence[str], count: int, rng: random.Random) -> List[str]:
+    """Random sentences until there are at least `count` words."""
+    words: List[str] = []
+    while len(words) < count:
+        words.extend(rng.choice(sentences).split())
+    return words
+
+# Per-process state, created once by the pool initializer
+_renderer: Optional[PageRenderer] = None
+_job = None
+
+def _init_worker(style: PageStyle, sentences: Sequence[str], output: Optional[str], fmt: str, seed: int):
+    global _renderer, _job
+    _renderer = PageRenderer(style)
+    _job = (sentences, output, fmt, seed)
+
+def _generate_page(index: int) -> Tuple[float, float]:
+    """Render (and write) one page; returns (render, encode + write) seconds."""
+    sentences, output, fmt, seed = _job
+    # Seeded per page: the same (seed, index) always gives the same page
+    rng = np.random.default_rng([seed, index])
+    words = page_words(sentences, _renderer.rows * _renderer.columns // 3, random.Random(seed * 1_000_003 + index))
+
+    started = time.perf_counter()
+    pixels, text = _renderer.render(words, rng)
+    render_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    if output is not None:
+        stem = os.path.join(output, f"page_{index:05d}")
+        with open(stem + FORMATS[fmt][1], "wb") as f:
+            f.write(encode_image(pixels, fmt))
+        with open(stem + ".txt", "w", encoding="utf-8") as f:
+            f.write(text)
+    return render_seconds, time.perf_counter() - started
+
+def generate(output: Optional[str], pages: int, style: PageStyle, sentences: Sequence[str] = SENTENCES,
+             workers: int = os.cpu_count() or 1, seed: int = 0, fmt: str = "jpg") -> dict:
+    """
+    Generate `pages` pages into `output` (None renders without writing,
+    to measure the renderer alone). Returns a throughput summary.
+    """
+    if output is not None:
+        os.makedirs(output, exist_ok=True)
+    started = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(style, list(sentences), output, fmt, seed)) as pool:
+        chunksize = max(1, pages // (workers * 8))
+        timings = list(pool.map(_generate_page, range(pages), chunksize=chunksize))
+    wall_seconds = time.perf_counter() - started
+
+    renderer = PageRenderer(style)
+    render_ms = np.array([t[0] for t in timings]) * 1000
+    write_ms = np.array([t[1] for t in timings]) * 1000
+    return {
+        "output": os.path.abspath(output) if output is not None else None,
+        "pages": pages,
+        "workers": workers,
+        "page_size_px": [renderer.width, renderer.height],
+        "cells_per_page": [renderer.columns, renderer.rows],
+        "wall_seconds": round(wall_seconds, 3),
+        "pages_per_minute": round(pages / wall_seconds * 60, 1) if wall_seconds > 0 else None,
+        "render_ms_p50": round(float(np.percentile(render_ms, 50)), 2),
+        "write_ms_p50": round(float(np.percentile(write_ms, 50)), 2)
+    }
+
+def main():
+    defaults = PageStyle()
+    parser = argparse.ArgumentParser(description="Generate synthetic Braille pages with ground truth")
+    parser.add_argument("output", nargs="?", default=None, help="Dataset directory (omit with --dry-run)")
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Rendering processes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--text-file", default=None, help="UTF-8 corpus, one sentence per line (default: built-in)")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="jpg")
+    parser.add_argument("--dpi", type=int, default=defaults.dpi)
+    parser.add_argument("--dot-pitch-mm", type=float, default=defaults.dot_pitch_mm)
+    parser.add_argument("--cell-pitch-mm", type=float, default=defaults.cell_pitch_mm)
+    parser.add_argument("--line-pitch-mm", type=float, default=defaults.line_pitch_mm)
+    parser.add_argument("--dot-diameter-mm", type=float, default=defaults.dot_diameter_mm)
+    parser.add_argument("--noise", type=float, default=defaults.noise, help="Max sensor noise std (0-1)")
+    parser.add_argument("--blur", type=float, default=defaults.blur, help="Max Gaussian blur radius (px)")
+    parser.add_argument("--skew", type=float, default=defaults.skew, help="Max rotation (degrees)")
+    parser.add_argument("--lighting", type=float, default=defaults.lighting, help="Max lighting gradient")
+    parser.add_argument("--jitter-mm", type=float, default=defaults.jitter_mm, help="Dot position std")
+    parser.add_argument("--dry-run", action="store_true", help="Render only; measure renderer throughput")
+    parser.add_argument("--json", action="store_true", help="Print machine-readable results")
+    args = parser.parse_args()
+    if args.output is None and not args.dry_run:
+        parser.error("output directory is required unless --dry-run is given")
+
+    sentences = SENTENCES
+    if args.text_file:
+        with open(args.text_file, encoding="utf-8") as f:
+            sentences = [line.strip() for line in f if encodable(line).strip()]
+    style = PageStyle(dpi=args.dpi, dot_pitch_mm=args.dot_pitch_mm, cell_pitch_mm=args.cell_pitch_mm,
+                      line_pitch_mm=args.line_pitch_mm, dot_diameter_mm=args.dot_diameter_mm,
+                      noise=args.noise, blur=args.blur, skew=args.skew, lighting=args.lighting,
+                      jitter_mm=args.jitter_mm)
+
+    report = generate(None if args.dry_run else args.output, args.pages, style, sentences,
+                      args.workers, args.seed, args.format)
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+    width, height = report["page_size_px"]
+    columns, rows = report["cells_per_page"]
+    print(f"{report['pages']} pages ({width}x{height} px, {columns}x{rows} cells) in {report['wall_seconds']} s "
+          f"with {report['workers']} workers: {report['pages_per_minute']} pages/minute")
+    print(f"Median per page: render {report['render_ms_p50']} ms, encode + write {report['write_ms_p50']} ms")
+    if report["output"]:
+        print(f"Dataset written to {report['output']}")
+
+if __name__ == "__main__":
+    main()
@@ -19,14 +19,35 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import JSONResponse
 import os
+import sys
 import time
+import asyncio
+import argparse
 
 # Import API routers
-from api.upload import router as upload_router
+from api.upload import router as upload_router, cleanup_old_files, CLEANUP_INTERVAL_SECONDS
 from api.recognize import router as recognize_router
 from api.synthesize import router as synthesize_router
 from api.convert import router as convert_router
 from api.auth import router as auth_router
+from api.document import router as document_router
+from api.audio import router as audio_router
+from api.live import router as live_router
+from api.rate_limit import RateLimitMiddleware, RATE_LIMIT_ENABLED
+from api.admin import router as admin_router, MemoryTrackingMiddleware
+from api.assets import router as assets_router, frontend_assets, FRONTEND_BUILD
+from api.upload import upload_index
+from models.braille_model import preprocess_pipeline
+from models.inference_scheduler import get_scheduler
+from models.language_model import get_language_model
+from models.metrics import metrics
+from models.lazy import warmup, import_time_report, WARMUP_MODE
+from models.auth import auth
+from models.shared_store import get_shared_store
+from models.storage import get_storage, STORAGE_BACKEND, STORAGE_LOCATIONS
+from models.memory_profiler import memory_profiler, MEMORY_PROFILING_ENABLED
+from models.circuit_breaker import tts_breaker
+from models.readiness import readiness_report
 
 # Initialize FastAPI application
 app = FastAPI(
@@ -52,6 +73,15 @@ app = FastAPI(
     redoc_url="/redoc"
 )
 
+# Per-client admission control for expensive routes (inside CORS, so 429
+# responses still carry CORS headers for the browser frontend)
+if RATE_LIMIT_ENABLED:
+    app.add_middleware(RateLimitMiddleware)
+
+# Opt-in memory profiling: per-route RSS plus the /api/admin/memory endpoints
+if MEMORY_PROFILING_ENABLED:
+    app.add_middleware(MemoryTrackingMiddleware)
+
 # Configure CORS for frontend integration
 app.add_middleware(
     CORSMiddleware,
@@ -61,11 +91,11 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files for audio output
+# Mount static files for audio output (legacy URLs; new audio URLs use /audio)
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Mount frontend files
-app.mount("/app", StaticFiles(directory="../frontend", html=True), name="frontend")
+# Frontend under /app: fingerprinted, precompressed build (api/assets.py)
+app.include_router(assets_router)
 
 # Include API routers
 app.include_router(upload_router)
@@ -73,6 +103,37 @@ app.include_router(recognize_router)
 app.include_router(synthesize_router)
 app.include_router(convert_router)
 app.include_router(auth_router)
+app.include_router(document_router)
+app.include_router(audio_router)
+app.include_router(live_router)
+if MEMORY_PROFILING_ENABLED:
+    app.include_router(admin_router)
+
+# Warm-up steps: heavy imports and engine construction, run once after
+# startup (WARMUP_MODE=background/eager) or left to first use (off)
+def _warm_imaging():
+    from PIL import Image
+    from models.braille_model import BrailleRecognizer
+    BrailleRecognizer().preprocess_frame(Image.new("L", (448, 448), 255))
+
+def _warm_tts():
+    import gtts
+    from models.text_normalizer import get_normalizer
+    get_normalizer()
+
+warmup.register("auth_store", lambda: (auth.users, auth.sessions))
+warmup.register("imaging", _warm_imaging)
+warmup.register("recognizer", get_scheduler)
+warmup.register("language_model", get_language_model)
+warmup.register("tts", _warm_tts)
+
+# Structures that grow with traffic, reported by /api/admin/memory
+# (auth files are not loaded just to be counted: None until first use)
+memory_profiler.watch("auth.users", lambda: len(auth._users) if auth._users is not None else None)
+memory_profiler.watch("auth.sessions", lambda: len(auth._sessions) if auth._sessions is not None else None)
+memory_profiler.watch("upload_index", lambda: len(upload_index))
+memory_profiler.watch("recognition_cache", lambda: len(get_scheduler().cache))
+memory_profiler.watch("preprocess_cache", lambda: len(preprocess_pipeline.cache))
 
 @app.get("/")
 async def root():
@@ -86,11 +147,14 @@ async def root():
         "description": "Deep Learning Based Bangla Braille to Voice Conversion System",
         "endpoints": {
             "health": "/health",
+            "readiness": "/ready",
             "documentation": "/docs",
             "api_upload": "/api/upload",
             "api_recognize": "/api/recognize", 
             "api_synthesize": "/api/synthesize",
-            "api_convert": "/api/convert"
+            "api_convert": "/api/convert",
+            "api_document": "/api/document",
+            "live_websocket": "/ws/live"
         },
         "frontend": {
             "web_app": "/app",
@@ -105,9 +169,11 @@ async def health_check():
     Returns system status and readiness information.
     """
     try:
-        # Check essential directories
-        required_dirs = ["uploads", "static/audio"]
-        dirs_status = all(os.path.exists(dir) for dir in required_dirs)
+        # Check blob storage (may be a network round trip for S3)
+        loop = asyncio.get_running_loop()
+        dirs_status = all(await asyncio.gather(*[
+            loop.run_in_executor(None, get_storage(name).is_available) for name in STORAGE_LOCATIONS
+        ]))
         
         return {
             "status": "healthy" if dirs_status else "degraded",
@@ -116,9 +182,10 @@ async def health_check():
             "components": {
                 "upload_service": "operational",
                 "recognition_service": "operational (mock)",
-                "tts_service": "operational",
-                "file_storage": "operational" if dirs_status else "error"
+                "tts_service": "operational" if tts_breaker.state == "closed" else f"circuit {tts_breaker.state}",
+                "file_storage": f"{STORAGE_BACKEND}: operational" if dirs_status else f"{STORAGE_BACKEND}: error"
             },
+            "warmup": warmup.snapshot(),
             "thesis_status": {
                 "braille_model": "mock_implementation",
                 "tts_engine": "gtts_bengali",
@@ -128,6 +195,15 @@ async def health_check():
     except Exception as e:
         raise HTTPException(status_code=503, detail=f"Health check failed: {str(e)}")
 
+@app.get("/ready")
+async def readiness_check():
+    """
+    Readiness for load balancers: 503 while warming up, saturated (queues,
+    in-flight work, stage p95) or low on disk. Cheap enough to poll every second.
+    """
+    report = readiness_report()
+    return JSONResponse(status_code=200 if report["ready"] else 503, content=report)
+
 @app.get("/api/info")
 async def system_info():
     """
@@ -164,10 +240,25 @@ async def system_info():
             "upload": "POST /api/upload - Upload and validate image",
             "recognize": "POST /api/recognize - Convert Braille image to text",
             "synthesize": "POST /api/synthesize - Convert text to speech",
-            "convert": "POST /api/convert - End-to-end conversion pipeline"
+            "convert": "POST /api/convert - End-to-end conversion pipeline",
+            "document": "POST /api/document - Multi-page TIFF/PDF recognition with streamed per-page results"
         }
     }
 
+@app.get("/api/metrics")
+async def runtime_metrics():
+    """
+    Runtime metrics: recognition micro-batch sizes, queue wait and batch latency.
+    """
+    return {
+        "timestamp": time.time(),
+        "worker_pid": os.getpid(),
+        "shared_state": get_shared_store() is not None,
+        "scheduler": get_scheduler().stats(),
+        "metrics": metrics.snapshot(),
+        "gauges": metrics.gauges()
+    }
+
 # Global exception handler for consistent error responses
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
@@ -184,6 +275,29 @@ async def global_exception_handler(request, exc):
         }
     )
 
+def maintenance():
+    """
+    Background housekeeping: old uploads and expired shared state.
+    """
+    cleanup_old_files()
+    store = get_shared_store()
+    if store is not None:
+        purged = store.purge_expired()
+        if purged:
+            print(f"Purged {purged} expired shared-state entries")
+
+async def maintenance_loop():
+    """Run maintenance after startup and then every CLEANUP_INTERVAL_SECONDS."""
+    loop = asyncio.get_running_loop()
+    while True:
+        try:
+            await loop.run_in_executor(None, maintenance)
+        except Exception as e:
+            print(f"Maintenance failed: {e}")
+        await asyncio.sleep(CLEANUP_INTERVAL_SECONDS)
+
+_maintenance_task = None
+
 # Startup event
 @app.on_event("startup")
 async def startup_event():
@@ -194,9 +308,31 @@ async def startup_event():
     print("Thesis Project: Deep Learning Based Bangla Braille to Voice Conversion")
     print("Initializing services...")
     
-    # Ensure required directories exist
-    os.makedirs("uploads", exist_ok=True)
-    os.makedirs("static/audio", exist_ok=True)
+    # Ensure required directories exist (roots of the local storage backend)
+    if STORAGE_BACKEND == "local":
+        for name in STORAGE_LOCATIONS:
+            os.makedirs(get_storage(name).root, exist_ok=True)
+    os.makedirs("static", exist_ok=True)
+    
+    # Deferred work: the uploads sweep never blocks startup, and expired
+    # shared state keeps being purged while the server runs
+    global _maintenance_task
+    loop = asyncio.get_running_loop()
+    _maintenance_task = loop.create_task(maintenance_loop())
+    
+    # Frontend build (skipped when the sources are unchanged); on failure
+    # /app serves the raw sources
+    if FRONTEND_BUILD == "startup":
+        try:
+            await loop.run_in_executor(None, frontend_assets.build)
+        except Exception as e:
+            print(f"Frontend build failed, serving unbuilt files: {e}")
+    
+    if WARMUP_MODE == "eager":
+        await loop.run_in_executor(None, warmup.run)
+    elif WARMUP_MODE == "background":
+        warmup.start_background()
+    print(f"Warm-up mode: {WARMUP_MODE}")
     
     print("System ready for operation")
     print("")
@@ -217,8 +353,53 @@ async def shutdown_event():
     """
     print("Shutting down Bangla Braille to Voice Conversion System")
     print("Cleaning up resources...")
+    if _maintenance_task is not None:
+        _maintenance_task.cancel()
+
+def print_startup_report(top: int):
+    """
+    Print an -X importtime based breakdown of application import time.
+    """
+    report = import_time_report("main", top=top)
+    print(f"Cold import of main: {report['import_ms']} ms "
+          f"({report['modules_imported']} modules, interpreter wall {report['interpreter_wall_ms']} ms)")
+    print("")
+    print("Slowest modules (self time):")
+    for name, ms in report["slowest_modules_ms"]:
+        print(f"  {ms:>8.1f} ms  {name}")
+    print("")
+    print("By top-level package (self time):")
+    for name, ms in report["packages_ms"]:
+        print(f"  {ms:>8.1f} ms  {name}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bangla Braille to Voice Conversion API server")
+    parser.add_argument("--startup-report", action="store_true",
+                        help="Print an import-time breakdown of application startup and exit")
+    parser.add_argument("--top", type=int, default=15, help="Entries per startup report section")
+    parser.add_argument("--warmup", choices=["background", "eager", "off"],
+                        help="Model warm-up mode (overrides WARMUP_MODE)")
+    parser.add_argument("--no-reload", action="store_true", help="Disable auto-reload")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Worker processes; more than one enables shared state (SHARED_STATE_PATH)")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    
+    if args.startup_report:
+        print_startup_report(args.top)
+        sys.exit(0)
+    
+    if args.warmup:
+        # Inherited by the uvicorn (reloader/worker) processes that import main
+        os.environ["WARMUP_MODE"] = args.warmup
+    
+    if args.workers > 1:
+        # Sessions, upload index and caches must be shared between workers;
+        # each worker still warms up its own models after it starts.
+        os.environ.setdefault("SHARED_STATE_PATH", "shared_state.db")
+        print(f"Multi-worker mode: {args.workers} workers, shared state in {os.environ['SHARED_STATE_PATH']}")
+    
     import uvicorn
     
     print("=" * 60)
@@ -228,8 +409,10 @@ if __name__ == "__main__":
     
     uvicorn.run(
         "main:app",
-        host="0.0.0.0",
-        port=8000,
-        reload=True,
+        host=args.host,
+        port=args.port,
+        # Auto-reload only supports a single worker process
+        reload=args.workers == 1 and not args.no_reload,
+        workers=args.workers,
         log_level="info"
     )
\ No newline at end of file
@@ -5,6 +5,7 @@ import hashlib
 import secrets
 import json
 from pathlib import Path
+from models.shared_store import get_shared_store, SharedDict
 
 # Simple email validation without external dependency
 def validate_email(email: str) -> str:
@@ -51,8 +52,38 @@ class SimpleAuth:
     def __init__(self):
         self.users_file = Path("backend/users.json")
         self.sessions_file = Path("backend/sessions.json")
-        self.users = self._load_users()
-        self.sessions = self._load_sessions()
+        # Loaded on first access, so importing the app does not scale with data size
+        self._users = None
+        self._sessions = None
+    
+    @property
+    def users(self) -> dict:
+        if self._users is None:
+            shared = self._load_shared("users", self._load_users)
+            self._users = shared if shared is not None else self._load_users()
+        return self._users
+    
+    @property
+    def sessions(self) -> dict:
+        if self._sessions is None:
+            shared = self._load_shared("sessions", self._load_sessions)
+            self._sessions = shared if shared is not None else self._load_sessions()
+        return self._sessions
+    
+    def _load_shared(self, namespace: str, load_file) -> Optional[SharedDict]:
+        """
+        In multi-worker mode users and sessions live in the shared store, so
+        every worker sees registrations and logins immediately. Existing JSON
+        data is imported the first time the namespace is used.
+        """
+        store = get_shared_store()
+        if store is None:
+            return None
+        shared = SharedDict(store, namespace)
+        if len(shared) == 0:
+            for key, value in load_file().items():
+                shared[key] = value
+        return shared
     
     def _load_users(self) -> dict:
         if self.users_file.exists():
@@ -68,11 +99,15 @@ class SimpleAuth:
         return {}
     
     def _save_users(self):
+        if isinstance(self.users, SharedDict):
+            return  # Written through on assignment
         self.users_file.parent.mkdir(exist_ok=True)
         with open(self.users_file, 'w') as f:
             json.dump(list(self.users.values()), f, indent=2, default=str)
     
     def _save_sessions(self):
+        if isinstance(self.sessions, SharedDict):
+            return  # Written through on assignment
         self.sessions_file.parent.mkdir(exist_ok=True)
         with open(self.sessions_file, 'w') as f:
             json.dump(self.sessions, f, indent=2, default=str)
@@ -111,6 +146,8 @@ class SimpleAuth:
             if user_data['username'] == username:
                 if self._verify_password(password, user_data['password_hash']):
                     user_data['last_login'] = datetime.now()
+                    # Reassign so store-backed users are written through
+                    self.users[user_data['id']] = user_data
                     self._save_users()
                     return User(**user_data)
         return None
@@ -0,0 +1,94 @@
+"""
+Bharati Braille cells for Bangla
+
+A six-dot cell is stored as a 6-bit integer: dot n (1-6) sets bit n - 1, so
+the 64 possible cells are exactly the NUM_CELL_CLASSES of the cell CNN
+(models/quantized_cnn.py). Dots 1-3 form the left column top to bottom,
+dots 4-6 the right column.
+
+Bangla vowel signs (kar) use the same cells as the independent vowels, and
+cells follow Unicode (phonetic) order, e.g. ি is written after its consonant.
+"""
+
+import unicodedata
+from typing import Dict, Iterator, List, Tuple
+
+def dots(*numbers: int) -> int:
+    cell = 0
+    for n in numbers:
+        cell |= 1 << (n - 1)
+    return cell
+
+BLANK = 0
+NUMBER_SIGN = dots(3, 4, 5, 6)
+
+# Text unit -> cells. Keys may be two code points (nukta forms after NFC).
+BHARATI: Dict[str, Tuple[int, ...]] = {
+    # Vowels and the matching vowel signs
+    "অ": (dots(1),), "আ": (dots(3, 4, 5),), "া": (dots(3, 4, 5),),
+    "ই": (dots(2, 4),), "ি": (dots(2, 4),), "ঈ": (dots(3, 5),), "ী": (dots(3, 5),),
+    "উ": (dots(1, 3, 6),), "ু": (dots(1, 3, 6),), "ঊ": (dots(1, 2, 5, 6),), "ূ": (dots(1, 2, 5, 6),),
+    "ঋ": (dots(5), dots(1, 2, 3, 5)), "ৃ": (dots(5), dots(1, 2, 3, 5)),
+    "এ": (dots(1, 5),), "ে": (dots(1, 5),), "ঐ": (dots(3, 4),), "ৈ": (dots(3, 4),),
+    "ও": (dots(1, 3, 5),), "ো": (dots(1, 3, 5),), "ঔ": (dots(2, 4, 6),), "ৌ": (dots(2, 4, 6),),
+    # Consonants
+    "ক": (dots(1, 3),), "খ": (dots(4, 6),), "গ": (dots(1, 2, 4, 5),), "ঘ": (dots(1, 2, 6),),
+    "ঙ": (dots(3, 4, 6),), "চ": (dots(1, 4),), "ছ": (dots(1, 6),), "জ": (dots(2, 4, 5),),
+    "ঝ": (dots(3, 5, 6),), "ঞ": (dots(2, 5),), "ট": (dots(2, 3, 4, 5, 6),), "ঠ": (dots(2, 4, 5, 6),),
+    "ড": (dots(1, 2, 4, 6),), "ঢ": (dots(1, 2, 3, 4, 5, 6),), "ণ": (dots(3, 4, 5, 6),),
+    "ত": (dots(2, 3, 4, 5),), "থ": (dots(1, 4, 5, 6),), "দ": (dots(1, 4, 5),), "ধ": (dots(2, 3, 4, 6),),
+    "ন": (dots(1, 3, 4, 5),), "প": (dots(1, 2, 3, 4),), "ফ": (dots(2, 3, 5),), "ব": (dots(1, 2),),
+    "ভ": (dots(4, 5),), "ম": (dots(1, 3, 4),), "য": (dots(1, 3, 4, 5, 6),), "র": (dots(1, 2, 3, 5),),
+    "ল": (dots(1, 2, 3),), "শ": (dots(1, 4, 6),), "ষ": (dots(1, 2, 3, 4, 6),), "স": (dots(2, 3, 4),),
+    "হ": (dots(1, 2, 5),),
+    "ড়": (dots(1, 2, 4, 5, 6),), "ঢ়": (dots(5), dots(1, 2, 4, 5, 6)), "য়": (dots(4), dots(1, 3, 4, 5, 6)),
+    "ৎ": (dots(2, 3, 4, 5), dots(4)),
+    # Signs
+    "ং": (dots(5, 6),), "ঃ": (dots(6),), "ঁ": (dots(3),), "্": (dots(4),),
+    # Punctuation
+    " ": (BLANK,), "।": (dots(2, 5, 6),), ",": (dots(2),), "?": (dots(2, 3, 6),),
+    "!": (dots(2, 3, 5),), ";": (dots(2, 3),), "-": (dots(3, 6),),
+}
+BHARATI = {unicodedata.normalize("NFC", key): cells for key, cells in BHARATI.items()}
+
+# Digits are written as the letters a-j after a number sign
+DIGIT_CELLS = {
+    1: dots(1), 2: dots(1, 2), 3: dots(1, 4), 4: dots(1, 4, 5), 5: dots(1, 5),
+    6: dots(1, 2, 4), 7: dots(1, 2, 4, 5), 8: dots(1, 2, 5), 9: dots(2, 4), 0: dots(2, 4, 5),
+}
+DIGITS = {**{chr(0x09E6 + d): d for d in range(10)}, **{str(d): d for d in range(10)}}
+
+def _units(text: str) -> Iterator[Tuple[str, Tuple[int, ...]]]:
+    """(text unit, cells) in order; characters without a cell are skipped."""
+    text = unicodedata.normalize("NFC", text)
+    in_number = False
+    i = 0
+    while i < len(text):
+        char = text[i]
+        if char in DIGITS:
+            cells = (DIGIT_CELLS[DIGITS[char]],)
+            yield char, cells if in_number else (NUMBER_SIGN,) + cells
+            in_number = True
+            i += 1
+            continue
+        in_number = False
+        # Longest match: nukta forms are two code points after NFC
+        if text[i:i + 2] in BHARATI:
+            yield text[i:i + 2], BHARATI[text[i:i + 2]]
+            i += 2
+        else:
+            if char in BHARATI:
+                yield char, BHARATI[char]
+            i += 1
+
+def text_to_cells(text: str) -> List[int]:
+    """Encode text as Bharati Braille cells."""
+    return [cell for _, cells in _units(text) for cell in cells]
+
+def encodable(text: str) -> str:
+    """The part of `text` that text_to_cells encodes (NFC, unsupported characters removed)."""
+    return "".join(unit for unit, _ in _units(text))
+
+def cell_dots(cell: int) -> List[Tuple[int, int]]:
+    """(column, row) of each raised dot in a cell; column 0-1, row 0-2."""
+    return [((n - 1) // 3, (n - 1) % 3) for n in range(1, 7) if cell & (1 << (n - 1))]
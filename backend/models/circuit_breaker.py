@@ -0,0 +1,96 @@
+"""
+Circuit breaker for upstream services (the gTTS web API).
+
+closed     calls pass; `failure_threshold` consecutive failures open it
+open       calls fail immediately with CircuitOpenError for `reset_timeout`
+           seconds, so a dead upstream is not hammered and requests do not
+           each wait for their own network timeout
+half_open  one trial call is let through; success closes the circuit,
+           failure opens it again
+
+State is per process and reported by /health and /ready.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Callable, Dict
+
+TTS_CIRCUIT_FAILURES = int(os.getenv("TTS_CIRCUIT_FAILURES", "5"))
+TTS_CIRCUIT_RESET_SECONDS = float(os.getenv("TTS_CIRCUIT_RESET_SECONDS", "30"))
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling the upstream while the circuit is open."""
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.total_failures = 0
+        self.rejected = 0
+        self.opened_at = None
+        self.last_error = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    def _before_call(self):
+        with self._lock:
+            if self.state == "open":
+                if time.monotonic() - self.opened_at < self.reset_timeout:
+                    self.rejected += 1
+                    retry_in = self.reset_timeout - (time.monotonic() - self.opened_at)
+                    raise CircuitOpenError(f"{self.name} circuit is open; retry in {retry_in:.0f}s")
+                self.state = "half_open"
+            if self.state == "half_open":
+                if self._trial_running:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"{self.name} circuit is half-open; trial call in progress")
+                self._trial_running = True
+
+    def _record(self, error: Exception = None):
+        with self._lock:
+            self._trial_running = False
+            if error is None:
+                self.state = "closed"
+                self.consecutive_failures = 0
+                return
+            self.consecutive_failures += 1
+            self.total_failures += 1
+            self.last_error = str(error)
+            if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+                if self.state != "open":
+                    print(f"Circuit '{self.name}' opened after {self.consecutive_failures} failures: {error}")
+                self.state = "open"
+                self.opened_at = time.monotonic()
+
+    def call(self, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        self._before_call()
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            self._record(e)
+            raise
+        self._record()
+        return result
+
+    @property
+    def is_open(self) -> bool:
+        return self.state == "open" and time.monotonic() - self.opened_at < self.reset_timeout
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": "half_open" if self.state == "open" and not self.is_open else self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "total_failures": self.total_failures,
+                "rejected": self.rejected,
+                "open_seconds_remaining": round(self.reset_timeout - (time.monotonic() - self.opened_at), 1)
+                                          if self.is_open else 0,
+                "last_error": self.last_error
+            }
+
+# gTTS web API, shared by every TextToSpeech instance in the process
+tts_breaker = CircuitBreaker("gtts", TTS_CIRCUIT_FAILURES, TTS_CIRCUIT_RESET_SECONDS)
@@ -0,0 +1,106 @@
+"""
+Skew and Rotation Correction
+
+Phone photos of Braille pages are rarely axis-aligned. The page rotation is
+estimated from the dot positions and removed with a single affine resample
+that also scales the page to the model input size.
+
+Estimation (typically a few milliseconds per page):
+1. Downsample to ~256px so each Braille dot shrinks to a 1-2 pixel blob,
+   i.e. approximately its centroid.
+2. Keep the strongest dot pixels (largest deviation from the background).
+3. Coarse-to-fine search over angles: for every candidate angle at once,
+   project the points onto the rotated vertical axis and score the sharpness
+   (sum of squared bin counts) of the resulting row profile. Rows of dots
+   line up into tall, narrow peaks only at the true skew angle.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Tuple
+from models.lazy import lazy_import
+
+np = lazy_import("numpy")
+Image = lazy_import("PIL.Image")
+
+MAX_SKEW_DEGREES = 15.0     # Search range (+/-)
+MIN_SKEW_DEGREES = 0.5      # Below this the page is resized without rotation
+ANALYSIS_SIZE = 256         # Longest side of the downsampled analysis image
+MAX_POINTS = 4000           # Strongest dot pixels used for the estimate
+COARSE_STEP = 1.0
+FINE_STEP = 0.1
+
+def _background_level(pixels: np.ndarray) -> int:
+    """Median grey level of a uint8 image, via its histogram."""
+    cumulative = np.cumsum(np.bincount(pixels.ravel(), minlength=256))
+    return int(np.searchsorted(cumulative, cumulative[-1] / 2))
+
+def _dot_points(gray: Image.Image) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    factor = max(1, max(gray.size) // ANALYSIS_SIZE)
+    small = gray.reduce(factor) if factor > 1 else gray
+    pixels = np.asarray(small)
+
+    # Dots show up as shadows or highlights against the paper, so rank
+    # pixels by absolute deviation from the median background.
+    lookup = np.abs(np.arange(256) - _background_level(pixels)).astype(np.uint8)
+    deviation = lookup[pixels].ravel()
+    count = min(MAX_POINTS, deviation.size // 20)
+    if count == 0:
+        return np.empty(0), np.empty(0), np.empty(0)
+
+    strongest = np.argpartition(deviation, -count)[-count:]
+    weights = deviation[strongest]
+    keep = weights > 0
+    ys, xs = np.divmod(strongest[keep], pixels.shape[1])
+    return xs.astype(np.float32), ys.astype(np.float32), weights[keep].astype(np.float32)
+
+def _profile_scores(xs: np.ndarray, ys: np.ndarray, weights: np.ndarray, angles: np.ndarray) -> np.ndarray:
+    theta = np.deg2rad(angles)[:, np.newaxis]
+    # Row coordinate of every point in the frame rotated by each angle
+    rho = ys * np.cos(theta) + xs * np.sin(theta)
+    bins = np.floor(rho - rho.min()).astype(np.int64)
+    nbins = int(bins.max()) + 1
+    flat = bins + (np.arange(len(angles)) * nbins)[:, np.newaxis]
+    profiles = np.bincount(flat.ravel(), weights=np.broadcast_to(weights, flat.shape).ravel(),
+                           minlength=len(angles) * nbins).reshape(len(angles), nbins)
+    return (profiles ** 2).sum(axis=1)
+
+def estimate_skew(gray: Image.Image) -> float:
+    """
+    Estimate page rotation in degrees (counter-clockwise positive).
+    Returns 0.0 when there is too little structure to measure.
+    """
+    xs, ys, weights = _dot_points(gray)
+    if len(xs) < 10:
+        return 0.0
+
+    coarse = np.arange(-MAX_SKEW_DEGREES, MAX_SKEW_DEGREES + COARSE_STEP / 2, COARSE_STEP)
+    best = coarse[np.argmax(_profile_scores(xs, ys, weights, coarse))]
+
+    fine = np.arange(best - COARSE_STEP, best + COARSE_STEP + FINE_STEP / 2, FINE_STEP)
+    return float(fine[np.argmax(_profile_scores(xs, ys, weights, fine))])
+
+def deskew_and_resize(gray: Image.Image, size: Tuple[int, int], angle: float) -> Image.Image:
+    """
+    Undo a rotation of `angle` degrees and resize to `size` in one affine
+    resample, instead of a rotate followed by a resize.
+    """
+    if abs(angle) < MIN_SKEW_DEGREES:
+        return gray.resize(size)
+
+    width, height = gray.size
+    out_w, out_h = size
+    sx, sy = width / out_w, height / out_h
+    cos_a, sin_a = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+
+    # Output pixel (u, v) -> input pixel: scale about the centre, then rotate
+    # by the skew (the image y axis points down, hence the sign pattern).
+    a, b = cos_a * sx, sin_a * sy
+    d, e = -sin_a * sx, cos_a * sy
+    c = width / 2 - a * out_w / 2 - b * out_h / 2
+    f = height / 2 - d * out_w / 2 - e * out_h / 2
+
+    background = _background_level(np.asarray(gray.reduce(max(1, max(gray.size) // 64))))
+    return gray.transform(size, Image.AFFINE, (a, b, c, d, e, f),
+                          resample=Image.BILINEAR, fillcolor=background)
@@ -0,0 +1,279 @@
+"""
+Character N-gram Language Model and Beam-search Decoding
+
+Per-cell classification picks each character independently. Rescoring the
+per-cell candidates with a Bangla character n-gram model fixes many of
+those errors using context (e.g. impossible vowel-sign sequences).
+
+The model is an interpolated absolute-discounting backoff n-gram stored as
+an array-backed trie (level order, children sorted by token id):
+
+    tokens[i]       token id on the edge into node i (root: -1)
+    logprob[i]      ln P(token | path to parent)
+    backoff[i]      ln backoff weight of node i used as a context
+    child_start[i]  children of i are child_start[i] : child_start[i + 1]
+
+The arrays are saved as an uncompressed .npz and memory-mapped (see
+models.mmap_npz), so loading is instant and all workers share one copy
+through the page cache.
+
+Build a model from a UTF-8 corpus (one sentence per line):
+    python -m models.language_model corpus.txt models/weights/bangla_char_lm.npz --order 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import math
+import os
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Sequence, Tuple
+from models.lazy import lazy_import
+from models.metrics import metrics
+
+np = lazy_import("numpy")
+
+LM_MODEL_PATH = os.getenv("LM_MODEL_PATH", "models/weights/bangla_char_lm.npz")
+LM_BEAM_WIDTH = int(os.getenv("LM_BEAM_WIDTH", "8"))     # Default; 0 disables LM decoding
+LM_WEIGHT = float(os.getenv("LM_WEIGHT", "0.5"))         # LM log-prob weight vs. visual log-prob
+MAX_BEAM_WIDTH = 64
+
+BOS = "\x02"  # Sentence start (context only)
+EOS = "\x03"  # Sentence end
+DISCOUNT = 0.75
+NO_PROB = -99.0  # logprob of context-only nodes
+
+def build_ngram_model(lines: Sequence[str], order: int = 4, discount: float = DISCOUNT) -> Dict[str, np.ndarray]:
+    """
+    Count character n-grams and lay them out as trie arrays.
+    """
+    vocab = sorted({char for line in lines for char in line} | {EOS, BOS})
+    ids = {char: i for i, char in enumerate(vocab)}
+    bos, eos = ids[BOS], ids[EOS]
+
+    counts: List[Dict[tuple, int]] = [defaultdict(int) for _ in range(order + 1)]
+    for line in lines:
+        sequence = [bos] + [ids[char] for char in line] + [eos]
+        for end in range(1, len(sequence)):
+            for n in range(1, order + 1):
+                if end - n + 1 < 0:
+                    break
+                counts[n][tuple(sequence[end - n + 1:end + 1])] += 1
+
+    # Context statistics: total count and number of distinct continuations
+    context_total: Dict[tuple, int] = defaultdict(int)
+    context_types: Dict[tuple, int] = defaultdict(int)
+    for n in range(1, order + 1):
+        for gram, count in counts[n].items():
+            context_total[gram[:-1]] += count
+            context_types[gram[:-1]] += 1
+
+    vocab_size = len(vocab) - 1  # BOS is never predicted
+    gamma = {h: discount * context_types[h] / context_total[h] for h in context_total}
+    unk = gamma[()] / (vocab_size + 1)
+    probs: Dict[tuple, float] = {}
+
+    def prob(gram: tuple) -> float:
+        if gram in probs:
+            return probs[gram]
+        if len(gram) == 1:
+            return unk
+        # Unseen context: weight 1; seen context: its backoff weight
+        return gamma.get(gram[:-1], 1.0) * prob(gram[1:])
+
+    for n in range(1, order + 1):
+        for gram, count in counts[n].items():
+            h = gram[:-1]
+            lower = 1.0 / (vocab_size + 1) if n == 1 else prob(gram[1:])
+            probs[gram] = max(count - discount, 0) / context_total[h] + gamma[h] * lower
+
+    nodes = set(probs) | {h for h in context_total if h}
+    for node in list(nodes):
+        # Every prefix must exist for the trie walk
+        for k in range(1, len(node)):
+            nodes.add(node[:k])
+    ordered = [()] + sorted(nodes, key=lambda gram: (len(gram), gram))
+    index = {gram: i for i, gram in enumerate(ordered)}
+
+    child_count = np.zeros(len(ordered), dtype=np.int64)
+    for gram in ordered[1:]:
+        child_count[index[gram[:-1]]] += 1
+    child_start = np.empty(len(ordered) + 1, dtype=np.int64)
+    child_start[0] = 1
+    np.cumsum(child_count, out=child_start[1:])
+    child_start[1:] += 1
+
+    return {
+        "tokens": np.array([-1] + [gram[-1] for gram in ordered[1:]], dtype=np.int32),
+        "logprob": np.array([0.0] + [math.log(probs[g]) if g in probs else NO_PROB for g in ordered[1:]],
+                            dtype=np.float32),
+        "backoff": np.array([math.log(gamma[g]) if g in gamma else 0.0 for g in ordered], dtype=np.float32),
+        "child_start": child_start,
+        "vocab": np.array([ord(char) for char in vocab], dtype=np.uint32),
+        "meta": np.array([order, math.log(unk), bos, eos], dtype=np.float64),
+    }
+
+class NgramLanguageModel:
+    """
+    Read-only scorer over the trie arrays (typically memory-mapped).
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        # np.asarray keeps memmaps as zero-copy views but drops memmap
+        # subclass overhead from every slice
+        self.tokens = np.asarray(arrays["tokens"])
+        self.logprob = np.asarray(arrays["logprob"])
+        self.backoff = np.asarray(arrays["backoff"])
+        self.child_start = np.asarray(arrays["child_start"])
+        meta = np.asarray(arrays["meta"])
+        self.order = int(meta[0])
+        self.unk_logprob = float(meta[1])
+        self.bos = int(meta[2])
+        self.eos = int(meta[3])
+        self.ids = {chr(int(cp)): i for i, cp in enumerate(np.asarray(arrays["vocab"]))}
+
+    @classmethod
+    def load(cls, path: str) -> "NgramLanguageModel":
+        from models.mmap_npz import load_npz_mmap
+        return cls(load_npz_mmap(path))
+
+    def token_id(self, char: str) -> int:
+        return self.ids.get(char, -1)
+
+    def _child(self, node: int, token: int) -> int:
+        start, end = int(self.child_start[node]), int(self.child_start[node + 1])
+        if start == end:
+            return -1
+        children = self.tokens[start:end]
+        i = int(np.searchsorted(children, token))
+        return start + i if i < end - start and children[i] == token else -1
+
+    def _find(self, gram: Sequence[int]) -> int:
+        node = 0
+        for token in gram:
+            node = self._child(node, token)
+            if node < 0:
+                return -1
+        return node
+
+    def score(self, context: Tuple[int, ...], token: int) -> float:
+        """ln P(token | context), backing off to shorter contexts."""
+        if token < 0:
+            return self.unk_logprob
+        context = context[-(self.order - 1):] if self.order > 1 else ()
+        penalty = 0.0
+        for k in range(len(context), -1, -1):
+            node = self._find(context[len(context) - k:])
+            if node < 0:
+                continue
+            child = self._child(node, token)
+            if child >= 0 and self.logprob[child] > NO_PROB:
+                return penalty + float(self.logprob[child])
+            penalty += float(self.backoff[node])
+        return penalty + self.unk_logprob
+
+def beam_search(cells: List[List[Tuple[str, float]]], lm: NgramLanguageModel, beam_width: int,
+                lm_weight: float = LM_WEIGHT) -> Tuple[str, float]:
+    """
+    Decode per-cell candidates [(label, prob), ...] with the language model.
+
+    Each hypothesis keeps its text, visual log-probability, LM log-probability
+    and LM context; after every cell only the `beam_width` best by
+    visual + lm_weight * LM survive. Returns (text, mean visual probability
+    of the chosen path).
+    """
+    memo: Dict[tuple, float] = {}
+
+    def lm_score(context: tuple, token: int) -> float:
+        key = (context, token)
+        if key not in memo:
+            memo[key] = lm.score(context, token)
+        return memo[key]
+
+    keep = max(lm.order - 1, 0)
+    # text -> (visual, lm, context)
+    beams: Dict[str, tuple] = {"": (0.0, 0.0, (lm.bos,))}
+    for candidates in cells:
+        expanded: Dict[str, tuple] = {}
+        for text, (visual, language, context) in beams.items():
+            for label, p in candidates:
+                if p <= 0:
+                    continue
+                new_language, new_context = language, context
+                for char in label:
+                    token = lm.token_id(char)
+                    new_language += lm_score(new_context, token)
+                    new_context = (new_context + (token,))[-keep:] if keep else ()
+                hypothesis = (visual + math.log(p), new_language, new_context)
+                new_text = text + label
+                best = expanded.get(new_text)
+                if best is None or hypothesis[0] + lm_weight * hypothesis[1] > best[0] + lm_weight * best[1]:
+                    expanded[new_text] = hypothesis
+        ranked = sorted(expanded.items(), key=lambda item: item[1][0] + lm_weight * item[1][1], reverse=True)
+        beams = dict(ranked[:beam_width])
+
+    def final(item):
+        _, (visual, language, context) = item
+        return visual + lm_weight * (language + lm_score(context, lm.eos))
+
+    text, (visual, _, _) = max(beams.items(), key=final)
+    return text, math.exp(visual / max(len(cells), 1))
+
+def decode_result(result: Dict, beam_width: Optional[int] = None) -> Dict:
+    """
+    Optional decoding stage for a recognition result carrying a per-cell
+    candidate lattice ("cells"). beam_width None uses LM_BEAM_WIDTH, 0
+    keeps the greedy text; larger beams trade latency for accuracy.
+    Results are returned unchanged when no language model is installed.
+    """
+    width = LM_BEAM_WIDTH if beam_width is None else min(beam_width, MAX_BEAM_WIDTH)
+    cells = result.get("cells")
+    if width <= 0 or not cells:
+        return result
+    lm = get_language_model()
+    if lm is None:
+        return result
+    started = time.perf_counter()
+    text, confidence = beam_search(cells, lm, width)
+    metrics.observe("lm.decode_ms", (time.perf_counter() - started) * 1000)
+    return {**result, "text": text, "confidence": round(confidence, 3), "beam_width": width}
+
+_language_model: Optional[NgramLanguageModel] = None
+_language_model_loaded = False
+_language_model_lock = threading.Lock()
+
+def get_language_model() -> Optional[NgramLanguageModel]:
+    """
+    Memory-mapped model from LM_MODEL_PATH, or None if there is no model file.
+    """
+    global _language_model, _language_model_loaded
+    if not _language_model_loaded:
+        with _language_model_lock:
+            if not _language_model_loaded:
+                if os.path.exists(LM_MODEL_PATH):
+                    _language_model = NgramLanguageModel.load(LM_MODEL_PATH)
+                    print(f"Loaded {_language_model.order}-gram language model from {LM_MODEL_PATH}")
+                _language_model_loaded = True
+    return _language_model
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a memory-mappable character n-gram model")
+    parser.add_argument("corpus", help="UTF-8 text file, one sentence per line")
+    parser.add_argument("output", help="Output .npz path")
+    parser.add_argument("--order", type=int, default=4)
+    parser.add_argument("--discount", type=float, default=DISCOUNT)
+    args = parser.parse_args()
+
+    from models.mmap_npz import save_npz
+    with open(args.corpus, encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    arrays = build_ngram_model(lines, args.order, args.discount)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    save_npz(args.output, **arrays)
+    print(f"{len(arrays['tokens'])} trie nodes, vocabulary {len(arrays['vocab'])}, "
+          f"{os.path.getsize(args.output) / 1024:.1f} KB -> {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+"""
+Deferred imports and background warm-up.
+
+Heavy libraries (numpy, Pillow, gTTS) are imported on first attribute
+access instead of when `main` is imported, so the server starts accepting
+connections quickly. Warm-up then loads them and builds the engines in the
+background (or eagerly, or not at all - see WARMUP_MODE). A failed warm-up
+step is retried with exponential backoff until it succeeds.
+"""
+
+import importlib
+import importlib.util
+import os
+import subprocess
+import sys
+import threading
+import time
+from types import ModuleType
+from typing import Any, Callable, Dict, List
+
+# background: start serving immediately, warm up in a thread (default)
+# eager:      finish warm-up before the app reports startup complete
+# off:        load everything on first use
+WARMUP_MODE = os.getenv("WARMUP_MODE", "background").lower()
+WARMUP_RETRY_SECONDS = float(os.getenv("WARMUP_RETRY_SECONDS", "5"))   # First retry delay, doubled per failure
+WARMUP_MAX_RETRY_SECONDS = 300
+
+class LazyModule(ModuleType):
+    """
+    Stand-in that imports the real module on first attribute access and
+    delegates to it.
+
+    importlib.util.LazyLoader is not thread-safe on Python 3.11: two threads
+    (warm-up, preprocessing, the batch thread) touching a lazy module at the
+    same time can see it half-initialised. Here the first access imports
+    under a lock through the regular import system, so every thread gets the
+    fully executed module.
+    """
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_target"] = None
+        self.__dict__["_lazy_lock"] = threading.Lock()
+
+    def _lazy_load(self) -> ModuleType:
+        module = self.__dict__["_lazy_target"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_target"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_target"] = module
+        return module
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._lazy_load(), attr)
+
+    def __dir__(self) -> List[str]:
+        return dir(self._lazy_load())
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Return a module whose code runs on first attribute access.
+    If the module is already loaded, the real module is returned.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    if importlib.util.find_spec(name) is None:
+        raise ImportError(f"No module named '{name}'")
+    return LazyModule(name)
+
+class WarmupTracker:
+    """
+    Runs registered warm-up steps once and records their status. After a
+    failure the remaining steps are retried in the background with
+    exponential backoff, so /ready recovers once e.g. a model file appears.
+    """
+
+    def __init__(self):
+        self.steps: List[tuple] = []
+        self.status = "pending"
+        self.timings: Dict[str, float] = {}
+        self.error = None
+        self.attempts = 0
+        self.started_at = None
+        self.finished_at = None
+        self._lock = threading.Lock()
+
+    def register(self, name: str, step: Callable[[], Any]):
+        self.steps.append((name, step))
+
+    def run(self):
+        with self._lock:
+            if self.status not in ("pending", "failed"):
+                return
+            self.status = "warming"
+            self.attempts += 1
+            self.started_at = self.started_at or time.time()
+
+        for name, step in self.steps:
+            if name in self.timings:
+                continue  # Succeeded in an earlier attempt
+            started = time.perf_counter()
+            try:
+                step()
+            except Exception as e:
+                delay = min(WARMUP_RETRY_SECONDS * 2 ** (self.attempts - 1), WARMUP_MAX_RETRY_SECONDS)
+                self.error = f"{name}: {str(e)}"
+                self.status = "failed"
+                print(f"Warm-up step '{name}' failed: {e} (retrying in {delay:g}s)")
+                retry = threading.Timer(delay, self.run)
+                retry.daemon = True
+                retry.start()
+                return
+            self.timings[name] = round((time.perf_counter() - started) * 1000, 1)
+
+        self.finished_at = time.time()
+        self.error = None
+        self.status = "ready"
+        print(f"Warm-up complete in {sum(self.timings.values()):.0f} ms")
+
+    def start_background(self) -> threading.Thread:
+        thread = threading.Thread(target=self.run, name="warmup", daemon=True)
+        thread.start()
+        return thread
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "mode": WARMUP_MODE,
+            "status": self.status,
+            "step_ms": dict(self.timings),
+            "attempts": self.attempts,
+            "error": self.error
+        }
+
+warmup = WarmupTracker()
+
+def import_time_report(module: str = "main", top: int = 15) -> Dict[str, Any]:
+    """
+    Import `module` in a fresh interpreter under `-X importtime` and summarize
+    where cold-start time goes: total, slowest modules by self time, and self
+    time aggregated per top-level package.
+    """
+    started = time.perf_counter()
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env={**os.environ, "WARMUP_MODE": "off"}
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"Importing '{module}' failed:\n{completed.stderr[-2000:]}")
+
+    entries = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        entries.append((name.strip(), int(self_us), int(cumulative_us)))
+
+    packages: Dict[str, int] = {}
+    for name, self_us, _ in entries:
+        root = name.split(".")[0]
+        packages[root] = packages.get(root, 0) + self_us
+
+    total_us = next((cumulative for name, _, cumulative in entries if name == module),
+                    sum(self_us for _, self_us, _ in entries))
+    return {
+        "module": module,
+        "import_ms": round(total_us / 1000, 1),
+        "interpreter_wall_ms": round(wall_ms, 1),
+        "modules_imported": len(entries),
+        "slowest_modules_ms": [
+            (name, round(self_us / 1000, 1))
+            for name, self_us, _ in sorted(entries, key=lambda e: e[1], reverse=True)[:top]
+        ],
+        "packages_ms": [
+            (root, round(self_us / 1000, 1))
+            for root, self_us in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ]
+    }
@@ -0,0 +1,315 @@
+"""
+Runtime memory profiling and leak detection.
+
+Three views of where memory goes in a long-running worker:
+
+- Resident set size per route: RSS is sampled before and after every
+  request. A route's peak is the process high-water mark when it rose
+  during one of its requests, otherwise the RSS when the request finished.
+  Both are single syscalls / procfs reads, so this stays on in production.
+- tracemalloc allocation sites (off by default; tracing slows allocation
+  noticeably): top sites, stored snapshots, diffs between two snapshots and
+  "leak suspects" whose size grew in every interval across the snapshots.
+- Sizes of structures known to grow with traffic (sessions, users, ...),
+  registered with watch().
+
+Everything is per process; in multi-worker mode each worker reports itself.
+"""
+
+import gc
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, List, Optional
+
+MEMORY_PROFILING_ENABLED = os.getenv("MEMORY_PROFILING_ENABLED", "false").lower() == "true"
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", "10"))
+MAX_SNAPSHOTS = 10       # Oldest stored snapshot is dropped beyond this
+MAX_ROUTES = 256         # Route stats kept; further paths are grouped as "other"
+GROUP_BY = ("lineno", "filename", "traceback")
+
+# Allocations made by the profiler and the import system are noise
+SNAPSHOT_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+def current_rss() -> Optional[int]:
+    """Resident set size in bytes (Linux procfs), or None if unavailable."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * _PAGE_SIZE
+    except (OSError, IndexError, ValueError):
+        return None
+
+def peak_rss() -> Optional[int]:
+    """Process high-water mark of RSS in bytes."""
+    if resource is None:
+        return None
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS
+    return maxrss if sys.platform == "darwin" else maxrss * 1024
+
+def _mb(size: Optional[int]) -> Optional[float]:
+    return round(size / (1024 * 1024), 2) if size is not None else None
+
+def _kb(size: int) -> float:
+    return round(size / 1024, 2)
+
+def _location(stat) -> List[str]:
+    return [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+
+class RouteMemoryStats:
+    """
+    Per-route request count, RSS growth and peak RSS.
+    """
+
+    def __init__(self):
+        self.requests = 0
+        self.peak_rss = 0
+        self.max_growth = 0
+        self.total_growth = 0
+        self.high_water_raised = 0
+
+    def record(self, growth: int, peak: int, raised_peak: bool):
+        self.requests += 1
+        self.peak_rss = max(self.peak_rss, peak)
+        self.max_growth = max(self.max_growth, growth)
+        self.total_growth += growth
+        self.high_water_raised += raised_peak
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "peak_rss_mb": _mb(self.peak_rss),
+            "max_rss_growth_mb": _mb(self.max_growth),
+            "net_rss_growth_mb": _mb(self.total_growth),
+            "raised_high_water": self.high_water_raised
+        }
+
+class MemoryProfiler:
+    """
+    Process-wide profiler state: route stats, stored tracemalloc snapshots
+    and watched structures.
+    """
+
+    def __init__(self, max_snapshots: int = MAX_SNAPSHOTS, max_routes: int = MAX_ROUTES):
+        self.max_snapshots = max_snapshots
+        self.max_routes = max_routes
+        self._routes: Dict[str, RouteMemoryStats] = {}
+        self._snapshots: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._next_snapshot_id = 1
+        self._watched: Dict[str, Callable[[], Optional[int]]] = {}
+        self._lock = threading.Lock()
+
+    # Route RSS -----------------------------------------------------------
+
+    def sample(self) -> tuple:
+        return current_rss(), peak_rss()
+
+    def record_request(self, route: str, before: tuple, after: tuple):
+        rss_before, peak_before = before
+        rss_after, peak_after = after
+        if rss_before is None or rss_after is None:
+            return
+        raised_peak = peak_before is not None and peak_after is not None and peak_after > peak_before
+        peak = peak_after if raised_peak else rss_after
+        with self._lock:
+            stats = self._routes.get(route)
+            if stats is None:
+                if len(self._routes) >= self.max_routes:
+                    route = "other"
+                stats = self._routes.setdefault(route, RouteMemoryStats())
+            stats.record(rss_after - rss_before, peak, raised_peak)
+
+    def route_stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            routes = list(self._routes.items())
+        return {route: stats.snapshot()
+                for route, stats in sorted(routes, key=lambda item: item[1].peak_rss, reverse=True)}
+
+    def reset_routes(self):
+        with self._lock:
+            self._routes.clear()
+
+    # Watched structures --------------------------------------------------
+
+    def watch(self, name: str, size: Callable[[], Optional[int]]):
+        """Report size() (e.g. len of a cache) in status(); None = not loaded."""
+        self._watched[name] = size
+
+    def watched_sizes(self) -> Dict[str, Optional[int]]:
+        sizes = {}
+        for name, size in self._watched.items():
+            try:
+                sizes[name] = size()
+            except Exception as e:
+                sizes[name] = f"error: {e}"
+        return sizes
+
+    # tracemalloc ---------------------------------------------------------
+
+    def start_tracing(self, frames: int = TRACEMALLOC_FRAMES):
+        if tracemalloc.is_tracing():
+            return
+        tracemalloc.start(frames)
+        print(f"tracemalloc started ({frames} frames)")
+
+    def stop_tracing(self):
+        """Stop tracing; stored snapshots are kept for later diffs."""
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            print("tracemalloc stopped")
+
+    def _require_tracing(self):
+        if not tracemalloc.is_tracing():
+            raise RuntimeError("tracemalloc is not running; enable it first")
+
+    def _take(self) -> tracemalloc.Snapshot:
+        self._require_tracing()
+        return tracemalloc.take_snapshot().filter_traces(SNAPSHOT_FILTERS)
+
+    def top(self, limit: int = 20, group_by: str = "lineno") -> Dict[str, Any]:
+        """Largest live allocation sites right now."""
+        snapshot = self._take()
+        stats = snapshot.statistics(group_by)
+        return {
+            "group_by": group_by,
+            "total_kb": _kb(sum(stat.size for stat in stats)),
+            "sites": [
+                {"location": _location(stat), "size_kb": _kb(stat.size), "count": stat.count}
+                for stat in stats[:limit]
+            ]
+        }
+
+    def take_snapshot(self, label: Optional[str] = None) -> Dict[str, Any]:
+        snapshot = self._take()
+        current, peak = tracemalloc.get_traced_memory()
+        with self._lock:
+            snapshot_id = self._next_snapshot_id
+            self._next_snapshot_id += 1
+            entry = {
+                "id": snapshot_id,
+                "label": label,
+                "timestamp": time.time(),
+                "traced_mb": _mb(current),
+                "traced_peak_mb": _mb(peak),
+                "rss_mb": _mb(current_rss()),
+                "snapshot": snapshot
+            }
+            self._snapshots[snapshot_id] = entry
+            while len(self._snapshots) > self.max_snapshots:
+                self._snapshots.popitem(last=False)
+        return self._describe(entry)
+
+    @staticmethod
+    def _describe(entry: Dict[str, Any]) -> Dict[str, Any]:
+        return {key: value for key, value in entry.items() if key != "snapshot"}
+
+    def snapshots(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [self._describe(entry) for entry in self._snapshots.values()]
+
+    def clear_snapshots(self):
+        with self._lock:
+            self._snapshots.clear()
+
+    def _snapshot(self, snapshot_id: int) -> tracemalloc.Snapshot:
+        with self._lock:
+            entry = self._snapshots.get(snapshot_id)
+        if entry is None:
+            raise KeyError(f"Unknown snapshot {snapshot_id}")
+        return entry["snapshot"]
+
+    def diff(self, base_id: int, target_id: Optional[int] = None, limit: int = 20,
+             group_by: str = "lineno") -> Dict[str, Any]:
+        """
+        What grew between two stored snapshots (target None = right now),
+        largest size increase first.
+        """
+        base = self._snapshot(base_id)
+        target = self._snapshot(target_id) if target_id is not None else self._take()
+        stats = target.compare_to(base, group_by)
+        return {
+            "base": base_id,
+            "target": target_id if target_id is not None else "now",
+            "group_by": group_by,
+            "size_diff_kb": _kb(sum(stat.size_diff for stat in stats)),
+            "count_diff": sum(stat.count_diff for stat in stats),
+            "sites": [
+                {"location": _location(stat), "size_diff_kb": _kb(stat.size_diff), "size_kb": _kb(stat.size),
+                 "count_diff": stat.count_diff, "count": stat.count}
+                for stat in stats[:limit]
+            ]
+        }
+
+    def leak_suspects(self, limit: int = 20, min_growth_kb: float = 1.0) -> Dict[str, Any]:
+        """
+        Allocation sites whose size increased between every pair of
+        consecutive stored snapshots (needs at least three), ranked by total
+        growth. Steady growth under steady load is the signature of a leak.
+        """
+        with self._lock:
+            entries = list(self._snapshots.values())
+        if len(entries) < 3:
+            raise RuntimeError("Need at least 3 snapshots to look for steady growth")
+
+        series = [{tuple(_location(stat)): stat.size for stat in entry["snapshot"].statistics("lineno")}
+                  for entry in entries]
+        suspects = []
+        for location, first in series[0].items():
+            sizes = [first]
+            for sizes_by_site in series[1:]:
+                size = sizes_by_site.get(location)
+                if size is None or size <= sizes[-1]:
+                    break
+                sizes.append(size)
+            else:
+                growth = sizes[-1] - sizes[0]
+                if growth >= min_growth_kb * 1024:
+                    suspects.append({"location": list(location), "growth_kb": _kb(growth),
+                                     "size_kb": [_kb(size) for size in sizes]})
+        suspects.sort(key=lambda suspect: suspect["growth_kb"], reverse=True)
+        return {"snapshots": [entry["id"] for entry in entries], "suspects": suspects[:limit]}
+
+    # Summary -------------------------------------------------------------
+
+    def status(self) -> Dict[str, Any]:
+        tracing = tracemalloc.is_tracing()
+        current, peak = tracemalloc.get_traced_memory() if tracing else (None, None)
+        return {
+            "pid": os.getpid(),
+            "rss_mb": _mb(current_rss()),
+            "peak_rss_mb": _mb(peak_rss()),
+            "gc_counts": gc.get_count(),
+            "tracemalloc": {
+                "tracing": tracing,
+                "frames": tracemalloc.get_traceback_limit() if tracing else None,
+                "traced_mb": _mb(current),
+                "traced_peak_mb": _mb(peak),
+                "overhead_mb": _mb(tracemalloc.get_tracemalloc_memory()) if tracing else None
+            },
+            "snapshots": self.snapshots(),
+            "watched": self.watched_sizes(),
+            "routes": self.route_stats()
+        }
+
+def object_counts(limit: int = 30) -> Dict[str, int]:
+    """Live objects per type (walks every gc-tracked object; seconds on big heaps)."""
+    counts = Counter(type(obj).__name__ for obj in gc.get_objects())
+    return dict(counts.most_common(limit))
+
+# Process-wide profiler shared by the admin API and middleware
+memory_profiler = MemoryProfiler()
@@ -0,0 +1,120 @@
+"""
+Lightweight in-process metrics.
+
+Keeps a bounded window of recent observations per metric name, so
+percentiles reflect current behaviour and memory use stays constant no
+matter how long the service runs. No external monitoring stack required.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional
+
+DEFAULT_WINDOW = 1024
+
+def _nearest_rank(ordered: List[float], q: float) -> float:
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+class RollingStats:
+    """
+    Recent observations of a single metric plus lifetime count/total.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.values = deque(maxlen=window)
+        self.times = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value: float):
+        with self._lock:
+            self.values.append(value)
+            self.times.append(time.monotonic())
+            self.count += 1
+            self.total += value
+
+    def percentile(self, q: float) -> float:
+        """Nearest-rank percentile over the recent window (q in 0-100)."""
+        with self._lock:
+            ordered = sorted(self.values)
+        return _nearest_rank(ordered, q)
+
+    def recent_percentile(self, q: float, max_age: float) -> Optional[float]:
+        """
+        Percentile over observations from the last `max_age` seconds, or None
+        if there were none (an idle metric does not keep reporting old load).
+        """
+        cutoff = time.monotonic() - max_age
+        with self._lock:
+            recent = [value for value, at in zip(self.values, self.times) if at >= cutoff]
+        return _nearest_rank(sorted(recent), q) if recent else None
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            ordered = sorted(self.values)
+            count, total = self.count, self.total
+
+        return {
+            "count": count,
+            "mean": round(total / count, 4) if count else 0.0,
+            "p50": round(_nearest_rank(ordered, 50), 4),
+            "p95": round(_nearest_rank(ordered, 95), 4),
+            "p99": round(_nearest_rank(ordered, 99), 4),
+            "max": round(ordered[-1], 4) if ordered else 0.0
+        }
+
+class MetricsRegistry:
+    """
+    Named RollingStats, created on first use, plus gauges (current values
+    such as in-flight request counts).
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        self.window = window
+        self._stats: Dict[str, RollingStats] = {}
+        self._gauges: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> RollingStats:
+        stats = self._stats.get(name)
+        if stats is None:
+            with self._lock:
+                stats = self._stats.setdefault(name, RollingStats(self.window))
+        return stats
+
+    def observe(self, name: str, value: float):
+        self.get(name).observe(value)
+
+    def names(self) -> List[str]:
+        return sorted(self._stats)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {name: self._stats[name].snapshot() for name in self.names()}
+
+    def add(self, name: str, delta: float):
+        with self._lock:
+            self._gauges[name] = self._gauges.get(name, 0) + delta
+
+    def gauge(self, name: str) -> float:
+        return self._gauges.get(name, 0)
+
+    @contextmanager
+    def track(self, name: str) -> Iterator[None]:
+        """Gauge `name` counts the blocks currently inside this context."""
+        self.add(name, 1)
+        try:
+            yield
+        finally:
+            self.add(name, -1)
+
+    def gauges(self) -> Dict[str, float]:
+        with self._lock:
+            return dict(sorted(self._gauges.items()))
+
+# Process-wide registry shared by models and API routers
+metrics = MetricsRegistry()
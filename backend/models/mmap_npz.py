@@ -0,0 +1,60 @@
+"""
+Memory-mapped .npz archives.
+
+np.load() ignores mmap_mode for .npz files and reads every member into
+private memory. Because np.savez stores members uncompressed, each array's
+bytes sit contiguously inside the zip, so they can be mapped directly with
+np.memmap instead. Mapped pages come from the OS page cache: loading is
+near-instant and every worker process on the host shares one physical copy.
+"""
+
+import struct
+import zipfile
+from typing import Dict
+import numpy as np
+
+_LOCAL_HEADER = struct.Struct("<4sHHHHHIIIHH")
+_LOCAL_HEADER_MAGIC = b"PK\x03\x04"
+
+def save_npz(path: str, **arrays: np.ndarray):
+    """
+    Save arrays as an uncompressed .npz that load_npz_mmap() can map.
+    """
+    np.savez(path, **{name: np.ascontiguousarray(array) for name, array in arrays.items()})
+
+def load_npz_mmap(path: str) -> Dict[str, np.ndarray]:
+    """
+    Map every member of an uncompressed .npz read-only, without copying.
+
+    Raises:
+        ValueError: If a member is compressed (e.g. written by np.savez_compressed)
+    """
+    arrays = {}
+    with zipfile.ZipFile(path) as archive, open(path, "rb") as f:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{path}:{info.filename} is compressed and cannot be memory-mapped")
+
+            # The local header's name/extra lengths can differ from the
+            # central directory, so read them from the local header itself.
+            f.seek(info.header_offset)
+            header = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+            if header[0] != _LOCAL_HEADER_MAGIC:
+                raise ValueError(f"{path}:{info.filename} has a corrupt zip header")
+            f.seek(header[9] + header[10], 1)
+
+            version = np.lib.format.read_magic(f)
+            if version == (1, 0):
+                shape, fortran_order, dtype = np.lib.format.read_array_header_1_0(f)
+            else:
+                shape, fortran_order, dtype = np.lib.format.read_array_header_2_0(f)
+            if dtype.hasobject:
+                raise ValueError(f"{path}:{info.filename} holds Python objects and cannot be memory-mapped")
+
+            name = info.filename[:-4] if info.filename.endswith(".npy") else info.filename
+            if int(np.prod(shape)) == 0:
+                arrays[name] = np.empty(shape, dtype=dtype)
+                continue
+            arrays[name] = np.memmap(path, dtype=dtype, mode="r", offset=f.tell(), shape=shape,
+                                     order="F" if fortran_order else "C")
+    return arrays
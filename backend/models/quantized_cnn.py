@@ -0,0 +1,181 @@
+"""
+Pure-NumPy int8 CNN for Braille Cell Classification
+
+Dependency-light inference engine for CPU-only deployment: no torch or
+onnxruntime needed at serving time. Classifies single 32x32 grayscale Braille
+cell crops into the 64 six-dot patterns (class index = dot bitmask, dot 1 is
+bit 0 ... dot 6 is bit 5).
+
+Architecture:
+    conv3x3(1->16) + ReLU + maxpool2   32x32 -> 16x16
+    conv3x3(16->32) + ReLU + maxpool2  16x16 -> 8x8
+    dense(2048->128) + ReLU
+    dense(128->64) -> softmax
+
+Implementation notes:
+- Activations are kept in NHWC layout so im2col is a single strided view
+  plus one reshape, with no transposes between layers.
+- Pooling is fused with the epilogue: max-pooling is applied to the raw
+  accumulators and the per-channel scale, bias and ReLU run on the 4x smaller
+  pooled tensor (valid because scales are positive and bias is per-channel).
+- Weights are int8 with one symmetric scale per output channel; activations
+  are quantized to int8 per sample before each layer. NumPy has no int8 GEMM,
+  so the int8 operands are multiplied through float32 BLAS - exact up to
+  2^24 per accumulator and far below quantization noise beyond that.
+- Weight files are uncompressed .npz archives mapped with load_npz_mmap(), so
+  loading is near-instant and weights are shared through the page cache by
+  every worker process.
+"""
+
+from typing import Dict, Optional
+import numpy as np
+from models.mmap_npz import load_npz_mmap, save_npz
+
+CELL_SIZE = 32
+NUM_CELL_CLASSES = 64
+
+# (name, kind, weight shape) - conv weights are stored im2col-ready as
+# (kh * kw * in_channels, out_channels), dense weights as (in, out)
+LAYERS = [
+    ("conv1", "conv", (3 * 3 * 1, 16)),
+    ("conv2", "conv", (3 * 3 * 16, 32)),
+    ("fc1", "dense", (8 * 8 * 32, 128)),
+    ("fc2", "dense", (128, NUM_CELL_CLASSES)),
+]
+
+def init_float_weights(seed: int = 0) -> Dict[str, np.ndarray]:
+    """
+    He-initialized float32 weights, for benchmarks and as a training stub.
+    """
+    rng = np.random.default_rng(seed)
+    weights = {}
+    for name, _, shape in LAYERS:
+        weights[f"{name}.w"] = (rng.standard_normal(shape) * np.sqrt(2.0 / shape[0])).astype(np.float32)
+        weights[f"{name}.b"] = (rng.standard_normal(shape[1]) * 0.01).astype(np.float32)
+    return weights
+
+def quantize_weights(float_weights: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """
+    Symmetric per-output-channel int8 quantization: w ~= w_q * scale.
+    """
+    quantized = {}
+    for name, _, _ in LAYERS:
+        w = np.asarray(float_weights[f"{name}.w"], dtype=np.float32)
+        scale = np.abs(w).max(axis=0) / 127.0
+        scale[scale == 0] = 1.0
+        quantized[f"{name}.w"] = np.clip(np.round(w / scale), -127, 127).astype(np.int8)
+        quantized[f"{name}.scale"] = scale.astype(np.float32)
+        quantized[f"{name}.b"] = np.asarray(float_weights[f"{name}.b"], dtype=np.float32)
+    return quantized
+
+def save_weights(path: str, weights: Dict[str, np.ndarray]):
+    """Write float or quantized weights in the mappable .npz format."""
+    save_npz(path, **weights)
+
+def _im2col_3x3(x: np.ndarray) -> np.ndarray:
+    """
+    (N, H, W, C) -> (N * H * W, 9 * C) patches for a 3x3 'same' convolution.
+    """
+    n, h, w, c = x.shape
+    padded = np.pad(x, ((0, 0), (1, 1), (1, 1), (0, 0)))
+    # (N, H, W, C, 3, 3) view; reorder to (N, H, W, 3, 3, C) to match weight layout
+    windows = np.lib.stride_tricks.sliding_window_view(padded, (3, 3), axis=(1, 2))
+    return windows.transpose(0, 1, 2, 4, 5, 3).reshape(n * h * w, 9 * c)
+
+def _pool2x2(x: np.ndarray) -> np.ndarray:
+    n, h, w, c = x.shape
+    return x.reshape(n, h // 2, 2, w // 2, 2, c).max(axis=(2, 4))
+
+def _quantize_activations(x: np.ndarray) -> tuple:
+    """
+    Per-sample symmetric int8 quantization. Returns int8-valued float32
+    data (ready for BLAS) and the per-sample scale, shaped for broadcasting.
+    """
+    axes = tuple(range(1, x.ndim))
+    scale = np.abs(x).max(axis=axes, keepdims=True) / 127.0
+    scale[scale == 0] = 1.0
+    q = np.rint(x / scale)
+    np.clip(q, -127, 127, out=q)
+    return q.astype(np.float32, copy=False), scale.astype(np.float32)
+
+def _softmax(logits: np.ndarray) -> np.ndarray:
+    logits = logits - logits.max(axis=1, keepdims=True)
+    probs = np.exp(logits)
+    probs /= probs.sum(axis=1, keepdims=True)
+    return probs
+
+class BrailleCellCNN:
+    """
+    float32 reference engine. Also the baseline for the int8 benchmark.
+    """
+
+    def __init__(self, weights: Dict[str, np.ndarray]):
+        self.weights = weights
+
+    @classmethod
+    def load(cls, path: str) -> "BrailleCellCNN":
+        return cls(load_npz_mmap(path))
+
+    def _layer(self, name: str, x: np.ndarray) -> np.ndarray:
+        return x @ self.weights[f"{name}.w"]
+
+    def _epilogue(self, name: str, acc: np.ndarray, x_scale: Optional[np.ndarray]) -> np.ndarray:
+        return acc + self.weights[f"{name}.b"]
+
+    def _prepare(self, x: np.ndarray) -> tuple:
+        return x, None
+
+    def _conv_block(self, name: str, x: np.ndarray) -> np.ndarray:
+        n, h, w, _ = x.shape
+        x, x_scale = self._prepare(x)
+        acc = self._layer(name, _im2col_3x3(x)).reshape(n, h, w, -1)
+        # Fused epilogue: pool the raw accumulators first, then scale/bias/ReLU
+        pooled = _pool2x2(acc)
+        if x_scale is not None:
+            x_scale = x_scale.reshape(n, 1, 1, 1)
+        out = self._epilogue(name, pooled, x_scale)
+        return np.maximum(out, 0, out=out)
+
+    def _dense(self, name: str, x: np.ndarray, relu: bool) -> np.ndarray:
+        x, x_scale = self._prepare(x)
+        if x_scale is not None:
+            x_scale = x_scale.reshape(-1, 1)
+        out = self._epilogue(name, self._layer(name, x), x_scale)
+        return np.maximum(out, 0, out=out) if relu else out
+
+    def predict_proba(self, cells: np.ndarray) -> np.ndarray:
+        """
+        Args:
+            cells: (N, 32, 32) grayscale crops scaled to [0, 1]
+
+        Returns:
+            (N, 64) class probabilities over six-dot patterns
+        """
+        x = np.asarray(cells, dtype=np.float32)[..., np.newaxis]
+        x = self._conv_block("conv1", x)
+        x = self._conv_block("conv2", x)
+        x = self._dense("fc1", x.reshape(x.shape[0], -1), relu=True)
+        return _softmax(self._dense("fc2", x, relu=False))
+
+    def predict(self, cells: np.ndarray) -> np.ndarray:
+        """Most likely dot pattern (bitmask) per cell."""
+        return self.predict_proba(cells).argmax(axis=1)
+
+class QuantizedBrailleCellCNN(BrailleCellCNN):
+    """
+    int8 engine: int8 weights with per-channel scales, int8 activations.
+    """
+
+    def _prepare(self, x: np.ndarray) -> tuple:
+        return _quantize_activations(x)
+
+    def _layer(self, name: str, x: np.ndarray) -> np.ndarray:
+        # The int8 -> float32 widening is a transient copy; the mapped int8
+        # weights themselves stay shared in the page cache.
+        return x @ self.weights[f"{name}.w"].astype(np.float32)
+
+    def _epilogue(self, name: str, acc: np.ndarray, x_scale: Optional[np.ndarray]) -> np.ndarray:
+        acc *= self.weights[f"{name}.scale"]
+        acc *= x_scale
+        acc += self.weights[f"{name}.b"]
+        return acc
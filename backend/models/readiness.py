@@ -0,0 +1,136 @@
+"""
+Readiness: live load signals for load balancers.
+
+/health answers "is the process up"; /ready answers "should this instance
+get more traffic right now" and returns 503 when any threshold is crossed:
+
+- default executor queue depth (preprocessing, LM decoding, uploads)
+- recognition micro-batch queue depth
+- in-flight conversions / syntheses / documents
+- p95 per stage over the last READY_WINDOW_SECONDS (idle stages report
+  None and never fail, so a drained instance becomes ready again)
+- free disk space under the local storage roots
+- model warm-up status
+- TTS upstream circuit state (reported; fails readiness only with
+  READY_REQUIRE_TTS=true, since a gTTS outage affects every instance)
+
+Everything is read from in-process counters, so polling every second
+costs well under a millisecond.
+"""
+
+import asyncio
+import os
+import shutil
+import time
+from typing import Any, Dict, Optional
+from models.circuit_breaker import tts_breaker
+from models.inference_scheduler import peek_scheduler
+from models.lazy import warmup
+from models.metrics import metrics
+from models.storage import get_storage, STORAGE_BACKEND, STORAGE_LOCATIONS
+
+READY_WINDOW_SECONDS = float(os.getenv("READY_WINDOW_SECONDS", "60"))
+READY_MAX_EXECUTOR_QUEUE = int(os.getenv("READY_MAX_EXECUTOR_QUEUE", "64"))
+READY_MAX_RECOGNITION_QUEUE = int(os.getenv("READY_MAX_RECOGNITION_QUEUE", "256"))
+READY_MAX_IN_FLIGHT = int(os.getenv("READY_MAX_IN_FLIGHT", "32"))
+READY_MIN_DISK_FREE_MB = float(os.getenv("READY_MIN_DISK_FREE_MB", "512"))
+READY_REQUIRE_TTS = os.getenv("READY_REQUIRE_TTS", "false").lower() == "true"
+
+IN_FLIGHT_GAUGES = ("convert", "synthesize", "document")
+
+# Stage -> (metric name, default p95 limit in ms)
+STAGES = {
+    "preprocess": ("recognizer.preprocess_ms", 2000.0),
+    "queue_wait": ("recognizer.queue_wait_ms", 1000.0),
+    "inference": ("recognizer.batch_latency_ms", 5000.0),
+    "decode": ("lm.decode_ms", 1000.0),
+    "tts": ("tts.synthesize_ms", 10000.0),
+}
+
+def _stage_limits() -> Dict[str, float]:
+    """Defaults overridden by READY_P95_LIMITS_MS, e.g. "inference=3000,tts=8000"."""
+    limits = {stage: limit for stage, (_, limit) in STAGES.items()}
+    for item in os.getenv("READY_P95_LIMITS_MS", "").split(","):
+        stage, _, value = item.partition("=")
+        if stage.strip() in limits and value.strip():
+            limits[stage.strip()] = float(value)
+    return limits
+
+STAGE_P95_LIMITS_MS = _stage_limits()
+
+def _executor_queue_depth() -> Optional[int]:
+    """Work items waiting for a thread in the event loop's default executor."""
+    try:
+        executor = getattr(asyncio.get_running_loop(), "_default_executor", None)
+    except RuntimeError:
+        return None
+    queue = getattr(executor, "_work_queue", None)
+    return queue.qsize() if queue is not None else 0
+
+def _disk_free() -> Dict[str, Any]:
+    if STORAGE_BACKEND != "local":
+        return {}
+    disks = {}
+    for name in STORAGE_LOCATIONS:
+        root = get_storage(name).root
+        try:
+            disks[name] = {"path": root, "free_mb": round(shutil.disk_usage(root).free / (1024 * 1024), 1)}
+        except OSError as e:
+            disks[name] = {"path": root, "free_mb": None, "error": str(e)}
+    return disks
+
+def readiness_report() -> Dict[str, Any]:
+    checks: Dict[str, Dict[str, Any]] = {}
+
+    def check(name: str, value: Any, limit: Any, ok: bool):
+        checks[name] = {"value": value, "limit": limit, "ok": ok}
+
+    executor_queue = _executor_queue_depth()
+    if executor_queue is not None:
+        check("executor_queue", executor_queue, READY_MAX_EXECUTOR_QUEUE, executor_queue <= READY_MAX_EXECUTOR_QUEUE)
+
+    scheduler = peek_scheduler()
+    recognition_queue = scheduler.queue_depth if scheduler is not None else 0
+    check("recognition_queue", recognition_queue, READY_MAX_RECOGNITION_QUEUE,
+          recognition_queue <= READY_MAX_RECOGNITION_QUEUE)
+
+    in_flight = {name: int(metrics.gauge(f"in_flight.{name}")) for name in IN_FLIGHT_GAUGES}
+    total_in_flight = sum(in_flight.values())
+    check("in_flight", total_in_flight, READY_MAX_IN_FLIGHT, total_in_flight <= READY_MAX_IN_FLIGHT)
+
+    p95_ms = {}
+    for stage, (metric, _) in STAGES.items():
+        value = metrics.get(metric).recent_percentile(95, READY_WINDOW_SECONDS)
+        p95_ms[stage] = round(value, 1) if value is not None else None
+        limit = STAGE_P95_LIMITS_MS[stage]
+        check(f"p95.{stage}", p95_ms[stage], limit, value is None or value <= limit)
+
+    disks = _disk_free()
+    for name, disk in disks.items():
+        free = disk["free_mb"]
+        check(f"disk.{name}", free, READY_MIN_DISK_FREE_MB, free is not None and free >= READY_MIN_DISK_FREE_MB)
+
+    warm = warmup.snapshot()
+    check("warmup", warm["status"], "ready", warm["mode"] == "off" or warm["status"] == "ready")
+
+    circuit = tts_breaker.snapshot()
+    check("tts_circuit", circuit["state"], "closed", circuit["state"] != "open" or not READY_REQUIRE_TTS)
+
+    failing = [name for name, result in checks.items() if not result["ok"]]
+    return {
+        "ready": not failing,
+        "failing": failing,
+        "timestamp": time.time(),
+        "worker_pid": os.getpid(),
+        "load": {
+            "executor_queue": executor_queue,
+            "recognition_queue": recognition_queue,
+            "in_flight": in_flight
+        },
+        "p95_ms": p95_ms,
+        "window_seconds": READY_WINDOW_SECONDS,
+        "tts_circuit": circuit,
+        "disk": disks,
+        "warmup": warm,
+        "checks": checks
+    }
@@ -0,0 +1,257 @@
+"""
+Shared State for Multi-worker Deployment
+
+With `--workers N` every uvicorn worker is a separate process, so in-memory
+dicts (sessions, caches, counters) would diverge between workers. When
+SHARED_STATE_PATH is set, that state lives in one local SQLite database in
+WAL mode instead: readers never block the writer, each worker keeps its own
+connection per thread, and writes are visible to every worker immediately.
+
+Without SHARED_STATE_PATH (single-process mode) the same helpers return
+plain in-process structures, so the code paths are identical.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Iterator, Optional
+
+SHARED_STATE_PATH = os.getenv("SHARED_STATE_PATH")
+
+_MISSING = object()
+
+class SharedStore:
+    """
+    Namespaced JSON key-value store on SQLite (WAL) with optional expiry.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS kv (
+                    namespace TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    expires_at REAL,
+                    updated_at REAL,
+                    PRIMARY KEY (namespace, key)
+                ) WITHOUT ROWID
+            """)
+            # Databases created before size-bounded caches lack updated_at
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(kv)")}
+            if "updated_at" not in columns:
+                conn.execute("ALTER TABLE kv ADD COLUMN updated_at REAL")
+            conn.execute("CREATE INDEX IF NOT EXISTS kv_expiry ON kv (expires_at) WHERE expires_at IS NOT NULL")
+            conn.execute("CREATE INDEX IF NOT EXISTS kv_age ON kv (namespace, updated_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, namespace: str, key: str, default: Any = None) -> Any:
+        row = self._connect().execute(
+            "SELECT value FROM kv WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, key, time.time())
+        ).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def set(self, namespace: str, key: str, value: Any, ttl: Optional[float] = None):
+        now = time.time()
+        expires_at = now + ttl if ttl else None
+        self._connect().execute(
+            "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+            (namespace, key, json.dumps(value, default=str), expires_at, now)
+        )
+
+    def delete(self, namespace: str, key: str) -> bool:
+        cursor = self._connect().execute("DELETE FROM kv WHERE namespace = ? AND key = ?", (namespace, key))
+        return cursor.rowcount > 0
+
+    def update(self, namespace: str, key: str, fn: Callable[[Any], Any], ttl: Optional[float] = None) -> Any:
+        """
+        Atomic read-modify-write across processes: fn(current or None) -> new value.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = conn.execute(
+                "SELECT value FROM kv WHERE namespace = ? AND key = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (namespace, key, time.time())
+            ).fetchone()
+            value = fn(json.loads(row[0]) if row else None)
+            now = time.time()
+            expires_at = now + ttl if ttl else None
+            conn.execute(
+                "INSERT OR REPLACE INTO kv (namespace, key, value, expires_at, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (namespace, key, json.dumps(value, default=str), expires_at, now)
+            )
+            conn.execute("COMMIT")
+            return value
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def keys(self, namespace: str) -> list:
+        rows = self._connect().execute(
+            "SELECT key FROM kv WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, time.time())
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def items(self, namespace: str) -> list:
+        rows = self._connect().execute(
+            "SELECT key, value FROM kv WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, time.time())
+        ).fetchall()
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def count(self, namespace: str) -> int:
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM kv WHERE namespace = ? AND (expires_at IS NULL OR expires_at > ?)",
+            (namespace, time.time())
+        ).fetchone()[0]
+
+    def trim(self, namespace: str, max_entries: int) -> int:
+        """Delete the least recently written entries beyond max_entries; returns how many."""
+        cursor = self._connect().execute("""
+            DELETE FROM kv WHERE namespace = ? AND key IN (
+                SELECT key FROM kv WHERE namespace = ? ORDER BY updated_at
+                LIMIT max(0, (SELECT COUNT(*) FROM kv WHERE namespace = ?) - ?)
+            )
+        """, (namespace, namespace, namespace, max_entries))
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        cursor = self._connect().execute("DELETE FROM kv WHERE expires_at IS NOT NULL AND expires_at <= ?", (time.time(),))
+        return cursor.rowcount
+
+class SharedDict(MutableMapping):
+    """
+    dict-like view of one namespace. Values are JSON round-tripped, so
+    mutating a returned value does not write it back - assign it instead.
+    """
+
+    def __init__(self, store: SharedStore, namespace: str):
+        self.store = store
+        self.namespace = namespace
+
+    def __getitem__(self, key: str) -> Any:
+        value = self.store.get(self.namespace, key, _MISSING)
+        if value is _MISSING:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key: str, value: Any):
+        self.store.set(self.namespace, key, value)
+
+    def __delitem__(self, key: str):
+        if not self.store.delete(self.namespace, key):
+            raise KeyError(key)
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.store.get(self.namespace, key, _MISSING) is not _MISSING
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.store.keys(self.namespace))
+
+    def __len__(self) -> int:
+        return self.store.count(self.namespace)
+
+    def values(self):
+        return [value for _, value in self.store.items(self.namespace)]
+
+    def items(self):
+        return self.store.items(self.namespace)
+
+class LRUCache:
+    """
+    Bounded in-process cache with per-entry expiry (single-process fallback).
+    """
+
+    def __init__(self, max_entries: int, ttl: Optional[float] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return default
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                del self._entries[key]
+                return default
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any):
+        expires_at = time.time() + self.ttl if self.ttl else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+class SharedCache:
+    """
+    Cache in a SharedStore namespace; entries expire after `ttl` seconds and
+    the oldest written entries are evicted beyond `max_entries`.
+    """
+
+    def __init__(self, store: SharedStore, namespace: str, ttl: Optional[float] = None,
+                 max_entries: Optional[int] = None):
+        self.store = store
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.store.get(self.namespace, key, default)
+
+    def set(self, key: str, value: Any):
+        self.store.set(self.namespace, key, value, ttl=self.ttl)
+        if self.max_entries is not None:
+            self.store.trim(self.namespace, self.max_entries)
+
+    def __len__(self) -> int:
+        return self.store.count(self.namespace)
+
+_store: Optional[SharedStore] = None
+_store_lock = threading.Lock()
+
+def get_shared_store() -> Optional[SharedStore]:
+    """
+    The process-wide SharedStore, or None in single-process mode.
+    """
+    global _store
+    if SHARED_STATE_PATH and _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SharedStore(SHARED_STATE_PATH)
+    return _store
+
+def shared_dict(namespace: str) -> MutableMapping:
+    """Shared namespace when multi-worker state is enabled, else a plain dict."""
+    store = get_shared_store()
+    return SharedDict(store, namespace) if store is not None else {}
+
+def shared_cache(namespace: str, max_entries: int, ttl: Optional[float] = None):
+    """Shared expiring cache when enabled, else a bounded in-process LRU."""
+    store = get_shared_store()
+    return SharedCache(store, namespace, ttl, max_entries) if store is not None else LRUCache(max_entries, ttl)
@@ -0,0 +1,377 @@
+"""
+Blob Storage Backends
+
+Uploads and synthesized audio are stored through one small interface instead
+of hard-coded directory paths, so the backend can be swapped per deployment:
+
+- ShardedFileStorage: local filesystem with two-level hash fan-out
+  (root/ab/cd/<key>), keeping every directory small even with millions of
+  files, so lookups and listings stay fast.
+- MemoryStorage: in-process dict, for tests and throwaway demos.
+- S3Storage: any S3-compatible service (AWS S3, MinIO, or a local stand-in
+  such as moto_server via S3_ENDPOINT_URL). Requires the optional boto3.
+
+Select with STORAGE_BACKEND=local|memory|s3.
+"""
+
+import hashlib
+import io
+import os
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import BinaryIO, Callable, Dict, Iterator, Optional, Tuple
+
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "local").lower()
+
+# Logical stores and their local root directories
+STORAGE_LOCATIONS = {
+    "uploads": "uploads",
+    "audio": "static/audio",
+}
+
+class BlobNotFoundError(FileNotFoundError):
+    pass
+
+class BlobStorage(ABC):
+    """
+    Flat key -> bytes store. Keys are plain filenames (no path separators).
+    A backend must implement every abstract method to be instantiated.
+    """
+
+    name = "base"
+
+    @abstractmethod
+    def put(self, key: str, data: bytes):
+        ...
+
+    @abstractmethod
+    def get(self, key: str) -> bytes:
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def delete(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def stat(self, key: str) -> Tuple[int, float]:
+        """(size in bytes, last modified timestamp). Raises BlobNotFoundError."""
+
+    @abstractmethod
+    def iter_keys(self) -> Iterator[str]:
+        ...
+
+    def read_range(self, key: str, offset: int, length: int) -> bytes:
+        return self.get(key)[offset:offset + length]
+
+    def open(self, key: str) -> BinaryIO:
+        return io.BytesIO(self.get(key))
+
+    def local_path(self, key: str) -> Optional[str]:
+        """Filesystem path for zero-copy serving, if the backend has one."""
+        return None
+
+    def is_available(self) -> bool:
+        return True
+
+    def cleanup(self, max_age_seconds: float, on_delete: Optional[Callable[[str], None]] = None) -> int:
+        """Delete blobs older than max_age_seconds; returns how many were removed."""
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for key in list(self.iter_keys()):
+            try:
+                _, modified = self.stat(key)
+            except BlobNotFoundError:
+                continue
+            if modified < cutoff and self.delete(key):
+                removed += 1
+                if on_delete:
+                    on_delete(key)
+        return removed
+
+    @staticmethod
+    def validate_key(key: str) -> str:
+        if not key or "/" in key or "\\" in key or key in (".", "..") or key.startswith("."):
+            raise ValueError(f"Invalid storage key: {key!r}")
+        return key
+
+class ShardedFileStorage(BlobStorage):
+    """
+    Local files under root/<h[0:2]>/<h[2:4]>/<key>, h = sha1(key).
+    """
+
+    name = "local"
+
+    def __init__(self, root: str):
+        self.root = root
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha1(self.validate_key(key).encode("utf-8")).hexdigest()
+        return os.path.join(self.root, digest[:2], digest[2:4], key)
+
+    def local_path(self, key: str) -> Optional[str]:
+        return self._path(key)
+
+    def put(self, key: str, data: bytes):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so readers never observe a partial blob
+        temp_path = f"{path}.{uuid.uuid4().hex[:8]}.part"
+        try:
+            with open(temp_path, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def get(self, key: str) -> bytes:
+        try:
+            with open(self._path(key), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise BlobNotFoundError(key)
+
+    def read_range(self, key: str, offset: int, length: int) -> bytes:
+        try:
+            with open(self._path(key), "rb") as f:
+                f.seek(offset)
+                return f.read(length)
+        except FileNotFoundError:
+            raise BlobNotFoundError(key)
+
+    def open(self, key: str) -> BinaryIO:
+        try:
+            return open(self._path(key), "rb")
+        except FileNotFoundError:
+            raise BlobNotFoundError(key)
+
+    def exists(self, key: str) -> bool:
+        return os.path.isfile(self._path(key))
+
+    def delete(self, key: str) -> bool:
+        try:
+            os.remove(self._path(key))
+            return True
+        except FileNotFoundError:
+            return False
+
+    def stat(self, key: str) -> Tuple[int, float]:
+        try:
+            st = os.stat(self._path(key))
+        except FileNotFoundError:
+            raise BlobNotFoundError(key)
+        return st.st_size, st.st_mtime
+
+    def _entries(self) -> Iterator[os.DirEntry]:
+        if not os.path.isdir(self.root):
+            return
+        for first in os.scandir(self.root):
+            if not (first.is_dir() and len(first.name) == 2):
+                continue
+            for second in os.scandir(first.path):
+                if not second.is_dir():
+                    continue
+                for entry in os.scandir(second.path):
+                    if entry.is_file():
+                        yield entry
+
+    def iter_keys(self) -> Iterator[str]:
+        for entry in self._entries():
+            if not entry.name.endswith(".part"):
+                yield entry.name
+
+    def cleanup(self, max_age_seconds: float, on_delete: Optional[Callable[[str], None]] = None) -> int:
+        # Single scandir pass: stat results come from the directory walk
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for entry in self._entries():
+            if entry.stat().st_mtime >= cutoff:
+                continue
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            if not entry.name.endswith(".part"):
+                # Stale .part files are debris from interrupted writes
+                removed += 1
+                if on_delete:
+                    on_delete(entry.name)
+        return removed
+
+    def is_available(self) -> bool:
+        return os.path.isdir(self.root) and os.access(self.root, os.W_OK)
+
+class MemoryStorage(BlobStorage):
+    """
+    In-process storage for tests; contents vanish with the process.
+    """
+
+    name = "memory"
+
+    def __init__(self):
+        self._blobs: Dict[str, Tuple[bytes, float]] = {}
+        self._lock = threading.Lock()
+
+    def put(self, key: str, data: bytes):
+        with self._lock:
+            self._blobs[self.validate_key(key)] = (bytes(data), time.time())
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self._blobs[key][0]
+        except KeyError:
+            raise BlobNotFoundError(key)
+
+    def exists(self, key: str) -> bool:
+        return key in self._blobs
+
+    def delete(self, key: str) -> bool:
+        with self._lock:
+            return self._blobs.pop(key, None) is not None
+
+    def stat(self, key: str) -> Tuple[int, float]:
+        try:
+            data, modified = self._blobs[key]
+        except KeyError:
+            raise BlobNotFoundError(key)
+        return len(data), modified
+
+    def iter_keys(self) -> Iterator[str]:
+        return iter(list(self._blobs))
+
+class S3Storage(BlobStorage):
+    """
+    S3-compatible object storage. Keys live under `<prefix>/` in one bucket.
+
+    Point S3_ENDPOINT_URL at MinIO or `moto_server` to run against a local
+    stand-in instead of AWS.
+    """
+
+    name = "s3"
+
+    def __init__(self, bucket: str, prefix: str, endpoint_url: Optional[str] = None, region: Optional[str] = None):
+        try:
+            import boto3
+        except ImportError:
+            raise RuntimeError("S3 storage requires the optional 'boto3' package")
+        self.bucket = bucket
+        self.prefix = prefix.strip("/") + "/"
+        self.client = boto3.client("s3", endpoint_url=endpoint_url, region_name=region)
+
+    def _key(self, key: str) -> str:
+        return self.prefix + self.validate_key(key)
+
+    def _is_missing(self, error: Exception) -> bool:
+        code = getattr(error, "response", {}).get("Error", {}).get("Code")
+        return code in ("404", "NoSuchKey", "NotFound")
+
+    def put(self, key: str, data: bytes):
+        self.client.put_object(Bucket=self.bucket, Key=self._key(key), Body=data)
+
+    def get(self, key: str) -> bytes:
+        try:
+            return self.client.get_object(Bucket=self.bucket, Key=self._key(key))["Body"].read()
+        except Exception as e:
+            if self._is_missing(e):
+                raise BlobNotFoundError(key)
+            raise
+
+    def read_range(self, key: str, offset: int, length: int) -> bytes:
+        try:
+            response = self.client.get_object(
+                Bucket=self.bucket, Key=self._key(key), Range=f"bytes={offset}-{offset + length - 1}"
+            )
+            return response["Body"].read()
+        except Exception as e:
+            if self._is_missing(e):
+                raise BlobNotFoundError(key)
+            raise
+
+    def exists(self, key: str) -> bool:
+        try:
+            self.stat(key)
+            return True
+        except BlobNotFoundError:
+            return False
+
+    def delete(self, key: str) -> bool:
+        exists = self.exists(key)
+        if exists:
+            self.client.delete_object(Bucket=self.bucket, Key=self._key(key))
+        return exists
+
+    def stat(self, key: str) -> Tuple[int, float]:
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._key(key))
+        except Exception as e:
+            if self._is_missing(e):
+                raise BlobNotFoundError(key)
+            raise
+        return head["ContentLength"], head["LastModified"].timestamp()
+
+    def iter_keys(self) -> Iterator[str]:
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                yield item["Key"][len(self.prefix):]
+
+    def cleanup(self, max_age_seconds: float, on_delete: Optional[Callable[[str], None]] = None) -> int:
+        # Listing already carries LastModified; no per-object HEAD needed
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        paginator = self.client.get_paginator("list_objects_v2")
+        for page in paginator.paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                if item["LastModified"].timestamp() < cutoff:
+                    self.client.delete_object(Bucket=self.bucket, Key=item["Key"])
+                    removed += 1
+                    if on_delete:
+                        on_delete(item["Key"][len(self.prefix):])
+        return removed
+
+    def is_available(self) -> bool:
+        try:
+            self.client.head_bucket(Bucket=self.bucket)
+            return True
+        except Exception:
+            return False
+
+_storages: Dict[str, BlobStorage] = {}
+_storages_lock = threading.Lock()
+
+def create_storage(name: str, backend: str = STORAGE_BACKEND) -> BlobStorage:
+    if name not in STORAGE_LOCATIONS:
+        raise ValueError(f"Unknown storage: {name}")
+    if backend == "local":
+        return ShardedFileStorage(os.getenv(f"STORAGE_{name.upper()}_ROOT", STORAGE_LOCATIONS[name]))
+    if backend == "memory":
+        return MemoryStorage()
+    if backend == "s3":
+        bucket = os.getenv("S3_BUCKET")
+        if not bucket:
+            raise RuntimeError("STORAGE_BACKEND=s3 requires S3_BUCKET")
+        return S3Storage(bucket, prefix=name, endpoint_url=os.getenv("S3_ENDPOINT_URL"),
+                         region=os.getenv("S3_REGION"))
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+def get_storage(name: str) -> BlobStorage:
+    """
+    Process-wide storage for `uploads` or `audio`, created on first use.
+    """
+    storage = _storages.get(name)
+    if storage is None:
+        with _storages_lock:
+            storage = _storages.get(name)
+            if storage is None:
+                storage = _storages[name] = create_storage(name)
+    return storage
+
+def set_storage(name: str, storage: BlobStorage):
+    """Replace a storage (e.g. with MemoryStorage in tests)."""
+    _storages[name] = storage
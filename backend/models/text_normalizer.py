@@ -0,0 +1,293 @@
+"""
+Bangla Text Normalization for TTS
+
+Expands numerals (০-৯ and 0-9), dates, abbreviations, symbols and
+punctuation into speakable Bangla before synthesis.
+
+The rule set is compiled once into a code-point trie plus a precompiled
+"ordinary text" skip pattern, and the text is normalized in a single
+left-to-right pass: every character is examined a bounded number of times,
+so the cost is linear in the input length no matter how many rules exist
+(a chain of regex substitutions rescans the whole text once per rule).
+"""
+
+import re
+import threading
+from typing import Dict, List, Optional, Tuple
+
+ONES = [
+    "শূন্য", "এক", "দুই", "তিন", "চার", "পাঁচ", "ছয়", "সাত", "আট", "নয়",
+    "দশ", "এগারো", "বারো", "তেরো", "চৌদ্দ", "পনেরো", "ষোলো", "সতেরো", "আঠারো", "উনিশ",
+    "বিশ", "একুশ", "বাইশ", "তেইশ", "চব্বিশ", "পঁচিশ", "ছাব্বিশ", "সাতাশ", "আটাশ", "ঊনত্রিশ",
+    "ত্রিশ", "একত্রিশ", "বত্রিশ", "তেত্রিশ", "চৌত্রিশ", "পঁয়ত্রিশ", "ছত্রিশ", "সাঁইত্রিশ", "আটত্রিশ", "ঊনচল্লিশ",
+    "চল্লিশ", "একচল্লিশ", "বিয়াল্লিশ", "তেতাল্লিশ", "চুয়াল্লিশ", "পঁয়তাল্লিশ", "ছেচল্লিশ", "সাতচল্লিশ", "আটচল্লিশ", "ঊনপঞ্চাশ",
+    "পঞ্চাশ", "একান্ন", "বাহান্ন", "তিপ্পান্ন", "চুয়ান্ন", "পঞ্চান্ন", "ছাপ্পান্ন", "সাতান্ন", "আটান্ন", "ঊনষাট",
+    "ষাট", "একষট্টি", "বাষট্টি", "তেষট্টি", "চৌষট্টি", "পঁয়ষট্টি", "ছেষট্টি", "সাতষট্টি", "আটষট্টি", "ঊনসত্তর",
+    "সত্তর", "একাত্তর", "বাহাত্তর", "তিয়াত্তর", "চুয়াত্তর", "পঁচাত্তর", "ছিয়াত্তর", "সাতাত্তর", "আটাত্তর", "ঊনআশি",
+    "আশি", "একাশি", "বিরাশি", "তিরাশি", "চুরাশি", "পঁচাশি", "ছিয়াশি", "সাতাশি", "অষ্টাশি", "ঊননব্বই",
+    "নব্বই", "একানব্বই", "বিরানব্বই", "তিরানব্বই", "চুরানব্বই", "পঁচানব্বই", "ছিয়ানব্বই", "সাতানব্বই", "আটানব্বই", "নিরানব্বই",
+]
+
+MONTHS = [
+    "জানুয়ারি", "ফেব্রুয়ারি", "মার্চ", "এপ্রিল", "মে", "জুন",
+    "জুলাই", "আগস্ট", "সেপ্টেম্বর", "অক্টোবর", "নভেম্বর", "ডিসেম্বর",
+]
+
+# Expanded only at word boundaries
+ABBREVIATIONS = {
+    "ডা.": "ডাক্তার",
+    "ড.": "ডক্টর",
+    "মো.": "মোহাম্মদ",
+    "মোসা.": "মোসাম্মৎ",
+    "অধ্যা.": "অধ্যাপক",
+    "কি.মি.": "কিলোমিটার",
+    "কি.গ্রা.": "কিলোগ্রাম",
+    "সে.মি.": "সেন্টিমিটার",
+    "বি.দ্র.": "বিশেষ দ্রষ্টব্য",
+    "খ্রি.পূ.": "খ্রিস্টপূর্ব",
+    "খ্রি.": "খ্রিস্টাব্দ",
+    "পৃ.": "পৃষ্ঠা",
+    "নং": "নম্বর",
+}
+
+# Expanded anywhere
+SYMBOLS = {
+    "%": "শতাংশ",
+    "&": "এবং",
+    "+": "যোগ",
+    "=": "সমান",
+    "°": "ডিগ্রি",
+    "@": "অ্যাট",
+}
+
+# Spoken after the amount: "৳৫০" -> "পঞ্চাশ টাকা"
+CURRENCIES = {
+    "৳": "টাকা",
+    "$": "ডলার",
+    "₹": "রুপি",
+}
+
+# None drops the mark (it only separates words); a string replaces it
+PUNCTUATION = {
+    ".": "।", "।": "।", "॥": "।", "!": "!", "?": "?",
+    ",": ",", ";": ",", ":": ",",
+    "\"": None, "'": None, "“": None, "”": None, "‘": None, "’": None,
+    "(": None, ")": None, "[": None, "]": None, "{": None, "}": None,
+    "-": None, "–": None, "—": None, "_": None, "/": None, "*": None,
+}
+
+DIGITS = {**{chr(0x09E6 + d): d for d in range(10)}, **{str(d): d for d in range(10)}}
+MAX_SPOKEN_DIGITS = 9  # Longer numbers (phone, account numbers) are read digit by digit
+
+# Word characters for abbreviation boundaries: letters/digits plus the whole
+# Bengali block (vowel signs and virama are not alphanumeric to Python)
+_WORD_CHARS = r"\wঀ-৿"
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or "ঀ" <= char <= "৿"
+
+def number_to_words(n: int) -> str:
+    """Cardinal number in Bangla words (Indian grouping: হাজার, লক্ষ, কোটি)."""
+    if n < 100:
+        return ONES[n]
+    parts = []
+    for value, name in ((10 ** 7, "কোটি"), (10 ** 5, "লক্ষ"), (1000, "হাজার")):
+        if n >= value:
+            count, n = divmod(n, value)
+            parts.append(f"{number_to_words(count)} {name}")
+    if n >= 100:
+        count, n = divmod(n, 100)
+        parts.append(f"{ONES[count]}শো")
+    if n:
+        parts.append(ONES[n])
+    return " ".join(parts)
+
+def year_to_words(year: int) -> str:
+    """Years 1100-1999 are read in hundreds: ১৯৭১ -> উনিশশো একাত্তর."""
+    if 1100 <= year < 2000:
+        hundreds, rest = divmod(year, 100)
+        return f"{ONES[hundreds]}শো" + (f" {ONES[rest]}" if rest else "")
+    return number_to_words(year)
+
+def digits_to_words(digits: str) -> str:
+    return " ".join(ONES[DIGITS[d]] for d in digits)
+
+class TextNormalizer:
+    """
+    Single-pass normalizer compiled from rule tables.
+
+    Trie nodes are dicts keyed by code point; the expansion of a complete
+    rule is stored under the None key as (replacement, needs_boundary).
+    """
+
+    def __init__(self, abbreviations: Dict[str, str] = ABBREVIATIONS, symbols: Dict[str, str] = SYMBOLS,
+                 currencies: Dict[str, str] = CURRENCIES, punctuation: Dict[str, Optional[str]] = PUNCTUATION):
+        self.currencies = dict(currencies)
+        self.punctuation = dict(punctuation)
+        self.trie: Dict = {}
+        for key, value in abbreviations.items():
+            self._insert(key, value, True)
+        for key, value in symbols.items():
+            self._insert(key, value, False)
+
+        # Characters that may start a rule anywhere; abbreviations only stop
+        # the scan where one actually starts at a word boundary
+        anywhere = set(DIGITS) | set(self.currencies) | set(self.punctuation) | set(symbols)
+        specials = re.escape("".join(sorted(anywhere)))
+        abbreviation_starts = "|".join(
+            re.escape(key) + (f"(?![{_WORD_CHARS}])" if _is_word_char(key[-1]) else "")
+            for key in sorted(abbreviations, key=len, reverse=True)
+        )
+        plain = f"[^\\s{specials}]"
+        if abbreviation_starts:
+            plain = f"(?!(?<![{_WORD_CHARS}])(?:{abbreviation_starts})){plain}"
+
+        # Ordinary text, including single spaces between ordinary words, is
+        # consumed by one C-level match instead of character by character
+        self._plain_run = re.compile(f"(?:{plain})(?:{plain}| (?={plain}))*")
+        self._spaces = re.compile(r"\s+")
+
+    def _insert(self, key: str, value: str, needs_boundary: bool):
+        node = self.trie
+        for char in key:
+            node = node.setdefault(char, {})
+        node[None] = (value, needs_boundary)
+
+    def _match_rule(self, text: str, i: int) -> Tuple[Optional[str], int]:
+        """Longest rule starting at i: (replacement, end) or (None, i)."""
+        node = self.trie
+        best, end = None, i
+        j = i
+        while j < len(text) and text[j] in node:
+            node = node[text[j]]
+            j += 1
+            rule = node.get(None)
+            if rule is None:
+                continue
+            replacement, needs_boundary = rule
+            if needs_boundary:
+                if i > 0 and _is_word_char(text[i - 1]):
+                    continue
+                # Keys ending in a letter (e.g. "নং") must also end the word
+                if _is_word_char(text[j - 1]) and j < len(text) and _is_word_char(text[j]):
+                    continue
+            best, end = replacement, j
+        return best, end
+
+    def _scan_digits(self, text: str, i: int) -> int:
+        while i < len(text) and text[i] in DIGITS:
+            i += 1
+        return i
+
+    def _scan_number(self, text: str, i: int) -> Tuple[str, int]:
+        """Number, decimal or date starting at i: (words, end)."""
+        end = self._scan_digits(text, i)
+
+        # Indian digit grouping: ১,০০,০০০
+        while end + 1 < len(text) and text[end] == "," and text[end + 1] in DIGITS:
+            group_end = self._scan_digits(text, end + 1)
+            if group_end - end - 1 not in (2, 3):
+                break
+            end = group_end
+        digits = text[i:end].replace(",", "")
+
+        # Dates: d/m/yyyy, d-m-yyyy or d.m.yyyy
+        if len(digits) <= 2 and end < len(text) and text[end] in "/-.":
+            separator = text[end]
+            month_end = self._scan_digits(text, end + 1)
+            if 0 < month_end - end - 1 <= 2 and month_end < len(text) and text[month_end] == separator:
+                year_end = self._scan_digits(text, month_end + 1)
+                day = int("".join(str(DIGITS[d]) for d in digits))
+                month = int("".join(str(DIGITS[d]) for d in text[end + 1:month_end]))
+                year_digits = text[month_end + 1:year_end]
+                if 1 <= day <= 31 and 1 <= month <= 12 and len(year_digits) in (2, 4):
+                    year = int("".join(str(DIGITS[d]) for d in year_digits))
+                    return f"{ONES[day]} {MONTHS[month - 1]} {year_to_words(year)}", year_end
+
+        if len(digits) > MAX_SPOKEN_DIGITS or (len(digits) > 1 and DIGITS[digits[0]] == 0):
+            words = digits_to_words(digits)
+        else:
+            words = number_to_words(int("".join(str(DIGITS[d]) for d in digits)))
+
+        # Decimals: ১২.৫ -> বারো দশমিক পাঁচ
+        if end + 1 < len(text) and text[end] == "." and text[end + 1] in DIGITS:
+            fraction_end = self._scan_digits(text, end + 1)
+            words = f"{words} দশমিক {digits_to_words(text[end + 1:fraction_end])}"
+            end = fraction_end
+        return words, end
+
+    def normalize(self, text: str) -> str:
+        out: List[str] = []
+        pending_space = False
+        i, n = 0, len(text)
+
+        def emit(piece: str, spaced: bool):
+            nonlocal pending_space
+            if out and (pending_space or spaced):
+                out.append(" ")
+            out.append(piece)
+            pending_space = spaced
+
+        while i < n:
+            run = self._plain_run.match(text, i)
+            if run:
+                emit(run.group(), False)
+                i = run.end()
+                continue
+
+            char = text[i]
+            if char.isspace():
+                pending_space = True
+                i = self._spaces.match(text, i).end()
+                continue
+
+            if char in DIGITS:
+                words, i = self._scan_number(text, i)
+                emit(words, True)
+                # Attached suffixes stay attached: ৫টি -> পাঁচটি
+                pending_space = not (i < n and _is_word_char(text[i]))
+                continue
+
+            if char in self.currencies and i + 1 < n and text[i + 1] in DIGITS:
+                words, i = self._scan_number(text, i + 1)
+                emit(f"{words} {self.currencies[char]}", True)
+                continue
+
+            if char in self.trie:
+                replacement, end = self._match_rule(text, i)
+                if replacement is not None:
+                    emit(replacement, True)
+                    i = end
+                    continue
+
+            if char in self.punctuation:
+                mark = self.punctuation[char]
+                if mark is not None and out:
+                    # No space before a mark; a space after it
+                    out.append(mark)
+                pending_space = True
+                i += 1
+                continue
+
+            if char in self.currencies:
+                emit(self.currencies[char], True)
+            else:
+                emit(char, False)
+            i += 1
+
+        return "".join(out)
+
+_normalizer: Optional[TextNormalizer] = None
+_normalizer_lock = threading.Lock()
+
+def get_normalizer() -> TextNormalizer:
+    """Process-wide normalizer; the rule set is compiled once."""
+    global _normalizer
+    if _normalizer is None:
+        with _normalizer_lock:
+            if _normalizer is None:
+                _normalizer = TextNormalizer()
+    return _normalizer
+
+def normalize_text(text: str) -> str:
+    return get_normalizer().normalize(text)
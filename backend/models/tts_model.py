@@ -11,11 +11,14 @@ Alternative options for thesis enhancement:
 4. Festival with Bangla voice addon
 """
 
-import os
-import uuid
+import io
 import time
+import hashlib
 from typing import Dict
-from gtts import gTTS
+from models.storage import get_storage
+from models.text_normalizer import get_normalizer
+from models.circuit_breaker import tts_breaker
+from models.metrics import metrics
 
 class TextToSpeech:
     """
@@ -29,8 +32,11 @@ class TextToSpeech:
     """
     
     def __init__(self):
-        self.output_dir = "static/audio"
-        os.makedirs(self.output_dir, exist_ok=True)
+        # Audio blobs (sharded local files, memory or S3; see models.storage)
+        self.storage = get_storage("audio")
+        
+        # Rule set compiled once per process (see models.text_normalizer)
+        self.normalizer = get_normalizer()
         
         # gTTS language code for Bengali
         self.language = 'bn'
@@ -42,14 +48,11 @@ class TextToSpeech:
         """
         Preprocess Bangla text for better TTS output.
         
-        ENHANCEMENTS FOR THESIS:
-        1. Number to words conversion
-        2. Abbreviation expansion  
-        3. Punctuation normalization
-        4. Text normalization for Bangla script
+        Single linear pass: numerals (০-৯) and dates to words, abbreviation
+        and symbol expansion, punctuation normalization and whitespace
+        collapsing (see models.text_normalizer).
         """
-        # Remove excessive whitespace
-        text = ' '.join(text.split())
+        text = self.normalizer.normalize(text)
         
         # Ensure text is not empty after preprocessing
         if not text.strip():
@@ -57,6 +60,16 @@ class TextToSpeech:
         
         return text
     
+    def audio_filename(self, processed_text: str) -> str:
+        """
+        Text-addressed filename: the same text and language always map to
+        the same file, so repeated phrases are synthesized once. The name
+        does not pin the bytes (cleanup may delete the file and a later
+        synthesis may differ), so /audio derives its ETag from the bytes.
+        """
+        digest = hashlib.sha256(f"{self.language}:{processed_text}".encode("utf-8")).hexdigest()
+        return f"tts_{digest[:32]}.mp3"
+    
     def synthesize_with_gtts(self, text: str, output_filename: str) -> Dict[str, any]:
         """
         Generate speech using gTTS library.
@@ -80,18 +93,27 @@ class TextToSpeech:
         ```
         """
         try:
+            # Imported on first synthesis to keep application startup fast
+            from gtts import gTTS
+            
             # Create gTTS object with Bangla language
             tts = gTTS(text=text, lang=self.language, slow=False)
             
-            # Save directly as MP3 for maximum compatibility
-            output_path = os.path.join(self.output_dir, output_filename)
-            tts.save(output_path)
+            # Render the MP3 in memory and store it in one put, so a partial
+            # blob is never visible to /audio.
+            # The upstream request goes through the circuit breaker: while gTTS
+            # keeps failing, calls fail fast instead of each waiting to time out.
+            buffer = io.BytesIO()
+            started = time.perf_counter()
+            tts_breaker.call(tts.write_to_fp, buffer)
+            metrics.observe("tts.synthesize_ms", (time.perf_counter() - started) * 1000)
+            self.storage.put(output_filename, buffer.getvalue())
             
             # Estimate duration (rough estimate: 0.1 seconds per character)
             duration = len(text) * 0.1
             
             return {
-                "output_path": output_path,
+                "filename": output_filename,
                 "duration": duration
             }
             
@@ -107,7 +129,7 @@ class TextToSpeech:
             
         Returns:
             {
-                "audio_url": "/static/audio/filename.mp3",
+                "audio_url": "/audio/tts_<text hash>.mp3",
                 "duration": 3.45  # Duration in seconds
             }
         """
@@ -118,16 +140,19 @@ class TextToSpeech:
             # Step 1: Preprocess text
             processed_text = self.preprocess_text(text)
             
-            # Step 2: Generate unique filename
-            filename = f"tts_{uuid.uuid4().hex[:8]}.mp3"
+            # Step 2: Content-addressed filename
+            filename = self.audio_filename(processed_text)
             
-            # Step 3: Synthesize speech
+            # Step 3: Synthesize speech (reuse an identical earlier synthesis)
             start_time = time.time()
-            result = self.synthesize_with_gtts(processed_text, filename)
+            if self.storage.exists(filename):
+                result = {"duration": len(processed_text) * 0.1}
+            else:
+                result = self.synthesize_with_gtts(processed_text, filename)
             processing_time = time.time() - start_time
             
-            # Step 4: Generate accessible URL
-            audio_url = f"/static/audio/{filename}"
+            # Step 4: Generate accessible URL (served with ETag revalidation)
+            audio_url = f"/audio/{filename}"
             
             print(f"Speech Generated: '{processed_text[:20]}...' ({result['duration']:.2f}s)")
             print(f"Processing Time: {processing_time:.2f}s")
@@ -169,14 +194,9 @@ class TextToSpeech:
         Important for production deployment.
         """
         try:
-            current_time = time.time()
-            for filename in os.listdir(self.output_dir):
-                filepath = os.path.join(self.output_dir, filename)
-                file_age = current_time - os.path.getctime(filepath)
-                
-                if file_age > max_age_hours * 3600:  # Convert hours to seconds
-                    os.remove(filepath)
-                    print(f"🗑️ Cleaned up old file: {filename}")
+            removed = self.storage.cleanup(max_age_hours * 3600)  # Convert hours to seconds
+            if removed:
+                print(f"🗑️ Cleaned up {removed} old audio files")
                     
         except Exception as e:
             print(f"⚠️ Cleanup failed: {str(e)}")
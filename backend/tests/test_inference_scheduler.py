@@ -0,0 +1,121 @@
+"""
+InferenceScheduler micro-batching against the NumPy reference model.
+"""
+
+import asyncio
+import contextlib
+import time
+
+import numpy as np
+import pytest
+
+from models.inference_scheduler import InferenceScheduler, NumpyReferenceModel
+
+class RecordingModel:
+    """Wraps a batch model and records the size of every batch it runs."""
+
+    def __init__(self, model):
+        self.model = model
+        self.batch_sizes = []
+
+    def __call__(self, batch):
+        self.batch_sizes.append(len(batch))
+        return self.model(batch)
+
+def images(count, seed=0):
+    rng = np.random.default_rng(seed)
+    return [rng.random((64, 64), dtype=np.float32) for _ in range(count)]
+
+def test_batched_results_match_unbatched():
+    reference = NumpyReferenceModel()
+    model = RecordingModel(reference)
+    pages = images(12)
+    expected = [reference(page[np.newaxis])[0] for page in pages]
+
+    async def run():
+        scheduler = InferenceScheduler(model, max_batch_size=8, max_wait_ms=50)
+        return await asyncio.gather(*(scheduler.submit(page) for page in pages))
+
+    assert asyncio.run(run()) == expected
+    assert max(model.batch_sizes) > 1
+
+def test_batch_closes_at_max_batch_size():
+    model = RecordingModel(NumpyReferenceModel())
+
+    async def run():
+        scheduler = InferenceScheduler(model, max_batch_size=4, max_wait_ms=5000)
+        started = time.perf_counter()
+        await asyncio.gather(*(scheduler.submit(page) for page in images(8)))
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(run())
+    assert model.batch_sizes == [4, 4]
+    assert elapsed < 2
+
+def test_batch_closes_at_max_wait():
+    model = RecordingModel(NumpyReferenceModel())
+
+    async def run():
+        scheduler = InferenceScheduler(model, max_batch_size=100, max_wait_ms=50)
+        started = time.perf_counter()
+        await asyncio.gather(*(scheduler.submit(page) for page in images(3)))
+        return time.perf_counter() - started
+
+    elapsed = asyncio.run(run())
+    assert model.batch_sizes == [3]
+    assert 0.05 <= elapsed < 2
+
+def test_model_error_reaches_every_waiter():
+    def failing(batch):
+        raise ValueError("model exploded")
+
+    async def run():
+        scheduler = InferenceScheduler(failing, max_batch_size=8, max_wait_ms=20)
+        return await asyncio.gather(*(scheduler.submit(page) for page in images(5)), return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert len(results) == 5
+    assert all(isinstance(result, ValueError) for result in results)
+
+def test_scheduler_keeps_working_after_model_error():
+    calls = []
+
+    def flaky(batch):
+        calls.append(len(batch))
+        if len(calls) == 1:
+            raise ValueError("first batch fails")
+        return NumpyReferenceModel()(batch)
+
+    async def run():
+        scheduler = InferenceScheduler(flaky, max_batch_size=8, max_wait_ms=5)
+        with pytest.raises(ValueError):
+            await scheduler.submit(images(1)[0])
+        return await scheduler.submit(images(1)[0])
+
+    assert "text" in asyncio.run(run())
+
+def test_requests_survive_worker_restart():
+    model = RecordingModel(NumpyReferenceModel())
+    pages = images(4)
+
+    async def run():
+        scheduler = InferenceScheduler(model, max_batch_size=100, max_wait_ms=5000)
+        pending = [asyncio.ensure_future(scheduler.submit(page)) for page in pages[:3]]
+        await asyncio.sleep(0.05)   # the worker is collecting and waiting for more
+        scheduler._worker.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await scheduler._worker
+        scheduler.max_wait = 0.01
+        # The next request starts a new worker, which takes over the queued ones
+        return await asyncio.wait_for(asyncio.gather(*pending, scheduler.submit(pages[3])), 2)
+
+    results = asyncio.run(run())
+    assert len(results) == 4
+    assert model.batch_sizes == [4]
+
+def test_scheduler_moves_between_event_loops():
+    scheduler = InferenceScheduler(NumpyReferenceModel(), max_batch_size=8, max_wait_ms=5)
+    page = images(1)[0]
+    first = asyncio.run(scheduler.submit(page))
+    second = asyncio.run(asyncio.wait_for(scheduler.submit(page), 2))
+    assert first == second
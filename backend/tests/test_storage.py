@@ -0,0 +1,133 @@
+"""
+Blob storage backends: MemoryStorage and ShardedFileStorage.
+"""
+
+import hashlib
+import os
+import time
+
+import pytest
+
+from models.storage import BlobNotFoundError, MemoryStorage, ShardedFileStorage
+
+INVALID_KEYS = ["", ".", "..", ".hidden", "a/b", "../escape", "..\\escape", "dir\\file"]
+
+@pytest.fixture(params=["memory", "local"])
+def storage(request, tmp_path):
+    if request.param == "memory":
+        return MemoryStorage()
+    return ShardedFileStorage(str(tmp_path / "blobs"))
+
+def age(storage, key, seconds):
+    """Backdate a blob's modification time by `seconds`."""
+    if isinstance(storage, MemoryStorage):
+        data, modified = storage._blobs[key]
+        storage._blobs[key] = (data, modified - seconds)
+    else:
+        path = storage.local_path(key)
+        stamp = os.stat(path).st_mtime - seconds
+        os.utime(path, (stamp, stamp))
+
+def test_put_get_roundtrip(storage):
+    storage.put("a.bin", b"hello")
+    assert storage.exists("a.bin")
+    assert storage.get("a.bin") == b"hello"
+    assert storage.stat("a.bin")[0] == 5
+    assert storage.open("a.bin").read() == b"hello"
+    assert list(storage.iter_keys()) == ["a.bin"]
+
+def test_put_replaces_existing(storage):
+    storage.put("a.bin", b"first")
+    storage.put("a.bin", b"second")
+    assert storage.get("a.bin") == b"second"
+
+def test_delete(storage):
+    storage.put("a.bin", b"x")
+    assert storage.delete("a.bin") is True
+    assert storage.delete("a.bin") is False
+    assert not storage.exists("a.bin")
+
+def test_missing_blob_raises(storage):
+    with pytest.raises(BlobNotFoundError):
+        storage.get("missing.bin")
+    with pytest.raises(BlobNotFoundError):
+        storage.stat("missing.bin")
+    with pytest.raises(BlobNotFoundError):
+        storage.read_range("missing.bin", 0, 10)
+    # Callers that only know FileNotFoundError keep working
+    with pytest.raises(FileNotFoundError):
+        storage.get("missing.bin")
+
+@pytest.mark.parametrize("key", INVALID_KEYS)
+def test_invalid_keys_rejected(storage, key):
+    with pytest.raises(ValueError):
+        storage.put(key, b"x")
+
+@pytest.mark.parametrize("offset, length, expected", [
+    (0, 4, b"0123"),
+    (6, 4, b"6789"),
+    (8, 10, b"89"),
+    (10, 5, b""),
+])
+def test_read_range(storage, offset, length, expected):
+    storage.put("digits.bin", b"0123456789")
+    assert storage.read_range("digits.bin", offset, length) == expected
+
+def test_cleanup_removes_only_old_blobs(storage):
+    storage.put("old.bin", b"x")
+    storage.put("new.bin", b"y")
+    age(storage, "old.bin", 3600)
+    deleted = []
+    assert storage.cleanup(60, on_delete=deleted.append) == 1
+    assert deleted == ["old.bin"]
+    assert not storage.exists("old.bin")
+    assert storage.exists("new.bin")
+
+def test_sharded_layout(tmp_path):
+    root = tmp_path / "blobs"
+    storage = ShardedFileStorage(str(root))
+    storage.put("tts_abc.mp3", b"audio")
+    digest = hashlib.sha1(b"tts_abc.mp3").hexdigest()
+    path = root / digest[:2] / digest[2:4] / "tts_abc.mp3"
+    assert path.read_bytes() == b"audio"
+    assert storage.local_path("tts_abc.mp3") == str(path)
+
+def test_sharded_traversal_stays_under_root(tmp_path):
+    storage = ShardedFileStorage(str(tmp_path / "blobs"))
+    for key in INVALID_KEYS:
+        with pytest.raises(ValueError):
+            storage.local_path(key)
+    assert not (tmp_path / "escape").exists()
+
+def test_sharded_put_leaves_no_part_files(tmp_path):
+    storage = ShardedFileStorage(str(tmp_path / "blobs"))
+    storage.put("a.bin", b"x")
+    names = [name for _, _, files in os.walk(tmp_path) for name in files]
+    assert names == ["a.bin"]
+
+def test_sharded_cleanup_removes_stale_part_files(tmp_path):
+    storage = ShardedFileStorage(str(tmp_path / "blobs"))
+    storage.put("a.bin", b"x")
+    shard = os.path.dirname(storage.local_path("a.bin"))
+    stale = os.path.join(shard, "a.bin.deadbeef.part")
+    fresh = os.path.join(shard, "a.bin.cafebabe.part")
+    for path in (stale, fresh):
+        with open(path, "wb") as f:
+            f.write(b"partial")
+    old = time.time() - 3600
+    os.utime(stale, (old, old))
+
+    assert list(storage.iter_keys()) == ["a.bin"]
+    # Debris is removed but not counted or reported as a deleted blob
+    deleted = []
+    assert storage.cleanup(60, on_delete=deleted.append) == 0
+    assert deleted == []
+    assert not os.path.exists(stale)
+    assert os.path.exists(fresh)
+    assert storage.exists("a.bin")
+
+def test_sharded_missing_root(tmp_path):
+    storage = ShardedFileStorage(str(tmp_path / "absent"))
+    assert list(storage.iter_keys()) == []
+    assert storage.cleanup(0) == 0
+    assert not storage.is_available()
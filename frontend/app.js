@@ -241,6 +241,114 @@ async function convertImage() {
     }
 }
 
+// Live Camera Mode
+// Streams camera frames over a WebSocket; the server skips unchanged frames
+// and only pushes text deltas, so frames are sent at a steady rate.
+const LIVE_FRAME_INTERVAL_MS = 100;
+const LIVE_FRAME_QUALITY = 0.7;
+let liveSocket = null;
+let liveStream = null;
+let liveTimer = null;
+
+async function toggleLiveMode() {
+    if (liveSocket) {
+        stopLiveMode();
+    } else {
+        await startLiveMode();
+    }
+}
+
+async function startLiveMode() {
+    const liveVideo = document.getElementById('liveVideo');
+    const liveBtn = document.getElementById('liveBtn');
+    
+    try {
+        liveStream = await navigator.mediaDevices.getUserMedia({
+            video: { facingMode: 'environment' },
+            audio: false
+        });
+    } catch (error) {
+        showError('Camera Unavailable', 'Unable to access the camera. Please allow camera permission and try again.');
+        return;
+    }
+    
+    liveVideo.srcObject = liveStream;
+    liveVideo.style.display = 'block';
+    liveBtn.textContent = '⏹ Stop Camera';
+    
+    const wsUrl = API_BASE_URL.replace(/^http/, 'ws') + '/ws/live';
+    liveSocket = new WebSocket(wsUrl);
+    liveSocket.binaryType = 'arraybuffer';
+    
+    liveSocket.onopen = function() {
+        const canvas = document.createElement('canvas');
+        let sending = false;
+        
+        liveTimer = setInterval(() => {
+            if (sending || !liveVideo.videoWidth || liveSocket.readyState !== WebSocket.OPEN) {
+                return;
+            }
+            // Skip capture while the previous frame is still buffered
+            if (liveSocket.bufferedAmount > 0) {
+                return;
+            }
+            sending = true;
+            canvas.width = liveVideo.videoWidth;
+            canvas.height = liveVideo.videoHeight;
+            canvas.getContext('2d').drawImage(liveVideo, 0, 0);
+            canvas.toBlob(blob => {
+                sending = false;
+                if (blob && liveSocket && liveSocket.readyState === WebSocket.OPEN) {
+                    liveSocket.send(blob);
+                }
+            }, 'image/jpeg', LIVE_FRAME_QUALITY);
+        }, LIVE_FRAME_INTERVAL_MS);
+    };
+    
+    liveSocket.onmessage = function(event) {
+        const message = JSON.parse(event.data);
+        if (message.type === 'delta') {
+            hideAllSections();
+            banglaText.textContent = message.text || 'No text recognized';
+            const confidences = message.changes.map(change => change.confidence);
+            if (confidences.length) {
+                const average = confidences.reduce((a, b) => a + b, 0) / confidences.length;
+                confidenceBadge.textContent = `${Math.round(average * 100)}%`;
+            }
+            resultsSection.style.display = 'block';
+        } else if (message.type === 'error') {
+            console.error('Live recognition error:', message.detail);
+        }
+    };
+    
+    liveSocket.onclose = function() {
+        stopLiveMode();
+    };
+}
+
+function stopLiveMode() {
+    const liveVideo = document.getElementById('liveVideo');
+    const liveBtn = document.getElementById('liveBtn');
+    
+    if (liveTimer) {
+        clearInterval(liveTimer);
+        liveTimer = null;
+    }
+    if (liveSocket) {
+        const socket = liveSocket;
+        liveSocket = null;
+        socket.onclose = null;
+        socket.close();
+    }
+    if (liveStream) {
+        liveStream.getTracks().forEach(track => track.stop());
+        liveStream = null;
+    }
+    liveVideo.srcObject = null;
+    liveVideo.style.display = 'none';
+    liveBtn.textContent = '📷 Live Camera';
+}
+
 function displayResults(result) {
     hideAllSections();
     